@@ -1,13 +1,69 @@
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.db.session import get_db
+from app.models.models import Users
+from app.schemas.user import UserResponse
+from app.services.auth_cache import get_verified_claims, user_cache
+from app.services.rate_limit import RateLimited, login_rate_limiter, retry_after_header
 
 DBSession = Annotated[AsyncSession, Depends(get_db)]
 
-def gen_username(email: str) -> str:
-    local_part, domain = email.split("@")
-    domain_name = domain.split(".")[0]
-    return f"{local_part}_{domain_name}"
\ No newline at end of file
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+
+async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: DBSession) -> UserResponse:
+    """
+    Resolve the bearer token to the calling user.
+
+    Verified claims and user snapshots are served from in-process caches, so
+    a warm request neither decodes the JWT nor touches the database.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    try:
+        claims = get_verified_claims(token)
+        user_id = int(claims["sub"])
+    except (JWTError, ValueError):
+        raise credentials_exception
+
+    user = user_cache.get(user_id)
+    if user is None:
+        row = await db.get(Users, user_id)
+        if row is None:
+            raise credentials_exception
+
+        user = UserResponse.model_validate(row)
+        user_cache.set(user_id, user)
+
+    return user
+
+CurrentUser = Annotated[UserResponse, Depends(get_current_user)]
+
+async def limit_login_attempts(
+    request: Request, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]
+) -> None:
+    """
+    Reject a login attempt with 429 once its client IP or account is over
+    the limit, before the user is looked up or the password is verified.
+    """
+    if not settings.LOGIN_RATE_LIMIT_ENABLED:
+        return
+
+    client_ip = request.client.host if request.client else "unknown"
+    try:
+        await login_rate_limiter.check(client_ip, form_data.username)
+    except RateLimited as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, please retry later",
+            headers={"Retry-After": retry_after_header(exc.retry_after)},
+        )
@@ -1,6 +1,12 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth
+from app.api.v1.endpoints import auth, documents, folders, health, processing, search, users
 
 api_router = APIRouter()
 
-api_router.include_router(auth.router, prefix="/auth", tags=["Auth"])
\ No newline at end of file
+api_router.include_router(auth.router, prefix="/auth", tags=["Auth"])
+api_router.include_router(users.router, prefix="/users", tags=["Users"])
+api_router.include_router(folders.router, prefix="/folders", tags=["Folders"])
+api_router.include_router(documents.router, prefix="/documents", tags=["Documents"])
+api_router.include_router(search.router, prefix="/search", tags=["Search"])
+api_router.include_router(processing.router, prefix="/processing", tags=["Processing"])
+api_router.include_router(health.router, prefix="/health", tags=["Health"])
\ No newline at end of file
@@ -1,70 +1,60 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, Response, status, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.exc import IntegrityError
+from jose import JWTError
 from sqlalchemy import select
 
 from app.models.models import Users
 from app.schemas.user import UserCreate, UserResponse
-from app.schemas.auth import Token
-from app.api.deps import DBSession, gen_username
-from app.core.security import (
-    hash_password,
-    verify_password,
-    create_access_token,
-    create_refresh_token
-)
+from app.schemas.auth import RefreshRequest, Token
+from app.api.deps import DBSession, limit_login_attempts
+from app.core.responses import TimedJSONResponse
+from app.core.security import create_access_token, create_refresh_token
+from app.services.audit import audit_logger
+from app.services.password_hasher import password_hasher
+from app.services.rate_limit import login_rate_limiter
+from app.services.reference_data import get_reference_data
+from app.services.refresh_tokens import RefreshTokenReused, revoke_refresh_token, rotate_refresh_token
+from app.services.revocation import revocation_store
+from app.services.users import CONFLICT_MESSAGES, UserConflict, create_user
 
 router = APIRouter()
     
 @router.post("/register", response_model=UserResponse,
     status_code=status.HTTP_201_CREATED, summary="Register a new user"
 )
-async def register (user_info: UserCreate, db: DBSession) -> UserResponse:
-    query = select(1).where(Users.email == user_info.email)
-    isEmailExist = (await db.execute(query)).first()
-
-    if isEmailExist:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered",
-        )
-    
-    username = user_info.username or gen_username(user_info.email)
-    
-    query = select(1).where(Users.username == username)
-    isUsernameExist = (await db.execute(query)).first() 
+async def register (user_info: UserCreate, db: DBSession) -> TimedJSONResponse:
+    """
+    Register a new user.
 
-    if isUsernameExist:
+    The row is inserted in one statement that returns the generated id; an
+    existing email or username is detected from the unique index violation.
+    The role is checked against the cached Roles table before the password
+    is hashed.
+    """
+    reference = await get_reference_data(db)
+    if reference.role(user_info.role_id) is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already taken",
+            detail=CONFLICT_MESSAGES["role_id"],
         )
 
-    hashed_password = hash_password(user_info.password)
-    
-    new_user = Users(
-        username=username,
-        email=user_info.email,
-        password_hash=hashed_password,
-        role_id=user_info.role_id,
-    )
+    hashed_password = await password_hasher.hash(user_info.password)
 
     try:
-        db.add(new_user)
-        await db.commit()
-        await db.refresh(new_user)
-
-    except IntegrityError:
-        await db.rollback()
+        new_user = await create_user(db, user_info, hashed_password)
+    except UserConflict as exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Registration failed. Please try again.",
+            detail=str(exc),
         )
-    
-    return UserResponse.model_validate(new_user)
+
+    await audit_logger.log("user_registered", user_id=new_user.user_id, entity_id=new_user.user_id)
+
+    return TimedJSONResponse(new_user.model_dump(), status_code=status.HTTP_201_CREATED)
 
 @router.post("/login", response_model=Token, summary="Login and get access token",
-             description="Authenticate with email and password to receive JWT tokens.")
+             description="Authenticate with email and password to receive JWT tokens.",
+             dependencies=[Depends(limit_login_attempts)])
 async def login (db: DBSession, form_data: OAuth2PasswordRequestForm = Depends()) -> Token:
     """
     Login with email and password.
@@ -76,18 +66,23 @@ async def login (db: DBSession, form_data: OAuth2PasswordRequestForm = Depends()
     Returns:
     - **access_token**: Short-lived JWT for API access
     - **refresh_token**: Long-lived JWT for getting new access tokens
+
+    Attempts are rate limited per client IP and per account; over the
+    limit the response is `429` with `Retry-After`.
     """    
     query = select(Users).where(Users.email == form_data.username)
     user = (await db.execute(query)).scalar_one_or_none()
 
     if not user:
+        await audit_logger.log("login_failed", details={"email": form_data.username})
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    if not verify_password(form_data.password, user.password_hash):
+    if not await password_hasher.verify(form_data.password, user.password_hash):
+        await audit_logger.log("login_failed", user_id=user.user_id, details={"email": form_data.username})
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -95,10 +90,57 @@ async def login (db: DBSession, form_data: OAuth2PasswordRequestForm = Depends()
         )
     
     access_token = create_access_token(subject=user.user_id, role_id=user.role_id)
-    refresh_token = create_refresh_token(subject=user.user_id)
+    refresh_token = create_refresh_token(subject=user.user_id, role_id=user.role_id)
+
+    await login_rate_limiter.succeeded(form_data.username)
+    await audit_logger.log("login_succeeded", user_id=user.user_id)
 
     return Token(
         access_token=access_token,
         refresh_token=refresh_token,
         token_type="bearer"
     )
+
+@router.post("/refresh", response_model=Token, summary="Rotate a refresh token")
+async def refresh(payload: RefreshRequest) -> Token:
+    """
+    Exchange a refresh token for a new access token and refresh token.
+
+    Each refresh token can be used once. Presenting a token that was already
+    rotated is treated as theft and revokes every token descended from the
+    same login.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    try:
+        tokens = await rotate_refresh_token(payload.refresh_token, revocation_store)
+    except RefreshTokenReused as exc:
+        await audit_logger.log("refresh_token_reused", user_id=exc.user_id)
+        raise credentials_exception
+    except (JWTError, ValueError):
+        raise credentials_exception
+
+    return Token(
+        access_token=tokens.access_token,
+        refresh_token=tokens.refresh_token,
+        token_type="bearer"
+    )
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT, summary="Revoke a refresh token")
+async def logout(payload: RefreshRequest) -> Response:
+    """Revoke the refresh token and every token rotated from the same login."""
+    try:
+        user_id = await revoke_refresh_token(payload.refresh_token, revocation_store)
+    except (JWTError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    await audit_logger.log("logout", user_id=user_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
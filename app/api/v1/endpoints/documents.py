@@ -0,0 +1,179 @@
+import uuid
+from datetime import datetime
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from app.api.deps import CurrentUser, DBSession
+from app.core.config import settings
+from app.core.responses import TimedJSONResponse
+from app.models.models import Documents, ProcessingStatus
+from app.schemas.document import DocumentPage, DocumentUploadResponse
+from app.schemas.processing import ProcessingStage, ProcessingState
+from app.services.folder_tree import get_folder_tree
+from app.services.listing import (
+    InvalidCursor, decode_cursor, document_list_query, fetch_page, permitted_rows, row_dicts, stream_ndjson,
+)
+from app.services.permissions import get_permission_engine
+from app.services.processing import processing_scheduler
+from app.services.storage import BlobStorage, get_blob_storage
+from app.services.uploads import UploadTooLarge, store_stream
+
+VIEW_DOCUMENTS_ACTION = "view_documents"
+UPLOAD_DOCUMENTS_ACTION = "upload_documents"
+
+router = APIRouter()
+
+@router.get("", response_model=DocumentPage, summary="List the documents of a folder")
+async def list_documents(
+    db: DBSession,
+    current_user: CurrentUser,
+    folder_id: int = Query(..., description="Folder to list"),
+    limit: int = Query(50, ge=1, le=500, description="Page size"),
+    cursor: str | None = Query(None, description="`next_cursor` of the previous page"),
+    stream: bool = Query(False, description="Stream every remaining document as NDJSON instead of one page"),
+):
+    """
+    List a folder's documents, newest first.
+
+    Pages are keyset-paginated on `(uploaded_at, doc_id)`, so fetching a deep
+    page costs the same as the first one. With `stream=true` all documents
+    after `cursor` are written as newline-delimited JSON while they are read.
+    Documents the caller may not view are skipped, so a page can hold fewer
+    than `limit` items while `next_cursor` is still set.
+    """
+    folder_tree = await get_folder_tree(db)
+    if folder_id not in folder_tree:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Folder not found",
+        )
+
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+    permissions = await get_permission_engine(db)
+    lineage = folder_tree.lineage(folder_id)
+    if not permissions.authorize(current_user.user_id, current_user.role_id, VIEW_DOCUMENTS_ACTION,
+                                 "folder", folder_id, ancestors=lineage[1:]):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed to view this folder",
+        )
+
+    keep = permitted_rows(permissions, current_user.user_id, current_user.role_id,
+                          VIEW_DOCUMENTS_ACTION, "document", lineage)
+
+    if stream:
+        return StreamingResponse(
+            stream_ndjson(db, document_list_query(folder_id, after), keep),
+            media_type="application/x-ndjson",
+        )
+
+    rows, next_cursor = await fetch_page(
+        db, lambda after, limit: document_list_query(folder_id, after, limit), after, limit, keep,
+    )
+    return TimedJSONResponse({"items": row_dicts(rows), "next_cursor": next_cursor})
+
+@router.post("/upload", response_model=DocumentUploadResponse,
+    status_code=status.HTTP_201_CREATED, summary="Upload a document"
+)
+async def upload_document(
+    request: Request,
+    db: DBSession,
+    current_user: CurrentUser,
+    storage: Annotated[BlobStorage, Depends(get_blob_storage)],
+    folder_id: int = Query(..., description="Destination folder"),
+    filename: str = Query(..., min_length=1, max_length=255, description="Original file name"),
+) -> DocumentUploadResponse:
+    """
+    Upload a document as the raw request body.
+
+    The body is streamed through fixed-size buffers straight into blob
+    storage while its SHA-256 is computed, so memory use does not grow with
+    the file size. Identical content is stored once; re-uploading the same
+    file to the same folder under the same name returns the existing document.
+    Requires the `upload_documents` action on the folder.
+    """
+    folder_tree = await get_folder_tree(db)
+    if folder_id not in folder_tree:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Folder not found",
+        )
+
+    permissions = await get_permission_engine(db)
+    if not permissions.authorize(current_user.user_id, current_user.role_id, UPLOAD_DOCUMENTS_ACTION,
+                                 "folder", folder_id, ancestors=folder_tree.lineage(folder_id)[1:]):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed to upload to this folder",
+        )
+
+    try:
+        blob = await store_stream(
+            request.stream(), storage,
+            chunk_size=settings.UPLOAD_CHUNK_SIZE,
+            max_size=settings.UPLOAD_MAX_SIZE,
+        )
+    except UploadTooLarge:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="File is too large",
+        )
+
+    if blob.deduplicated:
+        query = select(Documents.doc_id).where(
+            Documents.azure_blob_path == blob.path,
+            Documents.folder_id == folder_id,
+            Documents.filename == filename,
+        )
+        existing_id = (await db.execute(query)).scalars().first()
+
+        if existing_id is not None:
+            return DocumentUploadResponse(
+                doc_id=existing_id, filename=filename, folder_id=folder_id,
+                content_hash=blob.content_hash, size=blob.size, deduplicated=True,
+            )
+
+    document = Documents(
+        filename=filename,
+        folder_id=folder_id,
+        uploaded_by_user_id=current_user.user_id,
+        azure_blob_path=blob.path,
+        mongo_doc_id=str(uuid.uuid4()),
+    )
+
+    try:
+        db.add(document)
+        await db.flush()
+
+        db.add(ProcessingStatus(
+            doc_id=document.doc_id,
+            stage_name=ProcessingStage.UPLOAD,
+            status=ProcessingState.COMPLETED,
+            end_time=datetime.now(),
+        ))
+        await db.commit()
+
+    except Exception:
+        # The blob stays: its path is content-addressed, so a concurrent
+        # upload of the same bytes may already reference it.
+        await db.rollback()
+        raise
+
+    # When the scheduler is not running, recovery picks the document up later.
+    if processing_scheduler.running:
+        processing_scheduler.submit(document.doc_id, document.mongo_doc_id, blob.path)
+
+    return DocumentUploadResponse(
+        doc_id=document.doc_id, filename=filename, folder_id=folder_id,
+        content_hash=blob.content_hash, size=blob.size, deduplicated=blob.deduplicated,
+    )
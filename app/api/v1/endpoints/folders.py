@@ -0,0 +1,206 @@
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import CurrentUser, DBSession
+from app.api.v1.endpoints.documents import VIEW_DOCUMENTS_ACTION
+from app.core.responses import TimedJSONResponse
+from app.models.models import BulkOperations
+from app.schemas.folder import (
+    BulkOperationKind, BulkOperationResponse, FolderCopyRequest, FolderMoveRequest, FolderPage, PermissionResetRequest,
+)
+from app.services.bulk_operations import bulk_folder_operations
+from app.services.folder_tree import FolderTree, get_folder_tree
+from app.services.listing import (
+    InvalidCursor, decode_cursor, fetch_page, folder_list_query, permitted_rows, row_dicts, stream_ndjson,
+)
+from app.services.permissions import PermissionEngine, get_permission_engine
+
+MANAGE_FOLDERS_ACTION = "manage_folders"
+
+router = APIRouter()
+
+@router.get("", response_model=FolderPage, summary="List child folders")
+async def list_folders(
+    db: DBSession,
+    current_user: CurrentUser,
+    parent_id: int | None = Query(None, description="Parent folder; omit to list root folders"),
+    limit: int = Query(50, ge=1, le=500, description="Page size"),
+    cursor: str | None = Query(None, description="`next_cursor` of the previous page"),
+    stream: bool = Query(False, description="Stream every remaining folder as NDJSON instead of one page"),
+):
+    """
+    List the folders directly under `parent_id`, newest first.
+
+    Pages are keyset-paginated on `(created_at, folder_id)`; `stream=true`
+    writes all folders after `cursor` as newline-delimited JSON. Listing a
+    folder's children requires `view_documents` on it. Folders the caller
+    may not view are skipped, so a page can hold fewer than `limit` items
+    while `next_cursor` is still set.
+    """
+    folder_tree = await get_folder_tree(db)
+    if parent_id is not None and parent_id not in folder_tree:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Folder not found",
+        )
+
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+    permissions = await get_permission_engine(db)
+    lineage = folder_tree.lineage(parent_id) if parent_id is not None else []
+    if parent_id is not None and not permissions.authorize(
+        current_user.user_id, current_user.role_id, VIEW_DOCUMENTS_ACTION, "folder", parent_id, ancestors=lineage[1:],
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed to view this folder",
+        )
+
+    keep = permitted_rows(permissions, current_user.user_id, current_user.role_id,
+                          VIEW_DOCUMENTS_ACTION, "folder", lineage)
+
+    if stream:
+        return StreamingResponse(
+            stream_ndjson(db, folder_list_query(parent_id, after), keep),
+            media_type="application/x-ndjson",
+        )
+
+    rows, next_cursor = await fetch_page(
+        db, lambda after, limit: folder_list_query(parent_id, after, limit), after, limit, keep,
+    )
+    return TimedJSONResponse({"items": row_dicts(rows), "next_cursor": next_cursor})
+
+
+def _require_manage(
+    folder_tree: FolderTree, permissions: PermissionEngine, current_user: CurrentUser, folder_id: int,
+) -> None:
+    if folder_id not in folder_tree:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Folder not found",
+        )
+    if not permissions.authorize(current_user.user_id, current_user.role_id, MANAGE_FOLDERS_ACTION,
+                                 "folder", folder_id, ancestors=folder_tree.lineage(folder_id)[1:]):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed to manage this folder",
+        )
+
+
+async def _operation_response(db: DBSession, operation_id: int) -> BulkOperationResponse:
+    operation = await db.get(BulkOperations, operation_id, populate_existing=True)
+    if operation is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Operation not found",
+        )
+    return BulkOperationResponse.model_validate(operation)
+
+
+@router.post("/{folder_id}/move", response_model=BulkOperationResponse,
+    status_code=status.HTTP_202_ACCEPTED, summary="Move a folder and everything under it")
+async def move_folder(
+    folder_id: int, payload: FolderMoveRequest, db: DBSession, current_user: CurrentUser,
+) -> BulkOperationResponse:
+    """Re-parent a folder; its whole subtree moves with it. Poll the returned operation for the outcome."""
+    folder_tree = await get_folder_tree(db)
+    permissions = await get_permission_engine(db)
+    _require_manage(folder_tree, permissions, current_user, folder_id)
+
+    if payload.new_parent_id is not None:
+        _require_manage(folder_tree, permissions, current_user, payload.new_parent_id)
+        if folder_id in folder_tree.path(payload.new_parent_id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot move a folder under itself or its descendants",
+            )
+
+    operation_id = await bulk_folder_operations.submit(
+        BulkOperationKind.MOVE, folder_id, current_user.user_id, target_folder_id=payload.new_parent_id,
+    )
+    return await _operation_response(db, operation_id)
+
+
+@router.post("/{folder_id}/copy", response_model=BulkOperationResponse,
+    status_code=status.HTTP_202_ACCEPTED, summary="Copy a folder and everything under it")
+async def copy_folder(
+    folder_id: int, payload: FolderCopyRequest, db: DBSession, current_user: CurrentUser,
+) -> BulkOperationResponse:
+    """
+    Copy a folder with all subfolders and documents under a new parent. The
+    copies share the original blobs, are owned by the caller and inherit
+    their permissions from the new parent; copied documents go through OCR
+    and indexing again. Runs in the background in chunks; poll the returned
+    operation.
+    """
+    folder_tree = await get_folder_tree(db)
+    permissions = await get_permission_engine(db)
+    _require_manage(folder_tree, permissions, current_user, folder_id)
+
+    if payload.new_parent_id is not None:
+        _require_manage(folder_tree, permissions, current_user, payload.new_parent_id)
+        if folder_id in folder_tree.path(payload.new_parent_id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot copy a folder under itself or its descendants",
+            )
+
+    operation_id = await bulk_folder_operations.submit(
+        BulkOperationKind.COPY, folder_id, current_user.user_id, target_folder_id=payload.new_parent_id,
+    )
+    return await _operation_response(db, operation_id)
+
+
+@router.delete("/{folder_id}", response_model=BulkOperationResponse,
+    status_code=status.HTTP_202_ACCEPTED, summary="Delete a folder and everything under it")
+async def delete_folder(folder_id: int, db: DBSession, current_user: CurrentUser) -> BulkOperationResponse:
+    """
+    Delete a folder with all subfolders and documents (including their
+    processing history, permission overrides, OCR output and search
+    entries). Runs in the background in chunks; poll the returned operation.
+    """
+    folder_tree = await get_folder_tree(db)
+    permissions = await get_permission_engine(db)
+    _require_manage(folder_tree, permissions, current_user, folder_id)
+
+    operation_id = await bulk_folder_operations.submit(BulkOperationKind.DELETE, folder_id, current_user.user_id)
+    return await _operation_response(db, operation_id)
+
+
+@router.post("/{folder_id}/permissions/reset", response_model=BulkOperationResponse,
+    status_code=status.HTTP_202_ACCEPTED, summary="Make a subtree inherit this folder's permissions")
+async def reset_folder_permissions(
+    folder_id: int, payload: PermissionResetRequest, db: DBSession, current_user: CurrentUser,
+) -> BulkOperationResponse:
+    """
+    Remove the individual permission overrides set on every subfolder and
+    document below the folder, optionally only those of one user or one
+    action, so they inherit the folder's own permissions again.
+    """
+    folder_tree = await get_folder_tree(db)
+    permissions = await get_permission_engine(db)
+    _require_manage(folder_tree, permissions, current_user, folder_id)
+
+    operation_id = await bulk_folder_operations.submit(
+        BulkOperationKind.RESET_PERMISSIONS, folder_id, current_user.user_id,
+        user_id=payload.user_id, action_id=payload.action_id,
+    )
+    return await _operation_response(db, operation_id)
+
+
+@router.get("/operations/{operation_id}", response_model=BulkOperationResponse, summary="Bulk operation progress")
+async def get_operation(operation_id: int, db: DBSession, current_user: CurrentUser) -> BulkOperationResponse:
+    """Status and progress of a move, copy, delete or permission reset."""
+    operation = await _operation_response(db, operation_id)
+    if operation.requested_by_user_id != current_user.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Operation not found",
+        )
+    return operation
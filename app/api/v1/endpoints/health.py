@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+
+from app.api.deps import CurrentUser
+from app.db.pool import pool_stats
+from app.db.session import get_engine
+from app.schemas.health import PoolStats
+
+router = APIRouter()
+
+@router.get("/db-pool", response_model=PoolStats, summary="SQL connection pool stats")
+async def db_pool_stats(current_user: CurrentUser) -> PoolStats:
+    return PoolStats(**pool_stats(get_engine()))
@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+
+from app.api.deps import CurrentUser
+from app.schemas.processing import ProcessingStats, StageStats
+from app.services.processing import processing_scheduler
+
+router = APIRouter()
+
+@router.get("/stats", response_model=ProcessingStats, summary="Processing pipeline metrics")
+async def processing_stats(current_user: CurrentUser) -> ProcessingStats:
+    """Queue depth, in-flight work and throughput of every processing stage."""
+    return ProcessingStats(
+        running=processing_scheduler.running,
+        stages=[
+            StageStats(stage=stage, **values)  # type: ignore[arg-type]
+            for stage, values in processing_scheduler.stats().items()
+        ],
+    )
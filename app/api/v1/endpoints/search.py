@@ -0,0 +1,55 @@
+from fastapi import APIRouter, HTTPException, Query, status
+
+from app.api.deps import CurrentUser, DBSession
+from app.api.v1.endpoints.documents import VIEW_DOCUMENTS_ACTION
+from app.core.responses import TimedJSONResponse
+from app.schemas.search import SearchPage
+from app.services.folder_tree import get_folder_tree
+from app.services.permissions import get_permission_engine
+from app.services.search import SearchHit, search_index, search_visible
+
+router = APIRouter()
+
+@router.get("", response_model=SearchPage, summary="Full-text search over document text")
+async def search_documents(
+    db: DBSession,
+    current_user: CurrentUser,
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms; all must match"),
+    folder_id: int | None = Query(None, description="Only search this folder and its subfolders"),
+    uploaded_by: int | None = Query(None, description="Only documents uploaded by this user"),
+    limit: int = Query(20, ge=1, le=100, description="Page size"),
+    offset: int = Query(0, ge=0, description="Position to continue from (`next_offset` of the previous page)"),
+) -> TimedJSONResponse:
+    """
+    Search the OCR text and filenames of indexed documents, best match
+    first. Documents the caller may not view are removed before paging, and
+    one request reads a bounded number of hits, so a page can be short
+    (even empty) while `next_offset` still points at more.
+    """
+    folder_tree = await get_folder_tree(db)
+    folder_ids = None
+    if folder_id is not None:
+        if folder_id not in folder_tree:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Folder not found",
+            )
+        folder_ids = folder_tree.descendants(folder_id, include_self=True)
+
+    permissions = await get_permission_engine(db)
+
+    def keep(hits: list[SearchHit]) -> list[SearchHit]:
+        return [
+            hit for hit in hits
+            if hit.folder_id in folder_tree and permissions.authorize(
+                current_user.user_id, current_user.role_id, VIEW_DOCUMENTS_ACTION,
+                "document", hit.doc_id, ancestors=folder_tree.lineage(hit.folder_id),
+            )
+        ]
+
+    hits, next_offset = await search_visible(
+        search_index, q, keep, limit, offset, folder_ids=folder_ids, uploaded_by=uploaded_by,
+    )
+    return TimedJSONResponse({
+        "items": hits, "offset": offset, "next_offset": next_offset, "has_more": next_offset is not None,
+    })
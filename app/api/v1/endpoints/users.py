@@ -0,0 +1,35 @@
+from fastapi import APIRouter, HTTPException, status
+
+from app.api.deps import CurrentUser, DBSession
+from app.core.config import settings
+from app.core.responses import TimedJSONResponse
+from app.schemas.user import UserImportRequest, UserImportResult
+from app.services.password_hasher import password_hasher
+from app.services.permissions import get_permission_engine
+from app.services.users import import_users
+
+MANAGE_USERS_ACTION = "manage_users"
+
+router = APIRouter()
+
+@router.post("/import", response_model=UserImportResult, summary="Bulk import users")
+async def bulk_import_users(payload: UserImportRequest, db: DBSession, current_user: CurrentUser) -> TimedJSONResponse:
+    """
+    Create up to 100 users at once; larger imports go through
+    `python -m app.cli.import_users`. Existing or duplicate emails/usernames
+    are skipped and reported instead of failing the whole import.
+    """
+    permissions = await get_permission_engine(db)
+    if not permissions.authorize(current_user.user_id, current_user.role_id, MANAGE_USERS_ACTION):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed to import users",
+        )
+
+    # Use at most half of the shared hashing pool so logins keep flowing.
+    result = await import_users(
+        db, payload.users, password_hasher,
+        hash_concurrency=max(1, settings.PASSWORD_HASH_WORKERS // 2),
+    )
+
+    return TimedJSONResponse(result)
@@ -0,0 +1,63 @@
+"""
+Bulk-import users from a CSV file with `email,username,password,role_id` columns.
+
+    python -m app.cli.import_users users.csv --batch-size 500 --workers 8
+"""
+import argparse
+import asyncio
+import csv
+import os
+import sys
+
+from pydantic import ValidationError
+
+from app.db.session import AsyncSessionLocal, dispose_engine
+from app.schemas.user import UserCreate
+from app.services.password_hasher import PasswordHasher
+from app.services.users import import_users
+
+
+def read_users(path: str) -> tuple[list[UserCreate], int]:
+    users = []
+    invalid = 0
+    with open(path, newline="", encoding="utf-8") as handle:
+        for line_number, row in enumerate(csv.DictReader(handle), start=2):
+            try:
+                users.append(UserCreate(**row))  # type: ignore[arg-type]
+            except ValidationError as exc:
+                invalid += 1
+                print(f"line {line_number}: {exc.errors()[0]['msg']}", file=sys.stderr)
+    return users, invalid
+
+
+async def run(args: argparse.Namespace) -> int:
+    users, invalid = read_users(args.path)
+    hasher = PasswordHasher(
+        executor_kind="process", max_workers=args.workers, max_pending=args.workers * 2
+    )
+
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await import_users(
+                db, users, hasher, batch_size=args.batch_size, hash_concurrency=args.workers
+            )
+    finally:
+        hasher.shutdown()
+        await dispose_engine()
+
+    for conflict in result.conflicts:
+        print(f"skipped {conflict.email} ({conflict.username}): {conflict.reason}", file=sys.stderr)
+    print(f"created={result.created} skipped={len(result.conflicts)} invalid={invalid}")
+    return 0 if not result.conflicts and not invalid else 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="CSV file to import")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="Hashing processes")
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
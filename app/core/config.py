@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import computed_field
 from urllib.parse import quote_plus
@@ -9,6 +11,9 @@ class Settings(BaseSettings):
     MONGO_PORT: int = 10260
     MONGO_DB_NAME: str = "sdmsdb"
     MONGO_TLS_INSECURE: bool = True
+    MONGO_MAX_POOL_SIZE: int = 50
+    MONGO_MIN_POOL_SIZE: int = 0
+    MONGO_DOCUMENTS_COLLECTION: str = "documents"
     
     SQL_SERVER: str
     SQL_DB_NAME: str
@@ -16,12 +21,83 @@ class Settings(BaseSettings):
     SQL_PASS: str
     SQL_DRIVER: str = "ODBC Driver 18 for SQL Server"
 
+    # SQL connection pool
+    SQL_POOL_SIZE: int = 10
+    SQL_POOL_MAX_OVERFLOW: int = 10
+    SQL_POOL_TIMEOUT: float = 5.0
+    SQL_POOL_RECYCLE: int = 1800
+    SQL_POOL_PRE_PING: bool = True
+    SQL_POOL_WARMUP: int = 5
+
     # JWT configs
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_DAYS: int 
     JWT_ALGORITHM: str
     JWT_SECRET_KEY: str
 
+    # Password hashing worker pool
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # In-process auth caches
+    TOKEN_CACHE_SIZE: int = 10_000
+    USER_CACHE_SIZE: int = 10_000
+    USER_CACHE_TTL_SECONDS: int = 300
+
+    # Roles/Actions reference data cache
+    REFERENCE_DATA_TTL_SECONDS: int = 300
+
+    # Refresh-token revocation store
+    REVOCATION_CAPACITY: int = 100_000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    REVOCATION_COMPACT_INTERVAL_SECONDS: int = 300
+
+    # Login rate limiting
+    LOGIN_RATE_LIMIT_ENABLED: bool = True
+    LOGIN_RATE_LIMIT_PER_IP: int = 20
+    LOGIN_RATE_LIMIT_PER_ACCOUNT: int = 5
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS: int = 60
+    RATE_LIMIT_BACKEND: Literal["memory"] = "memory"
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+
+    # Document uploads
+    BLOB_STORAGE_ROOT: str = "./blobs"
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    UPLOAD_MAX_SIZE: int = 10 * 1024 * 1024 * 1024
+
+    # Document processing pipeline
+    PROCESSING_ENABLED: bool = False
+    PROCESSING_WORKERS: int = 4
+    PROCESSING_MAX_ATTEMPTS: int = 5
+    PROCESSING_BACKOFF_SECONDS: float = 1.0
+    PROCESSING_BACKOFF_MAX_SECONDS: float = 60.0
+    OCR_CLIENT: Literal["fake"] = "fake"
+    OCR_CONCURRENCY: int = 2
+    OCR_BATCH_SIZE: int = 8
+    OCR_BATCH_WAIT_MS: int = 200
+    INDEX_CONCURRENCY: int = 2
+    INDEX_BATCH_SIZE: int = 32
+    INDEX_BATCH_WAIT_MS: int = 200
+
+    # Bulk folder operations (rows per statement; SQL Server allows 2100 parameters)
+    BULK_OPERATION_CHUNK_SIZE: int = 1000
+
+    # Full-text search
+    SEARCH_BACKEND: Literal["sqlite"] = "sqlite"
+    SEARCH_INDEX_PATH: str = "./search_index.db"
+
+    # Logging and metrics
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True
+    SLOW_QUERY_THRESHOLD_MS: int = 500
+
+    # Audit log writer
+    AUDIT_QUEUE_SIZE: int = 10_000
+    AUDIT_BATCH_SIZE: int = 400
+    AUDIT_FLUSH_INTERVAL_MS: int = 1000
+    AUDIT_OVERFLOW_POLICY: Literal["drop", "block"] = "drop"
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
     @computed_field
@@ -0,0 +1,151 @@
+import bisect
+from collections.abc import Callable, Iterable, Sequence
+from contextvars import ContextVar
+
+# Latency buckets in seconds, from sub-millisecond up to the pool timeout range.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """`(upper_bound, count <= upper_bound)` pairs, ending with +Inf."""
+        result = []
+        running = 0
+        for bound, count in zip((*self.buckets, float("inf")), self._counts):
+            running += count
+            result.append((bound, running))
+        return result
+
+
+# Sample = (metric name, labels, value); collectors return them for /metrics.
+Sample = tuple[str, dict[str, str], float]
+
+_request_phases: ContextVar[dict[str, float] | None] = ContextVar("request_phases", default=None)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """
+    Process-wide request metrics, rendered in the Prometheus text format.
+
+    Per route: a latency histogram, response counts by status code and the
+    seconds spent in each phase (`db`, `hashing`, `serialization`). Phase
+    time is reported with `observe_phase` from wherever the work happens and
+    is attributed to the request running in the current context.
+    """
+
+    PHASES = ("db", "hashing", "serialization")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.in_flight = 0
+        self._latency: dict[tuple[str, str], Histogram] = {}
+        self._responses: dict[tuple[str, str, int], int] = {}
+        self._phase_seconds: dict[tuple[str, str, str], float] = {}
+        self._phase_latency = {phase: Histogram(buckets) for phase in self.PHASES}
+        self._collectors: list[Callable[[], Iterable[Sample]]] = []
+
+    def start_request(self) -> dict[str, float]:
+        """Begin attributing phase time to a new request; returns its phase totals."""
+        phases = dict.fromkeys(self.PHASES, 0.0)
+        _request_phases.set(phases)
+        self.in_flight += 1
+        return phases
+
+    def finish_request(self, method: str, route: str, status: int, duration: float, phases: dict[str, float]) -> None:
+        self.in_flight -= 1
+
+        key = (method, route)
+        histogram = self._latency.get(key)
+        if histogram is None:
+            histogram = self._latency[key] = Histogram(self.buckets)
+        histogram.observe(duration)
+
+        status_key = (method, route, status)
+        self._responses[status_key] = self._responses.get(status_key, 0) + 1
+
+        for phase, seconds in phases.items():
+            if seconds:
+                phase_key = (method, route, phase)
+                self._phase_seconds[phase_key] = self._phase_seconds.get(phase_key, 0.0) + seconds
+
+    def observe_phase(self, phase: str, seconds: float) -> None:
+        self._phase_latency[phase].observe(seconds)
+        phases = _request_phases.get()
+        if phases is not None:
+            phases[phase] += seconds
+
+    def add_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        """Register a callback contributing gauge samples at render time."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: list[str] = []
+
+        def histogram(name: str, labels: dict[str, str], value: Histogram) -> None:
+            for bound, count in value.cumulative():
+                lines.append(f"{name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value.sum)}")
+            lines.append(f"{name}_count{_format_labels(labels)} {value.count}")
+
+        lines.append("# TYPE http_requests_in_flight gauge")
+        lines.append(f"http_requests_in_flight {self.in_flight}")
+
+        lines.append("# TYPE http_request_duration_seconds histogram")
+        for (method, route), value in sorted(self._latency.items()):
+            histogram("http_request_duration_seconds", {"method": method, "route": route}, value)
+
+        lines.append("# TYPE http_responses_total counter")
+        for (method, route, status), count in sorted(self._responses.items()):
+            labels = {"method": method, "route": route, "status": str(status)}
+            lines.append(f"http_responses_total{_format_labels(labels)} {count}")
+
+        lines.append("# TYPE http_request_phase_seconds_total counter")
+        for (method, route, phase), seconds in sorted(self._phase_seconds.items()):
+            labels = {"method": method, "route": route, "phase": phase}
+            lines.append(f"http_request_phase_seconds_total{_format_labels(labels)} {_format_value(seconds)}")
+
+        lines.append("# TYPE phase_duration_seconds histogram")
+        for phase, value in self._phase_latency.items():
+            histogram("phase_duration_seconds", {"phase": phase}, value)
+
+        gauges: dict[str, list[tuple[dict[str, str], float]]] = {}
+        for collector in self._collectors:
+            for name, labels, value in collector():
+                gauges.setdefault(name, []).append((labels, value))
+        for name, samples in gauges.items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in samples)
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,100 @@
+import logging
+import re
+import time
+import uuid
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.logging import request_id_var
+from app.core.metrics import MetricsRegistry
+
+access_logger = logging.getLogger("app.access")
+
+REQUEST_ID_HEADER = "x-request-id"
+_VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._-]{1,64}")
+
+
+def route_label(scope: Scope) -> str:
+    """
+    Path template of the route that handled the request, e.g.
+    `/api/v1/documents/upload`, or `<unmatched>`.
+
+    Depending on the FastAPI version the matched route carries its full path
+    or only the part below its router's prefix; the (static) prefix is then
+    recovered from the request path.
+    """
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    path_regex = getattr(route, "path_regex", None)
+    if path_format is None or path_regex is None:
+        return "<unmatched>"
+
+    path = scope["path"]
+    for index, char in enumerate(path + "/"):
+        if char == "/" and path_regex.match(path[index:]):
+            return path[:index] + path_format
+    return path_format
+
+
+class RequestMetricsMiddleware:
+    """
+    Pure ASGI middleware giving every HTTP request an id and recording its
+    latency, status and phase breakdown in `registry`.
+
+    An incoming `X-Request-ID` is reused when well-formed, otherwise one is
+    generated; either way it is echoed in the response and attached to every
+    log record emitted while handling the request. Latency is labelled with
+    the route template (e.g. `/api/v1/documents`), never the raw path, to
+    keep label cardinality bounded.
+    """
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry) -> None:
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER.encode():
+                candidate = value.decode("latin-1")
+                if _VALID_REQUEST_ID.fullmatch(candidate):
+                    request_id = candidate
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        status = 500
+        started = time.perf_counter()
+        phases = self.registry.start_request()
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [*message.get("headers", []), (REQUEST_ID_HEADER.encode(), request_id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            duration = time.perf_counter() - started
+            route = route_label(scope)
+            method = scope["method"]
+
+            self.registry.finish_request(method, route, status, duration, phases)
+            access_logger.info(
+                "%s %s %d %.1fms", method, scope["path"], status, duration * 1000,
+                extra={
+                    "method": method,
+                    "path": scope["path"],
+                    "route": route,
+                    "status": status,
+                    "duration_ms": round(duration * 1000, 3),
+                    **{f"{phase}_ms": round(seconds * 1000, 3) for phase, seconds in phases.items()},
+                },
+            )
+            request_id_var.reset(token)
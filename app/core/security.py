@@ -1,8 +1,9 @@
+import uuid
 from datetime import timedelta, datetime, timezone
 from typing import Any
 
 import bcrypt
-from jose import jwt
+from jose import JWTError, jwt
 
 from app.core.config import settings
 
@@ -51,12 +52,17 @@ def create_access_token(subject: int, role_id: int, expires_delta: timedelta | N
 
     return encoded_jwt
 
-def create_refresh_token(subject: int) -> str:
+def create_refresh_token(subject: int, role_id: int | None = None, family: str | None = None) -> str:
     """
     Create a JWT refresh token.
 
+    Every token gets a unique `jti`. Tokens rotated from one login share a
+    `fam` (family) id, so reuse of a rotated token can revoke the whole chain.
+
     Args:
         subject: The user_id to encode in the token
+        role_id: The role_id to carry into refreshed access tokens
+        family: Family id of the token being rotated; a new family if None
 
     Returns:
         Encoded JWT refresh token string
@@ -68,10 +74,36 @@ def create_refresh_token(subject: int) -> str:
         "sub": str(subject),
         "exp": expire,
         "type": "refresh",
-        "iat": datetime.now(timezone.utc)
+        "iat": datetime.now(timezone.utc),
+        "jti": uuid.uuid4().hex,
+        "fam": family or uuid.uuid4().hex,
     }
+    if role_id is not None:
+        to_encode["rid"] = role_id
 
     encoded_jwt = jwt.encode(
         to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
     )
     return encoded_jwt
+
+def decode_token(token: str, expected_type: str = "access") -> dict[str, Any]:
+    """
+    Decode and verify a JWT minted by this module.
+
+    Args:
+        token: Encoded JWT string
+        expected_type: Required value of the `type` claim
+
+    Returns:
+        The verified claims
+
+    Raises:
+        JWTError: If the signature, expiry or token type is invalid
+    """
+
+    claims = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+
+    if claims.get("type") != expected_type or "sub" not in claims:
+        raise JWTError("Unexpected token type")
+
+    return claims
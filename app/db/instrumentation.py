@@ -0,0 +1,60 @@
+import logging
+import time
+import weakref
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.metrics import MetricsRegistry
+
+logger = logging.getLogger("app.db.slow_query")
+
+# Long statements (multi-row INSERTs) are cut in the slow-query log.
+MAX_LOGGED_STATEMENT = 1000
+
+_STARTED_KEY = "query_started"
+
+# Engines that already carry the listeners below.
+_instrumented: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
+
+def instrument_queries(engine: AsyncEngine | Engine, registry: MetricsRegistry, slow_threshold: float | None) -> None:
+    """
+    Time every cursor execution on `engine` as the `db` phase of the current
+    request, and log statements slower than `slow_threshold` seconds (without
+    their parameters, which may hold personal data). Instrumenting the same
+    engine again is a no-op, so queries are never counted twice.
+    """
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if sync_engine in _instrumented:
+        return
+    _instrumented.add(sync_engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        started = conn.info[_STARTED_KEY].pop()
+        elapsed = time.perf_counter() - started
+        registry.observe_phase("db", elapsed)
+
+        if slow_threshold is not None and elapsed >= slow_threshold:
+            logger.warning(
+                "Slow query took %.1fms", elapsed * 1000,
+                extra={
+                    "duration_ms": round(elapsed * 1000, 3),
+                    "statement": statement[:MAX_LOGGED_STATEMENT],
+                    "executemany": executemany,
+                },
+            )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(context: Any) -> None:
+        # after_cursor_execute is skipped when the statement fails.
+        conn = context.connection
+        if conn is not None and conn.info.get(_STARTED_KEY):
+            registry.observe_phase("db", time.perf_counter() - conn.info[_STARTED_KEY].pop())
@@ -0,0 +1,32 @@
+from typing import Any
+
+from pymongo import AsyncMongoClient
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
+
+from app.core.config import settings
+
+_client: AsyncMongoClient[dict[str, Any]] | None = None
+
+def get_mongo_client() -> AsyncMongoClient[dict[str, Any]]:
+    """The process-wide Mongo client; its connection pool is shared by every caller."""
+    global _client
+    if _client is None:
+        _client = AsyncMongoClient(
+            settings.MONGO_CONNECTION_STRING,
+            maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+        )
+    return _client
+
+def get_mongo_db() -> AsyncDatabase[dict[str, Any]]:
+    return get_mongo_client()[settings.MONGO_DB_NAME]
+
+def get_documents_collection() -> AsyncCollection[dict[str, Any]]:
+    return get_mongo_db()[settings.MONGO_DOCUMENTS_COLLECTION]
+
+async def close_mongo_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -0,0 +1,116 @@
+"""
+In-memory stand-in for the subset of an async Mongo collection used by
+`DocumentStore`, for local runs, tests and benchmarks without a server.
+"""
+import copy
+from collections.abc import AsyncIterator, Iterable, Mapping
+from typing import Any
+
+from pymongo import UpdateOne
+from pymongo.results import BulkWriteResult, DeleteResult
+
+
+def _matches(document: Mapping[str, Any], query: Mapping[str, Any]) -> bool:
+    for field, condition in query.items():
+        value = document.get(field)
+        if isinstance(condition, Mapping) and "$in" in condition:
+            if value not in condition["$in"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+def _project(document: Mapping[str, Any], projection: Mapping[str, Any] | None) -> dict[str, Any]:
+    if not projection:
+        return copy.deepcopy(dict(document))
+
+    included = {field for field, flag in projection.items() if flag and field != "_id"}
+    if included:
+        result = {field: document[field] for field in included if field in document}
+        if projection.get("_id", 1) and "_id" in document:
+            result["_id"] = document["_id"]
+        return copy.deepcopy(result)
+
+    excluded = {field for field, flag in projection.items() if not flag}
+    return copy.deepcopy({field: value for field, value in document.items() if field not in excluded})
+
+
+class InMemoryCursor:
+    def __init__(self, documents: list[dict[str, Any]]) -> None:
+        self._documents = documents
+
+    def __aiter__(self) -> AsyncIterator[dict[str, Any]]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[dict[str, Any]]:
+        for document in self._documents:
+            yield document
+
+    async def to_list(self, length: int | None = None) -> list[dict[str, Any]]:
+        return self._documents[:length] if length is not None else list(self._documents)
+
+
+class InMemoryCollection:
+    """Supports `find` and `delete_many` with equality/`$in` filters,
+    projections, and `bulk_write` of upserting `UpdateOne` operations with
+    `$set`/`$setOnInsert`."""
+
+    def __init__(self) -> None:
+        self.documents: dict[Any, dict[str, Any]] = {}
+        self.round_trips = 0
+
+    def find(self, filter: Mapping[str, Any] | None = None, projection: Mapping[str, Any] | None = None) -> InMemoryCursor:
+        self.round_trips += 1
+        filter = filter or {}
+        return InMemoryCursor([
+            _project(document, projection)
+            for document in self._candidates(filter)
+            if _matches(document, filter)
+        ])
+
+    def _candidates(self, query: Mapping[str, Any]) -> Iterable[dict[str, Any]]:
+        key = query.get("_id")
+        if key is None:
+            return self.documents.values()
+        keys = key["$in"] if isinstance(key, Mapping) and "$in" in key else [key]
+        return [self.documents[k] for k in dict.fromkeys(keys) if k in self.documents]
+
+    async def bulk_write(self, requests: Iterable[UpdateOne], ordered: bool = True) -> BulkWriteResult:
+        self.round_trips += 1
+        matched = modified = 0
+        upserted = []
+
+        for index, request in enumerate(requests):
+            # UpdateOne keeps its arguments in private slots only.
+            query, update, upsert = request._filter, request._doc, request._upsert
+            target = next((doc for doc in self._candidates(query) if _matches(doc, query)), None)
+
+            if target is None:
+                if not upsert:
+                    continue
+                target = {field: value for field, value in query.items() if not isinstance(value, Mapping)}
+                target.update(update.get("$setOnInsert", {}))
+                target.update(update.get("$set", {}))
+                self.documents[target["_id"]] = target
+                upserted.append({"index": index, "_id": target["_id"]})
+                continue
+
+            matched += 1
+            changes = update.get("$set", {})
+            if any(target.get(field) != value for field, value in changes.items()):
+                target.update(copy.deepcopy(changes))
+                modified += 1
+
+        return BulkWriteResult({
+            "nInserted": 0, "nUpserted": len(upserted), "nMatched": matched,
+            "nModified": modified, "nRemoved": 0, "upserted": upserted,
+            "writeErrors": [], "writeConcernErrors": [],
+        }, acknowledged=True)
+
+    async def delete_many(self, filter: Mapping[str, Any]) -> DeleteResult:
+        self.round_trips += 1
+        doomed = [document["_id"] for document in self._candidates(filter) if _matches(document, filter)]
+        for key in doomed:
+            del self.documents[key]
+        return DeleteResult({"n": len(doomed)}, acknowledged=True)
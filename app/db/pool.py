@@ -0,0 +1,52 @@
+import time
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+from app.core.metrics import Histogram
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool that records how long each checkout takes, including
+    waiting for a free slot, opening new connections and pre-ping.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = Histogram()
+        self.checkout_timeouts = 0
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.checkout_timeouts += 1
+            raise
+        finally:
+            self.checkout_wait.observe(time.perf_counter() - started)
+
+
+def pool_stats(engine: AsyncEngine) -> dict[str, Any]:
+    """Live counters of the engine's connection pool."""
+    pool = engine.pool
+    stats: dict[str, Any] = {
+        "pool_class": type(pool).__name__,
+        "size": getattr(pool, "size", lambda: 0)(),
+        "checked_in": getattr(pool, "checkedin", lambda: 0)(),
+        "checked_out": getattr(pool, "checkedout", lambda: 0)(),
+        "overflow": getattr(pool, "overflow", lambda: 0)(),
+    }
+
+    if isinstance(pool, InstrumentedAsyncPool):
+        wait = pool.checkout_wait
+        stats.update(
+            checkout_timeouts=pool.checkout_timeouts,
+            checkout_count=wait.count,
+            checkout_wait_seconds_total=wait.sum,
+            checkout_wait_buckets=wait.cumulative()[:-1],
+        )
+    return stats
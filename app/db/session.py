@@ -1,9 +1,96 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+import asyncio
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncConnection, AsyncEngine, AsyncSession
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.instrumentation import instrument_queries
+from app.db.pool import InstrumentedAsyncPool
+
+_engine: AsyncEngine | None = None
+
+def get_engine() -> AsyncEngine:
+    """
+    The process-wide SQL engine, created on first use so that importing
+    this module neither loads the ODBC driver nor opens connections.
+    """
+    global _engine
+    if _engine is None:
+        set_engine(create_async_engine(
+            settings.SQL_CONNECTION_STRING, # type: ignore
+            poolclass=InstrumentedAsyncPool,
+            pool_size=settings.SQL_POOL_SIZE,
+            max_overflow=settings.SQL_POOL_MAX_OVERFLOW,
+            pool_timeout=settings.SQL_POOL_TIMEOUT,
+            pool_recycle=settings.SQL_POOL_RECYCLE,
+            pool_pre_ping=settings.SQL_POOL_PRE_PING,
+        ))
+    return _engine  # type: ignore[return-value]
+
+def peek_engine() -> AsyncEngine | None:
+    """The engine if it has been created, without creating it."""
+    return _engine
+
+def set_engine(engine: AsyncEngine) -> None:
+    """
+    Use `engine` for every session from now on, e.g. a SQLite engine in
+    benchmarks. Must be called before the first session is opened; passing
+    the same engine again does not instrument it twice.
+    """
+    global _engine
+    _engine = engine
+    instrument_queries(engine, metrics, slow_threshold=settings.SLOW_QUERY_THRESHOLD_MS / 1000)
+    AsyncSessionLocal.configure(bind=engine)
+
+async def dispose_engine() -> None:
+    """
+    Close every pooled connection. The engine itself (including one passed
+    to `set_engine`) stays in place and reconnects if used again.
+    """
+    if _engine is not None:
+        await _engine.dispose()
+
 
-engine = create_async_engine(settings.SQL_CONNECTION_STRING) # type: ignore
-AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+class _LazySessionmaker(async_sessionmaker[AsyncSession]):
+    """Session factory that binds to `get_engine()` the first time it is called."""
+
+    def __call__(self, **local_kw: Any) -> AsyncSession:
+        if self.kw.get("bind") is None:
+            get_engine()
+        return super().__call__(**local_kw)
+
+
+AsyncSessionLocal = _LazySessionmaker(expire_on_commit=False, class_=AsyncSession)
 
 async def get_db():
     async with AsyncSessionLocal() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+async def warm_pool(connections: int = settings.SQL_POOL_WARMUP) -> None:
+    """
+    Open `connections` pooled connections at once so the first requests
+    after startup don't pay for ODBC connection setup.
+    """
+    engine = get_engine()
+    connections = min(connections, settings.SQL_POOL_SIZE)
+
+    async def open_connection() -> AsyncConnection:
+        conn = await engine.connect().start()
+        try:
+            await conn.execute(text("SELECT 1"))
+        except BaseException:
+            await conn.close()
+            raise
+        return conn
+
+    # Hold every connection until all are open, otherwise early ones are
+    # simply returned and reused and the pool ends up smaller than asked.
+    results = await asyncio.gather(*(open_connection() for _ in range(connections)), return_exceptions=True)
+    for result in results:
+        if isinstance(result, AsyncConnection):
+            await result.close()
+
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
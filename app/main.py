@@ -1,10 +1,131 @@
-from fastapi import FastAPI, status, Response
-from app.api.v1 import api
+import sys
+from collections.abc import Iterator
+from contextlib import asynccontextmanager
 
-app = FastAPI(title="NassaQ Backend")
+from fastapi import FastAPI, Request, status, Response
+from fastapi.responses import JSONResponse, PlainTextResponse
 
-app.include_router(api.api_router, prefix='/api/v1')
+from app.core.config import settings
+from app.core.logging import configure_logging
+from app.core.metrics import Sample, metrics
+from app.core.middleware import RequestMetricsMiddleware
+from app.core.responses import TimedJSONResponse
+from app.services.password_hasher import PasswordHasherBusy
 
-@app.get("/", status_code=status.HTTP_204_NO_CONTENT)
-async def root():
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+
+def _runtime_samples() -> Iterator[Sample]:
+    # Only subsystems that are already loaded are reported; rendering
+    # /metrics never imports or creates them.
+    session = sys.modules.get("app.db.session")
+    engine = session.peek_engine() if session is not None else None
+    if engine is not None:
+        from app.db.pool import pool_stats
+
+        pool = pool_stats(engine)
+        for key in ("size", "checked_out", "overflow", "checkout_timeouts"):
+            if key in pool:
+                yield f"db_pool_{key}", {}, pool[key]
+
+    from app.services.password_hasher import password_hasher
+
+    yield "password_hash_pending", {}, password_hasher.pending
+
+    if "app.services.audit" in sys.modules:
+        from app.services.audit import audit_logger
+
+        yield "audit_log_written", {}, audit_logger.written
+        yield "audit_log_dropped", {}, audit_logger.dropped
+        yield "audit_log_failed", {}, audit_logger.failed
+
+    if "app.services.rate_limit" in sys.modules:
+        from app.services.rate_limit import login_rate_limiter
+
+        yield "login_rate_limited", {}, login_rate_limiter.rejected
+
+    if "app.services.processing" in sys.modules:
+        from app.services.processing import processing_scheduler
+
+        for stage, stats in processing_scheduler.stats().items():
+            yield "processing_queue_depth", {"stage": stage}, stats["queue_depth"]
+            yield "processing_in_flight", {"stage": stage}, stats["in_flight"]
+
+
+metrics.add_collector(_runtime_samples)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Routers, models, the SQL engine and the Mongo client are only loaded
+    # here, so importing this module (or any CLI/worker entry point that
+    # needs part of the app) stays cheap.
+    from app.api.v1 import api
+    from app.db.mongo import close_mongo_client, get_mongo_client
+    from app.db.session import AsyncSessionLocal, dispose_engine, get_engine, warm_pool
+    from app.services.audit import audit_logger
+    from app.services.bulk_operations import bulk_folder_operations
+    from app.services.password_hasher import password_hasher
+    from app.services.processing import processing_scheduler
+    from app.services.reference_data import reference_data
+    from app.services.search import search_index
+
+    if not getattr(app.state, "api_included", False):
+        app.include_router(api.api_router, prefix='/api/v1')
+        app.state.api_included = True
+
+    get_engine()
+    if settings.SQL_POOL_WARMUP:
+        await warm_pool()
+
+    async with AsyncSessionLocal() as db:
+        await reference_data.load(db)
+
+    get_mongo_client()
+    await audit_logger.start()
+    if await bulk_folder_operations.check_tables():
+        await bulk_folder_operations.fail_interrupted()
+        await bulk_folder_operations.retry_cleanup()
+
+    if settings.PROCESSING_ENABLED:
+        await processing_scheduler.start()
+
+    yield
+
+    await processing_scheduler.stop()
+    await bulk_folder_operations.stop()
+    await audit_logger.stop()
+    await search_index.close()
+    password_hasher.shutdown()
+    await close_mongo_client()
+    await dispose_engine()
+
+
+def create_app() -> FastAPI:
+    """
+    Build the application. Heavy dependencies are wired up in `lifespan`,
+    so this is also usable as `uvicorn --factory app.main:create_app`.
+    """
+    configure_logging(settings.LOG_LEVEL, json_format=settings.LOG_JSON)
+
+    app = FastAPI(title="NassaQ Backend", lifespan=lifespan, default_response_class=TimedJSONResponse)
+    app.add_middleware(RequestMetricsMiddleware, registry=metrics)
+
+    @app.exception_handler(PasswordHasherBusy)
+    async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy) -> JSONResponse:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": "Server is busy, please retry shortly"},
+            headers={"Retry-After": "1"},
+        )
+
+    @app.get("/", status_code=status.HTTP_204_NO_CONTENT)
+    async def root():
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+    @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+    async def prometheus_metrics() -> PlainTextResponse:
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+    return app
+
+
+app = create_app()
@@ -98,7 +98,8 @@ class Folders(Base):
     __table_args__ = (
         ForeignKeyConstraint(['created_by_user_id'], ['Users.user_id'], name='FK_Folder_Creator'),
         ForeignKeyConstraint(['parent_folder_id'], ['Folders.folder_id'], name='FK_Folder_Parent'),
-        PrimaryKeyConstraint('folder_id', name='PK__Folders__0045071B1BA60619')
+        PrimaryKeyConstraint('folder_id', name='PK__Folders__0045071B1BA60619'),
+        Index('IX_Folders_Parent_Created', 'parent_folder_id', 'created_at', 'folder_id')
     )
 
     folder_id: Mapped[int] = mapped_column(Integer, Identity(start=1, increment=1), primary_key=True)
@@ -118,7 +119,8 @@ class IndividualPermissions(Base):
     __table_args__ = (
         ForeignKeyConstraint(['action_id'], ['Actions.action_id'], name='FK_IndPerm_Action'),
         ForeignKeyConstraint(['user_id'], ['Users.user_id'], name='FK_IndPerm_User'),
-        PrimaryKeyConstraint('permission_id', name='PK__Individu__E5331AFA5F875CCF')
+        PrimaryKeyConstraint('permission_id', name='PK__Individu__E5331AFA5F875CCF'),
+        Index('IX_IndPerm_Entity', 'entity_type', 'entity_id')
     )
 
     permission_id: Mapped[int] = mapped_column(BigInteger, Identity(start=1, increment=1), primary_key=True)
@@ -155,7 +157,8 @@ class Documents(Base):
     __table_args__ = (
         ForeignKeyConstraint(['folder_id'], ['Folders.folder_id'], name='FK_Doc_Folder'),
         ForeignKeyConstraint(['uploaded_by_user_id'], ['Users.user_id'], name='FK_Doc_Uploader'),
-        PrimaryKeyConstraint('doc_id', name='PK__Document__8AD02924828124C8')
+        PrimaryKeyConstraint('doc_id', name='PK__Document__8AD02924828124C8'),
+        Index('IX_Documents_Folder_Uploaded', 'folder_id', 'uploaded_at', 'doc_id')
     )
 
     doc_id: Mapped[int] = mapped_column(BigInteger, Identity(start=1, increment=1), primary_key=True)
@@ -175,7 +178,8 @@ class ProcessingStatus(Base):
     __tablename__ = 'Processing_Status'
     __table_args__ = (
         ForeignKeyConstraint(['doc_id'], ['Documents.doc_id'], name='FK_ProcStatus_Doc'),
-        PrimaryKeyConstraint('status_id', name='PK__Processi__3683B5310CA4907C')
+        PrimaryKeyConstraint('status_id', name='PK__Processi__3683B5310CA4907C'),
+        Index('IX_ProcStatus_Doc', 'doc_id')
     )
 
     status_id: Mapped[int] = mapped_column(BigInteger, Identity(start=1, increment=1), primary_key=True)
@@ -187,3 +191,34 @@ class ProcessingStatus(Base):
     error_message: Mapped[Optional[str]] = mapped_column(Unicode(collation='SQL_Latin1_General_CP1_CI_AS'))
 
     doc: Mapped['Documents'] = relationship('Documents', back_populates='Processing_Status')
+
+
+class BulkOperations(Base):
+    __tablename__ = 'Bulk_Operations'
+    __table_args__ = (
+        ForeignKeyConstraint(['requested_by_user_id'], ['Users.user_id'], name='FK_BulkOp_User'),
+        PrimaryKeyConstraint('operation_id', name='PK_Bulk_Operations')
+    )
+
+    operation_id: Mapped[int] = mapped_column(BigInteger, Identity(start=1, increment=1), primary_key=True)
+    operation: Mapped[str] = mapped_column(String(30, 'SQL_Latin1_General_CP1_CI_AS'), nullable=False)
+    folder_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    requested_by_user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    status: Mapped[str] = mapped_column(String(20, 'SQL_Latin1_General_CP1_CI_AS'), nullable=False)
+    total: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text('((0))'))
+    processed: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text('((0))'))
+    start_time: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False, server_default=text('(getdate())'))
+    target_folder_id: Mapped[Optional[int]] = mapped_column(Integer)
+    end_time: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime)
+    error_message: Mapped[Optional[str]] = mapped_column(Unicode(collation='SQL_Latin1_General_CP1_CI_AS'))
+
+
+class DocumentCleanup(Base):
+    __tablename__ = 'Document_Cleanup'
+    __table_args__ = (
+        PrimaryKeyConstraint('doc_id', name='PK_Document_Cleanup'),
+    )
+
+    doc_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    mongo_doc_id: Mapped[str] = mapped_column(String(36, 'SQL_Latin1_General_CP1_CI_AS'), nullable=False)
+    deleted_at: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False, server_default=text('(getdate())'))
@@ -5,4 +5,9 @@ class Token(BaseModel):
 
     access_token: str = Field(..., description="JWT access token")
     refresh_token: str = Field(..., description="JWT refresh token")
-    token_type: str = Field(default="bearer", description="Token type")
\ No newline at end of file
+    token_type: str = Field(default="bearer", description="Token type")
+
+class RefreshRequest(BaseModel):
+    """Request schema for rotating or revoking a refresh token"""
+
+    refresh_token: str = Field(..., description="JWT refresh token")
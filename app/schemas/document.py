@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class DocumentUploadResponse(BaseModel):
+    """Result of a streamed document upload."""
+
+    doc_id: int
+    filename: str
+    folder_id: int
+    content_hash: str = Field(..., description="SHA-256 of the uploaded content")
+    size: int = Field(..., description="Size of the uploaded content in bytes")
+    deduplicated: bool = Field(..., description="Whether identical content was already stored")
+
+
+class DocumentItem(BaseModel):
+    """A document as listed inside a folder."""
+
+    doc_id: int
+    filename: str
+    folder_id: int
+    uploaded_by_user_id: int
+    uploaded_at: datetime
+
+
+class DocumentPage(BaseModel):
+    items: list[DocumentItem]
+    next_cursor: str | None = Field(None, description="Pass as `cursor` to fetch the next page; null on the last page")
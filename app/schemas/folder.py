@@ -0,0 +1,61 @@
+from datetime import datetime
+from enum import StrEnum
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.schemas.processing import ProcessingState
+
+
+class FolderItem(BaseModel):
+    """A folder as listed under its parent."""
+
+    folder_id: int
+    folder_name: str
+    parent_folder_id: int | None
+    created_by_user_id: int
+    created_at: datetime
+
+
+class FolderPage(BaseModel):
+    items: list[FolderItem]
+    next_cursor: str | None = Field(None, description="Pass as `cursor` to fetch the next page; null on the last page")
+
+
+class BulkOperationKind(StrEnum):
+    """Values stored in `Bulk_Operations.operation`."""
+
+    MOVE = "move"
+    COPY = "copy"
+    DELETE = "delete"
+    RESET_PERMISSIONS = "reset_permissions"
+
+
+class FolderMoveRequest(BaseModel):
+    new_parent_id: int | None = Field(..., description="New parent folder; null moves the folder to the root")
+
+
+class FolderCopyRequest(BaseModel):
+    new_parent_id: int | None = Field(..., description="Folder to copy into; null copies the folder to the root")
+
+
+class PermissionResetRequest(BaseModel):
+    user_id: int | None = Field(None, description="Only remove this user's overrides")
+    action_id: int | None = Field(None, description="Only remove overrides of this action")
+
+
+class BulkOperationResponse(BaseModel):
+    """Progress of a bulk folder operation, as recorded in `Bulk_Operations`."""
+
+    operation_id: int
+    operation: BulkOperationKind
+    folder_id: int
+    target_folder_id: int | None
+    requested_by_user_id: int
+    status: ProcessingState
+    total: int = Field(..., description="Rows to process, known once the operation has started")
+    processed: int
+    start_time: datetime
+    end_time: datetime | None
+    error_message: str | None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+
+
+class PoolStats(BaseModel):
+    """Live state of the SQL connection pool."""
+
+    pool_class: str
+    size: int = Field(..., description="Configured number of persistent connections")
+    checked_in: int = Field(..., description="Idle connections in the pool")
+    checked_out: int = Field(..., description="Connections currently in use")
+    overflow: int = Field(..., description="Connections opened beyond `size` (negative while the pool fills)")
+    checkout_timeouts: int = 0
+    checkout_count: int = 0
+    checkout_wait_seconds_total: float = 0.0
+    checkout_wait_buckets: list[tuple[float, int]] = Field(
+        default_factory=list,
+        description="Cumulative checkout wait histogram as (upper bound in seconds, count) pairs; the +Inf bucket equals `checkout_count`",
+    )
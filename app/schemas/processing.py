@@ -0,0 +1,35 @@
+from enum import StrEnum
+
+from pydantic import BaseModel, Field
+
+
+class ProcessingStage(StrEnum):
+    """Values stored in `Processing_Status.stage_name`, in pipeline order."""
+
+    UPLOAD = "upload"
+    OCR = "ocr"
+    INDEX = "index"
+
+
+class ProcessingState(StrEnum):
+    """Values stored in `Processing_Status.status`."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class StageStats(BaseModel):
+    stage: ProcessingStage
+    queue_depth: int = Field(..., description="Documents waiting for this stage")
+    in_flight: int = Field(..., description="Documents currently being processed")
+    completed: int
+    failed: int = Field(..., description="Documents that exhausted their retries")
+    retried: int
+    throughput_per_second: float = Field(..., description="Completions per second over the last minute")
+
+
+class ProcessingStats(BaseModel):
+    running: bool
+    stages: list[StageStats]
@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field
+
+
+class SearchResult(BaseModel):
+    doc_id: int
+    filename: str
+    folder_id: int
+    uploaded_by_user_id: int
+    score: float = Field(..., description="BM25 relevance, higher is better")
+    snippet: str = Field(..., description="Matching excerpt of the OCR text, terms in [brackets]")
+
+
+class SearchPage(BaseModel):
+    items: list[SearchResult]
+    offset: int
+    next_offset: int | None = Field(None, description="Pass as `offset` to fetch the next page; null on the last page")
+    has_more: bool
@@ -49,4 +49,20 @@ class UserResponse(UserBase):
     # is_active: bool
     created_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class UserImportRequest(BaseModel):
+    users: list[UserCreate] = Field(
+        ..., min_length=1, max_length=100,
+        description="Each password is hashed with bcrypt, so a request is capped to what finishes in time; "
+                    "import larger files with `python -m app.cli.import_users`",
+    )
+
+class UserImportConflict(BaseModel):
+    email: str
+    username: str
+    reason: str
+
+class UserImportResult(BaseModel):
+    created: int = Field(..., description="Number of users created")
+    conflicts: list[UserImportConflict] = Field(default_factory=list, description="Users that were skipped")
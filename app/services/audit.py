@@ -0,0 +1,158 @@
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Literal
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.models import Logs
+
+logger = logging.getLogger(__name__)
+
+# SQL Server allows 2100 parameters per statement; a Logs row binds 5.
+ROWS_PER_INSERT = 400
+
+
+@dataclass(frozen=True, slots=True)
+class AuditEntry:
+    action_type: str
+    user_id: int | None
+    entity_id: int | None
+    details: str | None
+    log_timestamp: datetime
+
+
+class AuditLogger:
+    """
+    Fire-and-forget writer for the Logs table.
+
+    `log` only enqueues; a background task flushes the queue with multi-row
+    INSERTs once `batch_size` entries are waiting or `flush_interval` has
+    passed. When the queue is full, the `drop` policy discards the entry
+    (counted in `dropped`) and `block` makes the caller wait for room.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        max_queue: int = 10_000,
+        batch_size: int = 400,
+        flush_interval: float = 1.0,
+        overflow_policy: Literal["drop", "block"] = "drop",
+    ) -> None:
+        self._session_factory = session_factory
+        self._queue: asyncio.Queue[AuditEntry | None] = asyncio.Queue(maxsize=max_queue)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._overflow_policy = overflow_policy
+        self._batch_ready = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def log(
+        self,
+        action_type: str,
+        user_id: int | None = None,
+        entity_id: int | None = None,
+        details: str | dict[str, Any] | None = None,
+    ) -> None:
+        if isinstance(details, dict):
+            details = json.dumps(details, default=str)
+
+        entry = AuditEntry(action_type, user_id, entity_id, details, datetime.now())
+
+        if self._overflow_policy == "block" and self.running:
+            await self._queue.put(entry)
+        else:
+            try:
+                self._queue.put_nowait(entry)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                return
+
+        if self._queue.qsize() >= self._batch_size:
+            self._batch_ready.set()
+
+    async def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="audit-logger")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Flush everything queued so far, then stop the writer."""
+        if self._task is None:
+            return
+
+        await self._queue.put(None)
+        self._batch_ready.set()
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Audit log drain timed out with %d entries queued", self._queue.qsize())
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            first = await self._queue.get()
+            batch = [first] if first is not None else []
+            stopping = first is None
+
+            if not stopping and self._queue.qsize() < self._batch_size - 1:
+                self._batch_ready.clear()
+                try:
+                    await asyncio.wait_for(self._batch_ready.wait(), self._flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+            # On shutdown drain the whole queue, otherwise take one batch.
+            while (stopping or len(batch) < self._batch_size) and not self._queue.empty():
+                entry = self._queue.get_nowait()
+                if entry is None:
+                    stopping = True
+                else:
+                    batch.append(entry)
+
+            if batch:
+                await self._flush(batch)
+            if stopping:
+                return
+
+    async def _flush(self, entries: list[AuditEntry]) -> None:
+        try:
+            async with self._session_factory() as db:
+                for start in range(0, len(entries), ROWS_PER_INSERT):
+                    await db.execute(insert(Logs).values([
+                        {
+                            "action_type": entry.action_type,
+                            "user_id": entry.user_id,
+                            "entity_id": entry.entity_id,
+                            "details": entry.details,
+                            "log_timestamp": entry.log_timestamp,
+                        }
+                        for entry in entries[start:start + ROWS_PER_INSERT]
+                    ]))
+                await db.commit()
+        except Exception:
+            self.failed += len(entries)
+            logger.exception("Could not write %d audit log entries", len(entries))
+        else:
+            self.written += len(entries)
+
+
+audit_logger = AuditLogger(
+    session_factory=AsyncSessionLocal,
+    max_queue=settings.AUDIT_QUEUE_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_MS / 1000,
+    overflow_policy=settings.AUDIT_OVERFLOW_POLICY,
+)
@@ -0,0 +1,52 @@
+import hashlib
+from typing import Any
+
+from sqlalchemy import event
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import decode_token
+from app.models.models import Users
+from app.schemas.user import UserResponse
+
+# Verified access-token claims keyed by SHA-256 of the raw token; each entry
+# expires together with the token itself.
+token_cache: TTLCache[bytes, dict[str, Any]] = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE)
+
+# Public user snapshots keyed by user_id.
+user_cache: TTLCache[int, UserResponse] = TTLCache(
+    maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+
+def token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+def get_verified_claims(token: str) -> dict[str, Any]:
+    """
+    Return the claims of a valid access token, decoding it at most once.
+
+    Raises:
+        JWTError: If the token is invalid or expired
+    """
+
+    digest = token_digest(token)
+    claims = token_cache.get(digest)
+
+    if claims is None:
+        claims = decode_token(token, expected_type="access")
+        token_cache.set(digest, claims, expires_at=float(claims["exp"]))
+
+    return claims
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop the cached snapshot of a user, e.g. after a bulk UPDATE."""
+    user_cache.pop(user_id)
+
+
+@event.listens_for(Users, "after_update")
+@event.listens_for(Users, "after_delete")
+def _invalidate_on_change(mapper: Any, connection: Any, target: Users) -> None:
+    invalidate_user(target.user_id)
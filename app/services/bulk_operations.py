@@ -0,0 +1,536 @@
+import asyncio
+import logging
+import uuid
+from collections.abc import Awaitable, Callable, Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import delete, func, insert, inspect, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.models import (
+    BulkOperations, DocumentCleanup, Documents, Folders, IndividualPermissions, ProcessingStatus,
+)
+from app.schemas.folder import BulkOperationKind
+from app.schemas.processing import ProcessingStage, ProcessingState
+from app.services.document_store import document_store
+from app.services.folder_tree import FolderCycleError, folder_tree, subtree_query
+from app.services.permissions import permission_engine
+from app.services.processing import processing_scheduler
+from app.services.search import search_index
+
+logger = logging.getLogger(__name__)
+
+# Called after each committed chunk of deleted documents with their
+# `(doc_id, mongo_doc_id)` pairs, to clean up stores outside SQL Server.
+DocumentsDeleted = Callable[[Sequence[tuple[int, str]]], Awaitable[None]]
+
+# Called after each committed chunk of copied documents with their new
+# `(doc_id, mongo_doc_id, azure_blob_path)`, to queue them for processing.
+DocumentsCopied = Callable[[Sequence[tuple[int, str, str]]], Awaitable[None]]
+
+# A folder chunk is retried when a document was added to it (a concurrent
+# upload) between deleting its documents and deleting the folders.
+FOLDER_DELETE_ATTEMPTS = 3
+
+
+def _chunks(items: Sequence[int], size: int) -> list[Sequence[int]]:
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+async def subtree_folder_ids(db: AsyncSession, folder_id: int) -> list[int]:
+    """Every folder id under (and including) `folder_id`, deepest first, in one query."""
+    tree = subtree_query(folder_id).subquery()
+    rows = await db.execute(select(tree.c.folder_id).order_by(tree.c.depth.desc()))
+    return list(rows.scalars())
+
+
+class BulkFolderOperations:
+    """
+    Moves, copies, deletes and permission resets for whole folder subtrees.
+
+    The subtree is read with one recursive CTE; the work is then done with
+    set-based statements over `chunk_size` ids at a time, each chunk in its
+    own short transaction so no lock is held for the whole operation.
+    Progress is recorded in a `Bulk_Operations` row (status, total,
+    processed) that is updated in the same transaction as each chunk, so a
+    failed or interrupted operation reports exactly what was done. Every
+    operation but copy is idempotent and can simply be submitted again; a
+    failed copy leaves a partial copy to delete first.
+
+    Statements bypass the ORM, so the in-memory folder tree and permission
+    index are updated (or marked for reload) once an operation finishes.
+
+    Deleted documents are also written to `Document_Cleanup` in the same
+    transaction as their SQL rows, and only removed from it once
+    `on_documents_deleted` (search index and Mongo cleanup) succeeded, so a
+    failed cleanup is retried by `retry_cleanup` rather than lost.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        chunk_size: int = 1000,
+        on_documents_deleted: DocumentsDeleted | None = None,
+        on_documents_copied: DocumentsCopied | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self.chunk_size = chunk_size
+        self._on_documents_deleted = on_documents_deleted
+        self._on_documents_copied = on_documents_copied
+        self._tasks: dict[int, asyncio.Task[None]] = {}
+
+    # Lifecycle
+
+    async def check_tables(self) -> bool:
+        """
+        Whether `Bulk_Operations` and `Document_Cleanup` exist. They are
+        created by `migrations/0001_bulk_operations.sql`; until then the
+        missing ones are logged and startup skips `fail_interrupted` and
+        `retry_cleanup`.
+        """
+        tables = [BulkOperations.__table__.name, DocumentCleanup.__table__.name]
+        async with self._session_factory() as db:
+            missing = await db.run_sync(
+                lambda session: [name for name in tables if not inspect(session.connection()).has_table(name)]
+            )
+        if missing:
+            logger.warning(
+                "Table(s) %s missing; apply migrations/0001_bulk_operations.sql. "
+                "Skipping recovery of bulk folder operations.", ", ".join(missing),
+            )
+        return not missing
+
+    async def fail_interrupted(self) -> int:
+        """
+        Mark operations left pending or running by a previous process as
+        failed. Returns how many there were.
+        """
+        async with self._session_factory() as db:
+            result = await db.execute(
+                update(BulkOperations)
+                .where(BulkOperations.status.in_([ProcessingState.PENDING, ProcessingState.RUNNING]))
+                .values(status=ProcessingState.FAILED, error_message="Interrupted by a restart", end_time=datetime.now())
+            )
+            await db.commit()
+        return result.rowcount
+
+    async def retry_cleanup(self) -> bool:
+        """
+        Run `on_documents_deleted` for documents whose cleanup failed or was
+        interrupted, `chunk_size` at a time. Stops at the first chunk that
+        fails again and returns False; its rows stay for the next retry.
+        """
+        if self._on_documents_deleted is None:
+            return True
+
+        after = None
+        while True:
+            async with self._session_factory() as db:
+                query = select(DocumentCleanup.doc_id, DocumentCleanup.mongo_doc_id).order_by(DocumentCleanup.doc_id)
+                if after is not None:
+                    query = query.where(DocumentCleanup.doc_id > after)
+                rows = [tuple(row) for row in (await db.execute(query.limit(self.chunk_size))).all()]
+            if not rows:
+                return True
+            if not await self._clean_up(rows):
+                return False
+            after = rows[-1][0]
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Wait up to `timeout` for running operations, then cancel the rest."""
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks.values(), timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    # Submission
+
+    async def submit(
+        self,
+        operation: BulkOperationKind,
+        folder_id: int,
+        requested_by: int,
+        target_folder_id: int | None = None,
+        **options: Any,
+    ) -> int:
+        """
+        Record a pending operation and start it in the background. Returns
+        its `operation_id`; `options` are passed to the operation (e.g.
+        `user_id`/`action_id` for permission resets).
+        """
+        async with self._session_factory() as db:
+            operation_id = (await db.execute(
+                insert(BulkOperations)
+                .values(
+                    operation=operation,
+                    folder_id=folder_id,
+                    target_folder_id=target_folder_id,
+                    requested_by_user_id=requested_by,
+                    status=ProcessingState.PENDING,
+                )
+                .returning(BulkOperations.operation_id)
+            )).scalar_one()
+            await db.commit()
+
+        task = asyncio.create_task(
+            self.run(operation_id, operation, folder_id, target_folder_id, **options),
+            name=f"bulk-operation-{operation_id}",
+        )
+        self._tasks[operation_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(operation_id, None))
+        return operation_id
+
+    async def wait(self, operation_id: int) -> None:
+        task = self._tasks.get(operation_id)
+        if task is not None:
+            await asyncio.shield(task)
+
+    async def run(
+        self,
+        operation_id: int,
+        operation: BulkOperationKind,
+        folder_id: int,
+        target_folder_id: int | None = None,
+        **options: Any,
+    ) -> None:
+        """Run a recorded operation to completion, recording the outcome."""
+        await self._set(operation_id, status=ProcessingState.RUNNING)
+        try:
+            if operation == BulkOperationKind.MOVE:
+                await self._move(operation_id, folder_id, target_folder_id)
+            elif operation == BulkOperationKind.COPY:
+                await self._copy(operation_id, folder_id, target_folder_id)
+            elif operation == BulkOperationKind.DELETE:
+                await self._delete(operation_id, folder_id)
+            else:
+                await self._reset_permissions(operation_id, folder_id, **options)
+        except Exception as exc:
+            logger.exception("Bulk operation %d (%s of folder %d) failed", operation_id, operation, folder_id)
+            await self._set(operation_id, status=ProcessingState.FAILED, error_message=str(exc), end_time=datetime.now())
+            return
+
+        await self._set(operation_id, status=ProcessingState.COMPLETED, end_time=datetime.now())
+
+    # Operations
+
+    async def _move(self, operation_id: int, folder_id: int, new_parent_id: int | None) -> None:
+        # The adjacency list makes a subtree move a single-row UPDATE; the
+        # CTE only guards against moving a folder under its own descendant.
+        async with self._session_factory() as db:
+            await self._progress(db, operation_id, total=1)
+            if new_parent_id is not None:
+                tree = subtree_query(folder_id).subquery()
+                inside = await db.scalar(
+                    select(func.count()).select_from(tree).where(tree.c.folder_id == new_parent_id)
+                )
+                if inside:
+                    raise FolderCycleError(f"Folder {folder_id} cannot be moved under its own descendant")
+
+            await db.execute(
+                update(Folders).where(Folders.folder_id == folder_id).values(parent_folder_id=new_parent_id)
+            )
+            await self._progress(db, operation_id, processed=1)
+            await db.commit()
+
+        if folder_tree.loaded:
+            try:
+                folder_tree.move_folder(folder_id, new_parent_id)
+            except (KeyError, FolderCycleError):
+                folder_tree.loaded = False
+
+    async def _copy(self, operation_id: int, folder_id: int, new_parent_id: int | None) -> None:
+        # Folders are inserted one depth at a time, so every parent already
+        # has its new id. Documents keep their content-addressed blob path
+        # and get a new Mongo id; their OCR output and search entry are
+        # produced by the processing pipeline, as for an upload. Permission
+        # overrides are not copied: the copy inherits from its new parent.
+        async with self._session_factory() as db:
+            requested_by = await db.scalar(
+                select(BulkOperations.requested_by_user_id).where(BulkOperations.operation_id == operation_id)
+            )
+            tree = subtree_query(folder_id).subquery()
+            folders = (await db.execute(
+                select(Folders.folder_id, Folders.parent_folder_id, Folders.folder_name, tree.c.depth)
+                .join(tree, tree.c.folder_id == Folders.folder_id)
+                .order_by(tree.c.depth, Folders.folder_id)
+            )).all()
+            if new_parent_id in {row.folder_id for row in folders}:
+                raise FolderCycleError(f"Folder {folder_id} cannot be copied under its own descendant")
+            documents = await db.scalar(
+                select(func.count()).select_from(Documents).join(tree, tree.c.folder_id == Documents.folder_id)
+            )
+            await self._progress(db, operation_id, total=len(folders) + documents)
+            await db.commit()
+
+        copies: dict[int, int] = {}
+        try:
+            for depth in sorted({row.depth for row in folders}):
+                level = [row for row in folders if row.depth == depth]
+                for start in range(0, len(level), self.chunk_size):
+                    chunk = level[start:start + self.chunk_size]
+                    await self._copy_folders(operation_id, chunk, copies, new_parent_id, requested_by)
+        finally:
+            if folder_tree.loaded:
+                for row in folders:
+                    if row.folder_id in copies:
+                        parent_id = copies[row.parent_folder_id] if row.depth else new_parent_id
+                        folder_tree.add_folder(copies[row.folder_id], parent_id)
+
+        for chunk in _chunks(list(copies), self.chunk_size):
+            after = 0
+            while after is not None:
+                after = await self._copy_documents(operation_id, chunk, copies, requested_by, after)
+
+    async def _copy_folders(
+        self,
+        operation_id: int,
+        folders: Sequence[Any],
+        copies: dict[int, int],
+        new_parent_id: int | None,
+        requested_by: int,
+    ) -> None:
+        """Insert copies of `folders` (all at one depth), recording `old id -> new id` in `copies`."""
+        async with self._session_factory() as db:
+            new_ids = (await db.scalars(
+                insert(Folders).returning(Folders.folder_id, sort_by_parameter_order=True),
+                [
+                    {
+                        "folder_name": row.folder_name,
+                        "created_by_user_id": requested_by,
+                        "parent_folder_id": copies[row.parent_folder_id] if row.depth else new_parent_id,
+                    }
+                    for row in folders
+                ],
+            )).all()
+            await self._progress(db, operation_id, processed=len(folders))
+            await db.commit()
+        copies.update(zip((row.folder_id for row in folders), new_ids))
+
+    async def _copy_documents(
+        self, operation_id: int, folder_ids: Sequence[int], copies: dict[int, int], requested_by: int, after: int,
+    ) -> int | None:
+        """
+        Copy up to `chunk_size` documents stored in `folder_ids` with a
+        `doc_id` above `after`, each with an upload status row. Returns the
+        last `doc_id` copied, or None when there were none left.
+        """
+        async with self._session_factory() as db:
+            rows = (await db.execute(
+                select(Documents.doc_id, Documents.filename, Documents.folder_id, Documents.azure_blob_path)
+                .where(Documents.folder_id.in_(folder_ids), Documents.doc_id > after)
+                .order_by(Documents.doc_id)
+                .limit(self.chunk_size)
+            )).all()
+            if not rows:
+                return None
+
+            values = [
+                {
+                    "filename": row.filename,
+                    "folder_id": copies[row.folder_id],
+                    "uploaded_by_user_id": requested_by,
+                    "azure_blob_path": row.azure_blob_path,
+                    "mongo_doc_id": str(uuid.uuid4()),
+                }
+                for row in rows
+            ]
+            doc_ids = (await db.scalars(
+                insert(Documents).returning(Documents.doc_id, sort_by_parameter_order=True), values,
+            )).all()
+            now = datetime.now()
+            await db.execute(insert(ProcessingStatus), [
+                {"doc_id": doc_id, "stage_name": ProcessingStage.UPLOAD, "status": ProcessingState.COMPLETED,
+                 "end_time": now}
+                for doc_id in doc_ids
+            ])
+            await self._progress(db, operation_id, processed=len(rows))
+            await db.commit()
+
+        if self._on_documents_copied is not None:
+            await self._on_documents_copied([
+                (doc_id, copy["mongo_doc_id"], copy["azure_blob_path"]) for doc_id, copy in zip(doc_ids, values)
+            ])
+        return rows[-1].doc_id
+
+    async def _delete(self, operation_id: int, folder_id: int) -> None:
+        # Hide the subtree right away, so requests stop listing it or
+        # uploading into it while it is being deleted.
+        if folder_tree.loaded:
+            folder_tree.remove_folder(folder_id)
+
+        async with self._session_factory() as db:
+            folder_ids = await subtree_folder_ids(db, folder_id)
+            tree = subtree_query(folder_id).subquery()
+            documents = await db.scalar(
+                select(func.count()).select_from(Documents).where(Documents.folder_id.in_(select(tree.c.folder_id)))
+            )
+            await self._progress(db, operation_id, total=len(folder_ids) + documents)
+            await db.commit()
+
+        cleanup_failed = False
+        try:
+            # Deepest folders first, so every chunk of folders only has
+            # children that are already gone.
+            for chunk in _chunks(folder_ids, self.chunk_size):
+                for attempt in range(1, FOLDER_DELETE_ATTEMPTS + 1):
+                    while (deleted := await self._delete_documents(operation_id, chunk, late=attempt > 1)) is not None:
+                        cleanup_failed |= not deleted
+                    try:
+                        await self._delete_folders(operation_id, chunk)
+                        break
+                    except IntegrityError:
+                        if attempt == FOLDER_DELETE_ATTEMPTS:
+                            raise
+        finally:
+            folder_tree.loaded = False
+            permission_engine.loaded = False
+
+        if cleanup_failed and not await self.retry_cleanup():
+            await self._set(operation_id, error_message="Search index and Mongo cleanup pending, retried at startup")
+
+    async def _delete_folders(self, operation_id: int, folder_ids: Sequence[int]) -> None:
+        async with self._session_factory() as db:
+            await db.execute(delete(IndividualPermissions).where(
+                IndividualPermissions.entity_type == "folder",
+                IndividualPermissions.entity_id.in_(folder_ids),
+            ))
+            await db.execute(delete(Folders).where(Folders.folder_id.in_(folder_ids)))
+            await self._progress(db, operation_id, processed=len(folder_ids))
+            await db.commit()
+
+    async def _delete_documents(
+        self, operation_id: int, folder_ids: Sequence[int], late: bool = False,
+    ) -> bool | None:
+        """
+        Delete up to `chunk_size` documents stored in `folder_ids`, with their
+        status and permission rows. Returns None when there were none left,
+        otherwise whether their cleanup outside SQL Server succeeded. `late`
+        documents were added after the operation counted its total.
+        """
+        async with self._session_factory() as db:
+            rows = [tuple(row) for row in (await db.execute(
+                select(Documents.doc_id, Documents.mongo_doc_id)
+                .where(Documents.folder_id.in_(folder_ids))
+                .limit(self.chunk_size)
+            )).all()]
+            if not rows:
+                return None
+
+            doc_ids = [doc_id for doc_id, _ in rows]
+            if self._on_documents_deleted is not None:
+                await db.execute(insert(DocumentCleanup), [
+                    {"doc_id": doc_id, "mongo_doc_id": mongo_doc_id} for doc_id, mongo_doc_id in rows
+                ])
+            await db.execute(delete(ProcessingStatus).where(ProcessingStatus.doc_id.in_(doc_ids)))
+            await db.execute(delete(IndividualPermissions).where(
+                IndividualPermissions.entity_type == "document",
+                IndividualPermissions.entity_id.in_(doc_ids),
+            ))
+            await db.execute(delete(Documents).where(Documents.doc_id.in_(doc_ids)))
+            await self._progress(db, operation_id, processed=len(doc_ids), added=len(doc_ids) if late else 0)
+            await db.commit()
+
+        return await self._clean_up(rows) if self._on_documents_deleted is not None else True
+
+    async def _clean_up(self, documents: Sequence[tuple[int, str]]) -> bool:
+        """Run `on_documents_deleted` and drop the documents' `Document_Cleanup` rows once it succeeded."""
+        try:
+            await self._on_documents_deleted(documents)  # type: ignore[misc]
+        except Exception:
+            logger.exception("Cleanup of %d deleted documents failed; will be retried", len(documents))
+            return False
+
+        async with self._session_factory() as db:
+            await db.execute(delete(DocumentCleanup).where(
+                DocumentCleanup.doc_id.in_([doc_id for doc_id, _ in documents])
+            ))
+            await db.commit()
+        return True
+
+    async def _reset_permissions(
+        self, operation_id: int, folder_id: int, user_id: int | None = None, action_id: int | None = None,
+    ) -> None:
+        """
+        Remove the individual overrides on every folder and document below
+        `folder_id` (optionally only one user's or one action's), so the
+        whole subtree inherits what is set on `folder_id` itself.
+        """
+        filters = []
+        if user_id is not None:
+            filters.append(IndividualPermissions.user_id == user_id)
+        if action_id is not None:
+            filters.append(IndividualPermissions.action_id == action_id)
+
+        async with self._session_factory() as db:
+            folder_ids = await subtree_folder_ids(db, folder_id)
+            await self._progress(db, operation_id, total=len(folder_ids))
+            await db.commit()
+
+        try:
+            for chunk in _chunks(folder_ids, self.chunk_size):
+                async with self._session_factory() as db:
+                    await db.execute(delete(IndividualPermissions).where(
+                        IndividualPermissions.entity_type == "folder",
+                        IndividualPermissions.entity_id.in_([fid for fid in chunk if fid != folder_id]),
+                        *filters,
+                    ))
+                    await db.execute(delete(IndividualPermissions).where(
+                        IndividualPermissions.entity_type == "document",
+                        IndividualPermissions.entity_id.in_(
+                            select(Documents.doc_id).where(Documents.folder_id.in_(chunk))
+                        ),
+                        *filters,
+                    ))
+                    await self._progress(db, operation_id, processed=len(chunk))
+                    await db.commit()
+        finally:
+            permission_engine.loaded = False
+
+    # Bookkeeping
+
+    @staticmethod
+    async def _progress(
+        db: AsyncSession, operation_id: int, processed: int = 0, total: int | None = None, added: int = 0,
+    ) -> None:
+        values: dict[str, Any] = {"processed": BulkOperations.processed + processed}
+        if total is not None:
+            values["total"] = total
+        elif added:
+            values["total"] = BulkOperations.total + added
+        await db.execute(
+            update(BulkOperations).where(BulkOperations.operation_id == operation_id).values(**values)
+        )
+
+    async def _set(self, operation_id: int, **values: Any) -> None:
+        async with self._session_factory() as db:
+            await db.execute(
+                update(BulkOperations).where(BulkOperations.operation_id == operation_id).values(**values)
+            )
+            await db.commit()
+
+
+async def remove_deleted_documents(documents: Sequence[tuple[int, str]]) -> None:
+    """Drop deleted documents from the search index and their OCR output from Mongo."""
+    await search_index.remove([doc_id for doc_id, _ in documents])
+    await document_store.delete_many(mongo_doc_id for _, mongo_doc_id in documents)
+
+
+async def queue_copied_documents(documents: Sequence[tuple[int, str, str]]) -> None:
+    """Send copied documents through OCR and indexing, like fresh uploads."""
+    # When the scheduler is not running, recovery picks the documents up later.
+    if processing_scheduler.running:
+        for doc_id, mongo_doc_id, blob_path in documents:
+            processing_scheduler.submit(doc_id, mongo_doc_id, blob_path)
+
+
+bulk_folder_operations = BulkFolderOperations(
+    AsyncSessionLocal,
+    chunk_size=settings.BULK_OPERATION_CHUNK_SIZE,
+    on_documents_deleted=remove_deleted_documents,
+    on_documents_copied=queue_copied_documents,
+)
@@ -0,0 +1,102 @@
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from datetime import datetime, timezone
+from typing import Any, Protocol
+
+from pymongo import UpdateOne
+
+from app.db.mongo import get_documents_collection
+from app.services.ocr_client import OCRResult
+
+# OCR text can be megabytes per document; listings only need the metadata.
+SUMMARY_PROJECTION = {"text": 0}
+
+# Keep each bulk_write comfortably below Mongo's 100k operation batch limit.
+BULK_BATCH_SIZE = 1000
+
+
+class HasMongoDocId(Protocol):
+    doc_id: int
+    mongo_doc_id: str
+
+
+class DocumentStore:
+    """
+    Repository for the OCR/metadata documents kept in Mongo.
+
+    Documents are keyed by `Documents.mongo_doc_id` (`_id`) and also carry
+    the SQL `doc_id`. Reads for many SQL rows are served by one `$in` query,
+    and writes from the processing pipeline are grouped into unordered bulk
+    upserts.
+    """
+
+    def __init__(self, collection_factory: Callable[[], Any] = get_documents_collection) -> None:
+        self._collection_factory = collection_factory
+
+    @property
+    def collection(self) -> Any:
+        return self._collection_factory()
+
+    async def fetch_many(self, mongo_doc_ids: Iterable[str], include_text: bool = False) -> dict[str, dict[str, Any]]:
+        """Fetch documents by `_id` in a single query, keyed by `_id`."""
+        ids = list(dict.fromkeys(mongo_doc_ids))
+        if not ids:
+            return {}
+
+        cursor = self.collection.find(
+            {"_id": {"$in": ids}},
+            projection=None if include_text else SUMMARY_PROJECTION,
+        )
+        return {document["_id"]: document async for document in cursor}
+
+    async def fetch_for_documents(
+        self, rows: Iterable[HasMongoDocId], include_text: bool = False
+    ) -> dict[int, dict[str, Any]]:
+        """Fetch the Mongo documents of SQL `Documents` rows, keyed by `doc_id`."""
+        rows = list(rows)
+        found = await self.fetch_many((row.mongo_doc_id for row in rows), include_text=include_text)
+        return {row.doc_id: found[row.mongo_doc_id] for row in rows if row.mongo_doc_id in found}
+
+    async def bulk_upsert(self, records: Sequence[Mapping[str, Any]]) -> int:
+        """
+        Upsert records that each carry an `_id`; other fields are `$set`.
+        Returns the number of inserted or modified documents.
+        """
+        changed = 0
+        for start in range(0, len(records), BULK_BATCH_SIZE):
+            operations = [
+                UpdateOne(
+                    {"_id": record["_id"]},
+                    {"$set": {field: value for field, value in record.items() if field != "_id"}},
+                    upsert=True,
+                )
+                for record in records[start:start + BULK_BATCH_SIZE]
+            ]
+            result = await self.collection.bulk_write(operations, ordered=False)
+            changed += result.upserted_count + result.modified_count
+        return changed
+
+    async def save_ocr_results(self, results: Sequence[tuple[HasMongoDocId, OCRResult]]) -> int:
+        """Store `(document, OCRResult)` pairs from the OCR stage."""
+        now = datetime.now(timezone.utc)
+        return await self.bulk_upsert([
+            {
+                "_id": document.mongo_doc_id,
+                "doc_id": document.doc_id,
+                "text": result.text,
+                "pages": result.pages,
+                "ocr_completed_at": now,
+            }
+            for document, result in results
+        ])
+
+    async def delete_many(self, mongo_doc_ids: Iterable[str]) -> int:
+        """Delete documents by `_id` in one round trip. Returns how many existed."""
+        ids = list(dict.fromkeys(mongo_doc_ids))
+        if not ids:
+            return 0
+
+        result = await self.collection.delete_many({"_id": {"$in": ids}})
+        return result.deleted_count
+
+
+document_store = DocumentStore()
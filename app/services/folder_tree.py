@@ -0,0 +1,204 @@
+import asyncio
+from typing import Any
+
+from sqlalchemy import Select, event, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from app.models.models import Documents, Folders
+
+
+def subtree_query(folder_id: int) -> Select[Any]:
+    """
+    Recursive CTE selecting `folder_id` and `depth` for a folder and all of
+    its descendants, so subtree work stays a single statement on the server.
+    """
+    tree = (
+        select(Folders.folder_id, literal(0).label("depth"))
+        .where(Folders.folder_id == folder_id)
+        .cte("subtree", recursive=True)
+    )
+    tree = tree.union_all(
+        select(Folders.folder_id, (tree.c.depth + 1).label("depth"))
+        .where(Folders.parent_folder_id == tree.c.folder_id)
+    )
+    return select(tree.c.folder_id, tree.c.depth)
+
+
+class FolderCycleError(ValueError):
+    """Raised when a folder would be moved under one of its own descendants."""
+
+
+class FolderTree:
+    """
+    In-memory copy of the Folders hierarchy with cached materialized paths.
+
+    The adjacency list is loaded with one SELECT; ancestors and descendants
+    are then answered without touching the database. Paths are cached per
+    folder and dropped for a whole subtree when it moves.
+    """
+
+    def __init__(self) -> None:
+        self._lock = asyncio.Lock()
+        self.loaded = False
+        self._parents: dict[int, int | None] = {}
+        self._children: dict[int | None, set[int]] = {}
+        self._paths: dict[int, tuple[int, ...]] = {}
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        if not self.loaded:
+            async with self._lock:
+                if not self.loaded:
+                    await self.load(db)
+
+    async def load(self, db: AsyncSession) -> None:
+        rows = (await db.execute(select(Folders.folder_id, Folders.parent_folder_id))).all()
+
+        self._parents = {}
+        self._children = {}
+        self._paths = {}
+        for folder_id, parent_id in rows:
+            self._parents[folder_id] = parent_id
+            self._children.setdefault(parent_id, set()).add(folder_id)
+
+        self.loaded = True
+
+    def __contains__(self, folder_id: object) -> bool:
+        return folder_id in self._parents
+
+    def path(self, folder_id: int) -> tuple[int, ...]:
+        """Folder ids from the root down to `folder_id` (breadcrumbs)."""
+        cached = self._paths.get(folder_id)
+        if cached is not None:
+            return cached
+
+        # Walk up to the nearest cached ancestor, then fill in paths downwards.
+        chain = []
+        current: int | None = folder_id
+        while current is not None and current not in self._paths:
+            chain.append(current)
+            current = self._parents[current]
+
+        path = self._paths[current] if current is not None else ()
+        for node in reversed(chain):
+            path = path + (node,)
+            self._paths[node] = path
+        return path
+
+    def ancestors(self, folder_id: int) -> list[int]:
+        """Ancestor folder ids, nearest first."""
+        return list(reversed(self.path(folder_id)[:-1]))
+
+    def descendants(self, folder_id: int, include_self: bool = False) -> list[int]:
+        """All folder ids below `folder_id`, parents before children."""
+        result = [folder_id] if include_self else []
+        stack = [folder_id]
+        while stack:
+            children = self._children.get(stack.pop(), ())
+            result.extend(children)
+            stack.extend(children)
+        return result
+
+    def lineage(self, folder_id: int) -> list[tuple[str, int]]:
+        """
+        `(entity_type, entity_id)` pairs a permission can be inherited from for
+        anything stored in `folder_id`, nearest first.
+        """
+        return [("folder", ancestor) for ancestor in reversed(self.path(folder_id))]
+
+    def add_folder(self, folder_id: int, parent_id: int | None) -> None:
+        if folder_id in self._parents:
+            self.move_folder(folder_id, parent_id)
+            return
+
+        self._parents[folder_id] = parent_id
+        self._children.setdefault(parent_id, set()).add(folder_id)
+
+    def move_folder(self, folder_id: int, new_parent_id: int | None) -> None:
+        old_parent_id = self._parents[folder_id]
+        if old_parent_id == new_parent_id:
+            return
+
+        if new_parent_id is not None and folder_id in self.path(new_parent_id):
+            raise FolderCycleError(f"Folder {folder_id} cannot be moved under its own descendant")
+
+        self._children[old_parent_id].discard(folder_id)
+        self._parents[folder_id] = new_parent_id
+        self._children.setdefault(new_parent_id, set()).add(folder_id)
+
+        for moved in self.descendants(folder_id, include_self=True):
+            self._paths.pop(moved, None)
+
+    def remove_folder(self, folder_id: int) -> None:
+        if folder_id not in self._parents:
+            return
+
+        subtree = self.descendants(folder_id, include_self=True)
+        self._children.get(self._parents[folder_id], set()).discard(folder_id)
+        for removed in subtree:
+            self._parents.pop(removed, None)
+            self._children.pop(removed, None)
+            self._paths.pop(removed, None)
+
+    async def subtree_document_count(self, db: AsyncSession, folder_id: int) -> int:
+        """Number of documents anywhere under `folder_id`, in one query."""
+        subtree = subtree_query(folder_id).subquery()
+        query = select(func.count()).select_from(Documents).where(
+            Documents.folder_id.in_(select(subtree.c.folder_id))
+        )
+        return (await db.execute(query)).scalar_one()
+
+
+folder_tree = FolderTree()
+
+
+async def get_folder_tree(db: AsyncSession) -> FolderTree:
+    await folder_tree.ensure_loaded(db)
+    return folder_tree
+
+
+# Folder writes made through the ORM are applied to the cached tree once the
+# transaction commits, mirroring the permission index.
+
+_CHANGES_KEY = "folder_tree_changes"
+
+
+def _record(target: Folders, op: str) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_CHANGES_KEY, []).append(
+            (op, target.folder_id, target.parent_folder_id)
+        )
+
+
+@event.listens_for(Folders, "after_insert")
+@event.listens_for(Folders, "after_update")
+def _after_write(mapper: Any, connection: Any, target: Folders) -> None:
+    _record(target, "set")
+
+
+@event.listens_for(Folders, "after_delete")
+def _after_delete(mapper: Any, connection: Any, target: Folders) -> None:
+    _record(target, "delete")
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session: Session) -> None:
+    changes = session.info.pop(_CHANGES_KEY, None)
+    if not changes or not folder_tree.loaded:
+        return
+
+    try:
+        for op, folder_id, parent_id in changes:
+            if op == "set":
+                folder_tree.add_folder(folder_id, parent_id)
+            else:
+                folder_tree.remove_folder(folder_id)
+    except (KeyError, FolderCycleError):
+        # The cache disagrees with what was committed; rebuild on next use.
+        folder_tree.loaded = False
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changes(session: Session, previous_transaction: Any) -> None:
+    session.info.pop(_CHANGES_KEY, None)
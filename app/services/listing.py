@@ -0,0 +1,187 @@
+import base64
+import binascii
+import json
+from collections.abc import AsyncIterator, Callable, Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import ColumnElement, Select, and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.responses import dumps
+from app.models.models import Documents, Folders
+from app.services.permissions import PermissionEngine
+
+# Columns served by the listing endpoints; wide columns such as blob paths and
+# Mongo ids are never loaded.
+DOCUMENT_COLUMNS = (
+    Documents.doc_id,
+    Documents.filename,
+    Documents.folder_id,
+    Documents.uploaded_by_user_id,
+    Documents.uploaded_at,
+)
+
+FOLDER_COLUMNS = (
+    Folders.folder_id,
+    Folders.folder_name,
+    Folders.parent_folder_id,
+    Folders.created_by_user_id,
+    Folders.created_at,
+)
+
+# Rows pulled from the cursor per round trip when streaming.
+STREAM_PARTITION_SIZE = 500
+
+# Queries one page may issue to replace rows dropped by permission filtering.
+MAX_PAGE_BATCHES = 5
+
+SortKey = tuple[datetime, int]
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(key: SortKey) -> str:
+    """Opaque, URL-safe cursor for the `(timestamp, id)` sort key of a row."""
+    timestamp, row_id = key
+    raw = json.dumps([timestamp.isoformat(), row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> SortKey:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, row_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+
+
+def seek_after(timestamp_column: Any, id_column: Any, key: SortKey) -> ColumnElement[bool]:
+    """
+    Rows strictly after `key` in `(timestamp, id)` descending order.
+
+    SQL Server has no row-value comparison, so this is spelled out; the
+    redundant leading `timestamp <= key` bound lets the optimizer turn it
+    into a range seek on the `(…, timestamp, id)` index instead of a scan.
+    """
+    timestamp, row_id = key
+    return and_(
+        timestamp_column <= timestamp,
+        or_(timestamp_column < timestamp, id_column < row_id),
+    )
+
+
+def document_list_query(folder_id: int, after: SortKey | None = None, limit: int | None = None) -> Select:
+    """Documents of a folder, newest first, keyset-paginated on `(uploaded_at, doc_id)`."""
+    query = (
+        select(*DOCUMENT_COLUMNS)
+        .where(Documents.folder_id == folder_id)
+        .order_by(Documents.uploaded_at.desc(), Documents.doc_id.desc())
+    )
+    if after is not None:
+        query = query.where(seek_after(Documents.uploaded_at, Documents.doc_id, after))
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+def folder_list_query(parent_id: int | None, after: SortKey | None = None, limit: int | None = None) -> Select:
+    """Child folders of `parent_id` (roots for None), newest first, keyset-paginated on `(created_at, folder_id)`."""
+    parent_filter = Folders.parent_folder_id.is_(None) if parent_id is None else Folders.parent_folder_id == parent_id
+    query = (
+        select(*FOLDER_COLUMNS)
+        .where(parent_filter)
+        .order_by(Folders.created_at.desc(), Folders.folder_id.desc())
+    )
+    if after is not None:
+        query = query.where(seek_after(Folders.created_at, Folders.folder_id, after))
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+async def fetch_page(
+    db: AsyncSession,
+    build_query: Callable[[SortKey | None, int], Select],
+    after: SortKey | None,
+    limit: int,
+    keep: Callable[[Sequence[Any]], Sequence[Any]] = lambda rows: rows,
+    max_batches: int = MAX_PAGE_BATCHES,
+) -> tuple[list[Any], str | None]:
+    """
+    Read one page of rows and the cursor for the next one.
+
+    `build_query(after, limit)` returns the keyset query, whose rows start
+    with the id and end with the timestamp (see `DOCUMENT_COLUMNS`), and
+    `keep` drops rows the caller may not see. Filtered-out rows are replaced
+    by reading further, at most `max_batches` queries per page; past that
+    the page is returned short (possibly empty) with a cursor, so a caller
+    who can see little of a large listing cannot make one request scan it
+    all. The cursor points at the last row scanned.
+    """
+    rows: list[Any] = []
+    for _ in range(max_batches):
+        wanted = limit - len(rows)
+        # One extra row tells whether anything follows.
+        batch = (await db.execute(build_query(after, wanted + 1))).all()
+        scanned = batch[:wanted]
+        if scanned:
+            after = (scanned[-1][-1], scanned[-1][0])
+            rows.extend(keep(scanned))
+
+        if len(batch) <= wanted:
+            return rows, None
+        if len(rows) == limit:
+            return rows, encode_cursor(after)  # type: ignore[arg-type]
+
+    return rows, encode_cursor(after)  # type: ignore[arg-type]
+
+
+def row_dicts(rows: Sequence[Any]) -> list[dict[str, Any]]:
+    """
+    Result rows as plain dicts keyed by column name, ready to be encoded
+    without going through a response model.
+    """
+    if not rows:
+        return []
+    # Much cheaper than Row._asdict(), which rebuilds the key list per row.
+    keys = rows[0]._fields
+    return [dict(zip(keys, row)) for row in rows]
+
+
+async def stream_ndjson(
+    db: AsyncSession,
+    query: Select,
+    keep: Callable[[Sequence[Any]], Sequence[Any]] = lambda rows: rows,
+) -> AsyncIterator[bytes]:
+    """
+    Serialize `query` as NDJSON while rows come off a server-side cursor,
+    so memory use is bounded by one partition regardless of result size.
+    Rows are encoded as-is, keyed by column name, without a model in between.
+    """
+    result = await db.stream(query.execution_options(yield_per=STREAM_PARTITION_SIZE))
+    async for partition in result.partitions():
+        lines = [dumps(row) for row in row_dicts(keep(partition))]
+        if lines:
+            yield b"\n".join(lines) + b"\n"
+
+
+def permitted_rows(
+    permissions: PermissionEngine,
+    user_id: int,
+    role_id: int,
+    action: str,
+    entity_type: str,
+    ancestors: Sequence[tuple[str, int]] = (),
+) -> Callable[[Sequence[Any]], list[Any]]:
+    """`keep` filter retaining rows (id first) the user may perform `action` on."""
+    def keep(rows: Sequence[Any]) -> list[Any]:
+        allowed = set(permissions.filter_allowed(
+            user_id, role_id, action, entity_type, (row[0] for row in rows), ancestors,
+        ))
+        return [row for row in rows if row[0] in allowed]
+
+    return keep
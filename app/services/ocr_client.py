@@ -0,0 +1,79 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class OCRRequest:
+    doc_id: int
+    blob_path: str
+
+
+@dataclass(frozen=True)
+class OCRResult:
+    doc_id: int
+    text: str
+    pages: int = 1
+    error: str | None = None
+
+
+class OCRClient(ABC):
+    """
+    Pluggable OCR backend.
+
+    Requests are always sent in batches; a result with `error` set marks a
+    single failed document without failing the rest of the batch.
+    """
+
+    @abstractmethod
+    async def extract_batch(self, requests: Sequence[OCRRequest]) -> list[OCRResult]: ...
+
+    async def close(self) -> None:
+        return None
+
+
+class FakeOCRClient(OCRClient):
+    """
+    Local stand-in that "recognises" a deterministic text per document.
+
+    Args:
+        batch_latency: Simulated round trip per batch, in seconds
+        per_document_latency: Simulated extra time per document, in seconds
+        fail_doc_ids: Documents that always come back with an error
+    """
+
+    def __init__(
+        self,
+        batch_latency: float = 0.0,
+        per_document_latency: float = 0.0,
+        fail_doc_ids: Sequence[int] = (),
+    ) -> None:
+        self.batch_latency = batch_latency
+        self.per_document_latency = per_document_latency
+        self.fail_doc_ids = set(fail_doc_ids)
+        self.batches: list[int] = []
+
+    async def extract_batch(self, requests: Sequence[OCRRequest]) -> list[OCRResult]:
+        self.batches.append(len(requests))
+
+        delay = self.batch_latency + self.per_document_latency * len(requests)
+        if delay:
+            await asyncio.sleep(delay)
+
+        return [
+            OCRResult(doc_id=request.doc_id, text="", error="OCR failed")
+            if request.doc_id in self.fail_doc_ids
+            else OCRResult(doc_id=request.doc_id, text=f"Extracted text of {request.blob_path}")
+            for request in requests
+        ]
+
+
+def create_ocr_client() -> OCRClient:
+    """Build the OCR client selected by `settings.OCR_CLIENT`."""
+    if settings.OCR_CLIENT == "fake":
+        return FakeOCRClient()
+
+    raise ValueError(f"Unknown OCR client: {settings.OCR_CLIENT}")
@@ -0,0 +1,90 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Literal
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many hashing jobs are already pending."""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt off the event loop on a bounded worker pool.
+
+    At most `max_workers` jobs run at once; up to `max_pending` jobs (running
+    plus waiting) are admitted, anything beyond that fails fast with
+    `PasswordHasherBusy` so callers can shed load instead of queueing forever.
+    """
+
+    def __init__(
+        self,
+        executor_kind: Literal["thread", "process"] = "thread",
+        max_workers: int = 4,
+        max_pending: int = 64,
+    ) -> None:
+        self._executor_kind = executor_kind
+        self._max_workers = max_workers
+        self._max_pending = max(max_pending, max_workers)
+        self._executor: Executor | None = None
+        self._slots = asyncio.Semaphore(max_workers)
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of admitted jobs, running or waiting for a worker."""
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self._executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._pending >= self._max_pending:
+            raise PasswordHasherBusy()
+
+        self._pending += 1
+        started = time.perf_counter()
+        try:
+            async with self._slots:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self._pending -= 1
+            # Includes waiting for a worker: that is time the request spends on hashing.
+            metrics.observe_phase("hashing", time.perf_counter() - started)
+
+    # bcrypt/jose are imported on first use to keep this module cheap to import.
+
+    async def hash(self, password: str) -> str:
+        """Hash a password using bcrypt on the worker pool."""
+        from app.core.security import hash_password
+
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a plain password against a hash on the worker pool."""
+        from app.core.security import verify_password
+
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    executor_kind=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -0,0 +1,383 @@
+import asyncio
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from app.models.models import Actions, IndividualPermissions, RoleActions
+
+
+class OverrideRow(NamedTuple):
+    user_id: int
+    entity_type: str
+    entity_id: int
+    action_id: int
+    is_allowed: bool
+    is_inherited: bool
+
+
+OverrideKey = tuple[int, str, int]
+
+
+def _entity_type(value: str) -> str:
+    return value.strip().lower()
+
+
+class PermissionEngine:
+    """
+    In-memory RBAC index built from Roles/Role_Actions/Individual_Permissions.
+
+    Every action gets a bit position; a role's grants are a single int bitmask
+    and every (user_id, entity_type, entity_id) override is a pair of
+    (allow, deny) masks, so `authorize` is a couple of dict lookups and a
+    bitwise AND. A deny override beats an allow override, and any override
+    beats the role grant.
+    """
+
+    def __init__(self) -> None:
+        self._lock = asyncio.Lock()
+        self.loaded = False
+        self._reset()
+
+    def _reset(self) -> None:
+        self._action_bits: dict[int, int] = {}
+        self._action_ids: dict[str, int] = {}
+        self._next_bit = 0
+
+        self._role_actions: dict[int, tuple[int, int]] = {}
+        self._role_masks: dict[int, int] = {}
+
+        self._override_rows: dict[int, OverrideRow] = {}
+        self._rows_by_key: dict[OverrideKey, set[int]] = {}
+        self._overrides: dict[OverrideKey, tuple[int, int]] = {}
+        self._user_entity_types: dict[int, dict[str, int]] = {}
+
+    # Loading
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        if not self.loaded:
+            async with self._lock:
+                if not self.loaded:
+                    await self.load(db)
+
+    async def load(self, db: AsyncSession) -> None:
+        """Rebuild the whole index with three flat SELECTs."""
+        actions = (await db.execute(select(Actions.action_id, Actions.action_name))).all()
+        role_actions = (await db.execute(
+            select(RoleActions.role_action_id, RoleActions.role_id, RoleActions.action_id)
+        )).all()
+        overrides = (await db.execute(self._override_query())).all()
+
+        self._reset()
+        for action_id, action_name in actions:
+            self.add_action(action_id, action_name)
+        for role_action_id, role_id, action_id in role_actions:
+            self.set_role_action(role_action_id, role_id, action_id)
+        for permission_id, *fields in overrides:
+            self.set_override(permission_id, OverrideRow(*fields))
+
+        self.loaded = True
+
+    async def refresh_role(self, db: AsyncSession, role_id: int) -> None:
+        """Reload the grants of one role, e.g. after a bulk statement."""
+        rows = (await db.execute(
+            select(RoleActions.role_action_id, RoleActions.action_id)
+            .where(RoleActions.role_id == role_id)
+        )).all()
+
+        for role_action_id, (owner, _) in list(self._role_actions.items()):
+            if owner == role_id:
+                del self._role_actions[role_action_id]
+        self._role_masks.pop(role_id, None)
+
+        for role_action_id, action_id in rows:
+            self.set_role_action(role_action_id, role_id, action_id)
+
+    async def refresh_user(self, db: AsyncSession, user_id: int) -> None:
+        """Reload the individual overrides of one user."""
+        rows = (await db.execute(
+            self._override_query().where(IndividualPermissions.user_id == user_id)
+        )).all()
+
+        for permission_id, row in list(self._override_rows.items()):
+            if row.user_id == user_id:
+                self.remove_override(permission_id)
+
+        for permission_id, *fields in rows:
+            self.set_override(permission_id, OverrideRow(*fields))
+
+    @staticmethod
+    def _override_query() -> Any:
+        return select(
+            IndividualPermissions.permission_id,
+            IndividualPermissions.user_id,
+            IndividualPermissions.entity_type,
+            IndividualPermissions.entity_id,
+            IndividualPermissions.action_id,
+            IndividualPermissions.is_allowed,
+            IndividualPermissions.is_inherited,
+        )
+
+    # Incremental updates
+
+    def add_action(self, action_id: int, action_name: str) -> None:
+        if action_id not in self._action_bits:
+            self._action_bits[action_id] = 1 << self._next_bit
+            self._next_bit += 1
+        # A rename must not leave the old name resolving to this action.
+        self._forget_action_names(action_id)
+        self._action_ids[action_name] = action_id
+
+    def remove_action(self, action_id: int) -> None:
+        if self._action_bits.pop(action_id, None) is None:
+            return
+        self._forget_action_names(action_id)
+
+        # Clear the freed bit from every mask that was built with it.
+        for role_id in {owner for owner, known_id in self._role_actions.values() if known_id == action_id}:
+            self._rebuild_role(role_id)
+        for key in {
+            (row.user_id, row.entity_type, row.entity_id)
+            for row in self._override_rows.values() if row.action_id == action_id
+        }:
+            self._rebuild_override(key)
+
+    def _forget_action_names(self, action_id: int) -> None:
+        for name, known_id in list(self._action_ids.items()):
+            if known_id == action_id:
+                del self._action_ids[name]
+
+    def set_role_action(self, role_action_id: int, role_id: int, action_id: int) -> None:
+        previous = self._role_actions.get(role_action_id)
+        self._role_actions[role_action_id] = (role_id, action_id)
+        if previous is not None and previous[0] != role_id:
+            self._rebuild_role(previous[0])
+        self._rebuild_role(role_id)
+
+    def remove_role_action(self, role_action_id: int) -> None:
+        previous = self._role_actions.pop(role_action_id, None)
+        if previous is not None:
+            self._rebuild_role(previous[0])
+
+    def _rebuild_role(self, role_id: int) -> None:
+        mask = 0
+        for owner, action_id in self._role_actions.values():
+            if owner == role_id:
+                mask |= self._action_bits.get(action_id, 0)
+        self._role_masks[role_id] = mask
+
+    def set_override(self, permission_id: int, row: OverrideRow) -> None:
+        row = row._replace(entity_type=_entity_type(row.entity_type))
+        self.remove_override(permission_id)
+        self._override_rows[permission_id] = row
+
+        key = (row.user_id, row.entity_type, row.entity_id)
+        self._rows_by_key.setdefault(key, set()).add(permission_id)
+        types = self._user_entity_types.setdefault(row.user_id, {})
+        types[row.entity_type] = types.get(row.entity_type, 0) + 1
+        self._rebuild_override(key)
+
+    def remove_override(self, permission_id: int) -> None:
+        row = self._override_rows.pop(permission_id, None)
+        if row is None:
+            return
+
+        key = (row.user_id, row.entity_type, row.entity_id)
+        ids = self._rows_by_key.get(key)
+        if ids is not None:
+            ids.discard(permission_id)
+            if not ids:
+                del self._rows_by_key[key]
+
+        types = self._user_entity_types[row.user_id]
+        types[row.entity_type] -= 1
+        if not types[row.entity_type]:
+            del types[row.entity_type]
+            if not types:
+                del self._user_entity_types[row.user_id]
+        self._rebuild_override(key)
+
+    def _rebuild_override(self, key: OverrideKey) -> None:
+        allow = deny = 0
+        for permission_id in self._rows_by_key.get(key, ()):
+            row = self._override_rows[permission_id]
+            bit = self._action_bits.get(row.action_id, 0)
+            if row.is_allowed:
+                allow |= bit
+            else:
+                deny |= bit
+
+        if allow or deny:
+            self._overrides[key] = (allow, deny)
+        else:
+            self._overrides.pop(key, None)
+
+    # Checks
+
+    def action_bit(self, action: int | str) -> int:
+        action_id = self._action_ids.get(action) if isinstance(action, str) else action
+        return self._action_bits.get(action_id, 0) if action_id is not None else 0
+
+    def _resolve(self, user_id: int, bit: int, entities: Iterable[tuple[str, int]]) -> bool | None:
+        """First override touching `bit` along `entities`, nearest first."""
+        for entity_type, entity_id in entities:
+            override = self._overrides.get((user_id, _entity_type(entity_type), entity_id))
+            if override is not None:
+                allow, deny = override
+                if deny & bit:
+                    return False
+                if allow & bit:
+                    return True
+        return None
+
+    def authorize(
+        self,
+        user_id: int,
+        role_id: int,
+        action: int | str,
+        entity_type: str | None = None,
+        entity_id: int | None = None,
+        ancestors: Iterable[tuple[str, int]] = (),
+    ) -> bool:
+        """
+        Whether the user may perform `action`, optionally on one entity.
+
+        `ancestors` lists `(entity_type, entity_id)` pairs the entity inherits
+        from, nearest first (see `FolderTree.lineage`); the closest override
+        wins before falling back to the role grant.
+        """
+        bit = self.action_bit(action)
+        if not bit:
+            return False
+
+        if user_id in self._user_entity_types:
+            entities: Iterable[tuple[str, int]] = ancestors
+            if entity_type is not None and entity_id is not None:
+                entities = [(entity_type, entity_id), *ancestors]
+
+            decision = self._resolve(user_id, bit, entities)
+            if decision is not None:
+                return decision
+
+        return bool(self._role_masks.get(role_id, 0) & bit)
+
+    def filter_allowed(
+        self,
+        user_id: int,
+        role_id: int,
+        action: int | str,
+        entity_type: str,
+        entity_ids: Iterable[int],
+        ancestors: Iterable[tuple[str, int]] = (),
+    ) -> list[int]:
+        """
+        Keep the entity ids the user may perform `action` on, preserving order.
+
+        `ancestors` is shared by every entity, e.g. the lineage of the folder
+        a page of documents was listed from.
+        """
+        entity_ids = list(entity_ids)
+        bit = self.action_bit(action)
+        if not bit:
+            return []
+
+        entity_type = _entity_type(entity_type)
+        default = bool(self._role_masks.get(role_id, 0) & bit)
+
+        user_types = self._user_entity_types.get(user_id)
+        if user_types is None:
+            return entity_ids if default else []
+
+        inherited = self._resolve(user_id, bit, ancestors)
+        if inherited is not None:
+            default = inherited
+
+        if entity_type not in user_types:
+            return entity_ids if default else []
+
+        allowed = []
+        for entity_id in entity_ids:
+            override = self._overrides.get((user_id, entity_type, entity_id))
+            if override is not None and (override[0] | override[1]) & bit:
+                if not override[1] & bit:
+                    allowed.append(entity_id)
+            elif default:
+                allowed.append(entity_id)
+        return allowed
+
+
+permission_engine = PermissionEngine()
+
+
+async def get_permission_engine(db: AsyncSession) -> PermissionEngine:
+    await permission_engine.ensure_loaded(db)
+    return permission_engine
+
+
+# Keep the index in sync with ORM writes. Changes are collected on the session
+# during flush and applied only once the transaction commits.
+
+_CHANGES_KEY = "permission_changes"
+
+
+def _record(target: Any, op: str) -> None:
+    session = object_session(target)
+    if session is None:
+        return
+
+    if isinstance(target, Actions):
+        change = (op, "action", target.action_id, (target.action_id, target.action_name))
+    elif isinstance(target, RoleActions):
+        change = (op, "role_action", target.role_action_id, (target.role_id, target.action_id))
+    else:
+        # is_inherited has a server default and may not be loaded yet; reading
+        # it through the attribute would emit a SELECT in the middle of flush.
+        change = (op, "override", target.permission_id, OverrideRow(
+            target.user_id, target.entity_type, target.entity_id, target.action_id,
+            target.is_allowed, bool(target.__dict__.get("is_inherited")),
+        ))
+    session.info.setdefault(_CHANGES_KEY, []).append(change)
+
+
+def _after_write(mapper: Any, connection: Any, target: Any) -> None:
+    _record(target, "set")
+
+
+def _after_delete(mapper: Any, connection: Any, target: Any) -> None:
+    _record(target, "delete")
+
+
+for _model in (Actions, RoleActions, IndividualPermissions):
+    event.listen(_model, "after_insert", _after_write)
+    event.listen(_model, "after_update", _after_write)
+    event.listen(_model, "after_delete", _after_delete)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session: Session) -> None:
+    changes = session.info.pop(_CHANGES_KEY, None)
+    if not changes or not permission_engine.loaded:
+        return
+
+    for op, kind, key, data in changes:
+        if kind == "action":
+            if op == "set":
+                permission_engine.add_action(*data)
+            else:
+                permission_engine.remove_action(key)
+        elif kind == "role_action":
+            if op == "set":
+                permission_engine.set_role_action(key, *data)
+            else:
+                permission_engine.remove_role_action(key)
+        elif op == "set":
+            permission_engine.set_override(key, data)
+        else:
+            permission_engine.remove_override(key)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changes(session: Session, previous_transaction: Any) -> None:
+    session.info.pop(_CHANGES_KEY, None)
@@ -0,0 +1,449 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import and_, func, insert, not_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.models import Documents, ProcessingStatus
+from app.schemas.processing import ProcessingStage, ProcessingState
+from app.services.document_store import DocumentStore, document_store
+from app.services.ocr_client import OCRClient, OCRRequest, OCRResult, create_ocr_client
+from app.services.search import IndexedDocument, SearchIndex, search_index
+
+logger = logging.getLogger(__name__)
+
+PIPELINE = list(ProcessingStage)
+THROUGHPUT_WINDOW_SECONDS = 60.0
+
+
+@dataclass
+class Job:
+    doc_id: int
+    mongo_doc_id: str
+    blob_path: str
+    stage: ProcessingStage
+    attempt: int = 0
+    # Whether a Processing_Status row for `stage` is already open (e.g. left
+    # behind by a crash), in which case it is reused instead of inserting one.
+    row_open: bool = False
+
+
+# A stage handler processes a batch and returns {doc_id: error} for failures.
+StageHandler = Callable[[list[Job]], Awaitable[Mapping[int, str] | None]]
+
+
+@dataclass
+class StageConfig:
+    stage: ProcessingStage
+    handler: StageHandler
+    concurrency: int = 1
+    batch_size: int = 1
+    batch_wait: float = 0.0
+
+
+@dataclass
+class StageCounters:
+    completed: int = 0
+    failed: int = 0
+    retried: int = 0
+    in_flight: int = 0
+    completions: deque[float] = field(default_factory=lambda: deque(maxlen=100_000))
+
+
+def next_stage(stage: ProcessingStage) -> ProcessingStage | None:
+    index = PIPELINE.index(stage) + 1
+    return PIPELINE[index] if index < len(PIPELINE) else None
+
+
+class ProcessingScheduler:
+    """
+    Asyncio scheduler moving documents through the processing stages.
+
+    Each stage has its own queue and concurrency limit and pulls jobs in
+    batches; `workers` caps the number of batches running across all stages.
+    Every attempt is mirrored in Processing_Status, which is also what
+    `recover` reads to resume after a crash. Failed documents are retried
+    with jittered exponential backoff up to `max_attempts`.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[StageConfig],
+        session_factory: async_sessionmaker[AsyncSession],
+        workers: int = 4,
+        max_attempts: int = 5,
+        backoff: float = 1.0,
+        backoff_max: float = 60.0,
+    ) -> None:
+        self._stages = {config.stage: config for config in stages}
+        self._session_factory = session_factory
+        self._max_attempts = max_attempts
+        self._backoff = backoff
+        self._backoff_max = backoff_max
+
+        self._queues: dict[ProcessingStage, asyncio.Queue[Job]] = {
+            stage: asyncio.Queue() for stage in self._stages
+        }
+        self._stage_slots = {
+            stage: asyncio.Semaphore(config.concurrency) for stage, config in self._stages.items()
+        }
+        self._workers = asyncio.Semaphore(workers)
+        self._counters = {stage: StageCounters() for stage in self._stages}
+        self._dispatchers: list[asyncio.Task[None]] = []
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.running = False
+
+    # Lifecycle
+
+    async def start(self, recover: bool = True) -> None:
+        if self.running:
+            return
+
+        if recover:
+            await self.recover()
+
+        self._dispatchers = [
+            asyncio.create_task(self._dispatch(stage), name=f"processing-{stage}")
+            for stage in self._stages
+        ]
+        self.running = True
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Stop taking new batches and wait up to `timeout` for running ones.
+        Anything left unfinished keeps an open Processing_Status row and is
+        picked up again by `recover`.
+        """
+        self.running = False
+        for dispatcher in self._dispatchers:
+            dispatcher.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._dispatchers = []
+
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+
+    def submit(
+        self, doc_id: int, mongo_doc_id: str, blob_path: str, stage: ProcessingStage | None = None
+    ) -> None:
+        """Queue a document, by default at the first stage this scheduler runs."""
+        stage = stage or next(iter(self._stages))
+        self._queues[stage].put_nowait(
+            Job(doc_id=doc_id, mongo_doc_id=mongo_doc_id, blob_path=blob_path, stage=stage)
+        )
+
+    async def recover(self) -> int:
+        """
+        Re-queue every document whose latest Processing_Status row shows
+        unfinished work. Returns the number of queued documents.
+        """
+        latest = (
+            select(ProcessingStatus.doc_id, func.max(ProcessingStatus.status_id).label("status_id"))
+            .group_by(ProcessingStatus.doc_id)
+            .subquery()
+        )
+        query = (
+            select(
+                Documents.doc_id, Documents.mongo_doc_id, Documents.azure_blob_path,
+                ProcessingStatus.stage_name, ProcessingStatus.status,
+            )
+            .join(latest, latest.c.doc_id == Documents.doc_id)
+            .join(ProcessingStatus, ProcessingStatus.status_id == latest.c.status_id)
+            .where(
+                ProcessingStatus.status != ProcessingState.FAILED,
+                not_(and_(
+                    ProcessingStatus.stage_name == PIPELINE[-1],
+                    ProcessingStatus.status == ProcessingState.COMPLETED,
+                )),
+            )
+        )
+
+        async with self._session_factory() as db:
+            rows = (await db.execute(query)).all()
+
+        queued = 0
+        for doc_id, mongo_doc_id, blob_path, stage_name, status in rows:
+            stage = ProcessingStage(stage_name)
+            if status == ProcessingState.COMPLETED:
+                resume_at, row_open = next_stage(stage), False
+            else:
+                resume_at, row_open = stage, True
+
+            if resume_at in self._stages:
+                self._queues[resume_at].put_nowait(Job(
+                    doc_id=doc_id, mongo_doc_id=mongo_doc_id, blob_path=blob_path,
+                    stage=resume_at, row_open=row_open,
+                ))
+                queued += 1
+
+        if queued:
+            logger.info("Recovered %d documents into the processing pipeline", queued)
+        return queued
+
+    # Scheduling
+
+    async def _dispatch(self, stage: ProcessingStage) -> None:
+        config = self._stages[stage]
+        queue = self._queues[stage]
+
+        while True:
+            jobs = [await queue.get()]
+
+            # Give a partial batch a short window to fill up.
+            if config.batch_wait and queue.qsize() < config.batch_size - 1:
+                await asyncio.sleep(config.batch_wait)
+            while len(jobs) < config.batch_size and not queue.empty():
+                jobs.append(queue.get_nowait())
+
+            await self._stage_slots[stage].acquire()
+            await self._workers.acquire()
+
+            task = asyncio.create_task(self._run_batch(config, jobs))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, config: StageConfig, jobs: list[Job]) -> None:
+        counters = self._counters[config.stage]
+        counters.in_flight += len(jobs)
+
+        try:
+            errors: Mapping[int, str]
+            try:
+                await self._open_rows(config.stage, [job for job in jobs if not job.row_open])
+                for job in jobs:
+                    job.row_open = True
+
+                try:
+                    errors = await config.handler(jobs) or {}
+                except Exception as exc:
+                    logger.exception("Stage %s failed for a batch of %d documents", config.stage, len(jobs))
+                    errors = {job.doc_id: str(exc) or type(exc).__name__ for job in jobs}
+
+                await self._record_results(config.stage, jobs, errors)
+            except Exception:
+                logger.exception("Could not record stage %s results", config.stage)
+                errors = {job.doc_id: "Could not record processing status" for job in jobs}
+
+            now = time.monotonic()
+            for job in jobs:
+                error = errors.get(job.doc_id)
+                if error is None:
+                    counters.completed += 1
+                    counters.completions.append(now)
+                    following = next_stage(config.stage)
+                    if following in self._stages:
+                        self._queues[following].put_nowait(Job(
+                            doc_id=job.doc_id, mongo_doc_id=job.mongo_doc_id,
+                            blob_path=job.blob_path, stage=following,
+                        ))
+                elif job.attempt + 1 < self._max_attempts:
+                    counters.retried += 1
+                    job.attempt += 1
+                    asyncio.get_running_loop().call_later(
+                        self._retry_delay(job.attempt), self._queues[config.stage].put_nowait, job
+                    )
+                else:
+                    counters.failed += 1
+        finally:
+            counters.in_flight -= len(jobs)
+            self._workers.release()
+            self._stage_slots[config.stage].release()
+
+    def _retry_delay(self, attempt: int) -> float:
+        delay = min(self._backoff * 2 ** (attempt - 1), self._backoff_max)
+        return delay * random.uniform(0.5, 1.0)
+
+    # Processing_Status bookkeeping
+
+    async def _open_rows(self, stage: ProcessingStage, jobs: list[Job]) -> None:
+        if not jobs:
+            return
+
+        async with self._session_factory() as db:
+            await db.execute(insert(ProcessingStatus), [
+                {"doc_id": job.doc_id, "stage_name": stage, "status": ProcessingState.RUNNING}
+                for job in jobs
+            ])
+            await db.commit()
+
+    async def _record_results(self, stage: ProcessingStage, jobs: list[Job], errors: Mapping[int, str]) -> None:
+        succeeded = [job.doc_id for job in jobs if job.doc_id not in errors]
+        now = datetime.now()
+
+        async with self._session_factory() as db:
+            if succeeded:
+                await db.execute(
+                    self._open_row_update(stage, succeeded)
+                    .values(status=ProcessingState.COMPLETED, end_time=now, error_message=None)
+                )
+
+            for job in jobs:
+                error = errors.get(job.doc_id)
+                if error is None:
+                    continue
+
+                if job.attempt + 1 < self._max_attempts:
+                    values = {"status": ProcessingState.PENDING, "error_message": error}
+                else:
+                    values = {"status": ProcessingState.FAILED, "error_message": error, "end_time": now}
+                await db.execute(self._open_row_update(stage, [job.doc_id]).values(**values))
+
+            await db.commit()
+
+    @staticmethod
+    def _open_row_update(stage: ProcessingStage, doc_ids: list[int]):
+        return update(ProcessingStatus).where(
+            ProcessingStatus.doc_id.in_(doc_ids),
+            ProcessingStatus.stage_name == stage,
+            ProcessingStatus.end_time.is_(None),
+        )
+
+    # Metrics
+
+    def stats(self) -> dict[ProcessingStage, dict[str, float]]:
+        """Queue depth, in-flight work, totals and recent throughput per stage."""
+        horizon = time.monotonic() - THROUGHPUT_WINDOW_SECONDS
+        result = {}
+
+        for stage, counters in self._counters.items():
+            recent = 0
+            for completed_at in reversed(counters.completions):
+                if completed_at < horizon:
+                    break
+                recent += 1
+
+            result[stage] = {
+                "queue_depth": self._queues[stage].qsize(),
+                "in_flight": counters.in_flight,
+                "completed": counters.completed,
+                "failed": counters.failed,
+                "retried": counters.retried,
+                "throughput_per_second": recent / THROUGHPUT_WINDOW_SECONDS,
+            }
+        return result
+
+
+class OCRStage:
+    """
+    OCR stage handler: sends the batch to the OCR client and passes the
+    successful `(job, result)` pairs to `result_sink`.
+    """
+
+    def __init__(
+        self,
+        client: OCRClient,
+        result_sink: Callable[[list[tuple[Job, OCRResult]]], Awaitable[Any]] | None = None,
+    ) -> None:
+        self.client = client
+        self.result_sink = result_sink
+
+    async def __call__(self, jobs: list[Job]) -> dict[int, str]:
+        results = await self.client.extract_batch(
+            [OCRRequest(doc_id=job.doc_id, blob_path=job.blob_path) for job in jobs]
+        )
+
+        errors = {result.doc_id: result.error for result in results if result.error}
+        for missing in {job.doc_id for job in jobs} - {result.doc_id for result in results}:
+            errors[missing] = "No OCR result returned"
+
+        jobs_by_id = {job.doc_id: job for job in jobs}
+        extracted = [
+            (jobs_by_id[result.doc_id], result)
+            for result in results
+            if not result.error and result.doc_id in jobs_by_id
+        ]
+        if extracted and self.result_sink is not None:
+            await self.result_sink(extracted)
+
+        return errors
+
+
+class IndexStage:
+    """
+    Index stage handler: loads the OCR text of the batch from Mongo and its
+    metadata from SQL (one query each) and adds it to the search index.
+    """
+
+    def __init__(
+        self,
+        index: SearchIndex,
+        store: DocumentStore,
+        session_factory: async_sessionmaker[AsyncSession],
+    ) -> None:
+        self.index = index
+        self.store = store
+        self.session_factory = session_factory
+
+    async def __call__(self, jobs: list[Job]) -> dict[int, str]:
+        async with self.session_factory() as db:
+            rows = (await db.execute(
+                select(
+                    Documents.doc_id, Documents.mongo_doc_id, Documents.folder_id,
+                    Documents.uploaded_by_user_id, Documents.filename,
+                ).where(Documents.doc_id.in_([job.doc_id for job in jobs]))
+            )).all()
+
+        stored = await self.store.fetch_for_documents(rows, include_text=True)
+
+        errors: dict[int, str] = {}
+        documents = []
+        rows_by_id = {row.doc_id: row for row in rows}
+        for job in jobs:
+            row = rows_by_id.get(job.doc_id)
+            text = stored.get(job.doc_id, {}).get("text")
+            if row is None:
+                errors[job.doc_id] = "Document no longer exists"
+            elif text is None:
+                errors[job.doc_id] = "No OCR text stored"
+            else:
+                documents.append(IndexedDocument(
+                    doc_id=row.doc_id, folder_id=row.folder_id,
+                    uploaded_by_user_id=row.uploaded_by_user_id,
+                    filename=row.filename, text=text,
+                ))
+
+        await self.index.index(documents)
+        return errors
+
+
+def build_scheduler(
+    ocr_client: OCRClient,
+    session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+) -> ProcessingScheduler:
+    return ProcessingScheduler(
+        stages=[
+            StageConfig(
+                stage=ProcessingStage.OCR,
+                handler=OCRStage(ocr_client, result_sink=document_store.save_ocr_results),
+                concurrency=settings.OCR_CONCURRENCY,
+                batch_size=settings.OCR_BATCH_SIZE,
+                batch_wait=settings.OCR_BATCH_WAIT_MS / 1000,
+            ),
+            StageConfig(
+                stage=ProcessingStage.INDEX,
+                handler=IndexStage(search_index, document_store, session_factory),
+                concurrency=settings.INDEX_CONCURRENCY,
+                batch_size=settings.INDEX_BATCH_SIZE,
+                batch_wait=settings.INDEX_BATCH_WAIT_MS / 1000,
+            ),
+        ],
+        session_factory=session_factory,
+        workers=settings.PROCESSING_WORKERS,
+        max_attempts=settings.PROCESSING_MAX_ATTEMPTS,
+        backoff=settings.PROCESSING_BACKOFF_SECONDS,
+        backoff_max=settings.PROCESSING_BACKOFF_MAX_SECONDS,
+    )
+
+
+processing_scheduler = build_scheduler(create_ocr_client())
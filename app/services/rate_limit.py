@@ -0,0 +1,167 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+
+from app.core.config import settings
+
+
+class RateLimited(Exception):
+    """Raised when a client has used up its attempts for the current window."""
+
+    def __init__(self, retry_after: float) -> None:
+        self.retry_after = retry_after
+        super().__init__(f"Rate limit exceeded, retry in {retry_after:.1f}s")
+
+
+class RateLimitBackend(ABC):
+    """
+    Counter store for sliding-window rate limits.
+
+    Limits are approximated from two fixed windows: the count of the
+    previous window, weighted by how much of it still overlaps the sliding
+    window, plus the count of the current one. That needs two integers per
+    key instead of a timestamp per request.
+
+    A shared implementation (e.g. Redis, one `INCR`/`EXPIRE` pair per window
+    in a Lua script) lets every worker enforce the same limits; `hit` must
+    then check and increment atomically.
+    """
+
+    @abstractmethod
+    async def hit(self, key: str, limit: int, window: float) -> float:
+        """
+        Count one attempt for `key` if fewer than `limit` were made in the
+        last `window` seconds. Returns 0 when counted, otherwise the number
+        of seconds until the next attempt would be allowed.
+        """
+
+    @abstractmethod
+    async def reset(self, key: str) -> None:
+        """Forget every attempt counted for `key`."""
+
+
+def _retry_after(now: float, start: float, window: float, current: int, previous: int, limit: int) -> float:
+    if current >= limit:
+        # Blocked until the next window, and then until this window's weight
+        # has decayed enough.
+        return start + window - now + window * (1 - limit / current)
+    return start + window * (1 - (limit - current) / previous) - now
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Process-local rate limit counters.
+
+    At most `maxsize` keys are tracked; the least recently used are evicted
+    first, and keys idle for two windows are dropped as they reach the LRU
+    end, so memory stays bounded whatever the number of clients.
+    """
+
+    def __init__(self, maxsize: int = 100_000, timer: Callable[[], float] = time.monotonic) -> None:
+        self.maxsize = maxsize
+        self._timer = timer
+        # key -> [window index, count in current window, count in previous window]
+        self._windows: OrderedDict[str, list[int]] = OrderedDict()
+
+    async def hit(self, key: str, limit: int, window: float) -> float:
+        now = self._timer()
+        index = int(now // window)
+        start = index * window
+
+        entry = self._windows.get(key)
+        if entry is None:
+            entry = [index, 0, 0]
+        elif entry[0] != index:
+            entry = [index, 0, entry[1] if entry[0] == index - 1 else 0]
+
+        current, previous = entry[1], entry[2]
+        if previous * (1 - (now - start) / window) + current >= limit:
+            return max(_retry_after(now, start, window, current, previous, limit), 0.001)
+
+        entry[1] = current + 1
+        self._windows[key] = entry
+        self._windows.move_to_end(key)
+        self._evict(index)
+        return 0.0
+
+    async def reset(self, key: str) -> None:
+        self._windows.pop(key, None)
+
+    def _evict(self, index: int) -> None:
+        windows = self._windows
+        while len(windows) > self.maxsize:
+            windows.popitem(last=False)
+        # Keys last counted two or more windows ago no longer affect any limit.
+        while windows and next(iter(windows.values()))[0] < index - 1:
+            windows.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+
+class LoginRateLimiter:
+    """
+    Per-IP and per-account limits on login attempts, checked before the
+    user is looked up or a password is verified.
+
+    The IP limit stops one client from trying many accounts; the account
+    limit stops many clients (e.g. a botnet) from guessing one password.
+    A successful login clears the account's counter.
+    """
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        per_ip: int = 20,
+        per_account: int = 5,
+        window: float = 60.0,
+    ) -> None:
+        self.backend = backend
+        self.per_ip = per_ip
+        self.per_account = per_account
+        self.window = window
+        self.rejected = 0
+
+    @staticmethod
+    def _account_key(account: str) -> str:
+        return f"login:account:{account.strip().lower()}"
+
+    async def check(self, ip: str, account: str) -> None:
+        """
+        Count a login attempt.
+
+        Raises:
+            RateLimited: If the IP or the account is over its limit
+        """
+        for key, limit in ((f"login:ip:{ip}", self.per_ip), (self._account_key(account), self.per_account)):
+            retry_after = await self.backend.hit(key, limit, self.window)
+            if retry_after:
+                self.rejected += 1
+                raise RateLimited(retry_after)
+
+    async def succeeded(self, account: str) -> None:
+        await self.backend.reset(self._account_key(account))
+
+
+def retry_after_header(retry_after: float) -> str:
+    """`Retry-After` value (whole seconds, at least 1) for a `RateLimited` error."""
+    return str(max(1, math.ceil(retry_after)))
+
+
+def create_rate_limit_backend() -> RateLimitBackend:
+    """Build the backend selected by `settings.RATE_LIMIT_BACKEND`."""
+    if settings.RATE_LIMIT_BACKEND == "memory":
+        return InMemoryRateLimitBackend(maxsize=settings.RATE_LIMIT_MAX_KEYS)
+
+    raise ValueError(f"Unknown rate limit backend: {settings.RATE_LIMIT_BACKEND}")
+
+
+login_rate_limiter = LoginRateLimiter(
+    create_rate_limit_backend(),
+    per_ip=settings.LOGIN_RATE_LIMIT_PER_IP,
+    per_account=settings.LOGIN_RATE_LIMIT_PER_ACCOUNT,
+    window=settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+)
+
@@ -0,0 +1,131 @@
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.models.models import Actions, Roles
+
+
+@dataclass(frozen=True)
+class Role:
+    role_id: int
+    role_name: str
+    description: str | None
+
+
+@dataclass(frozen=True)
+class Action:
+    action_id: int
+    action_name: str
+    entity_type: str
+
+
+class ReferenceData:
+    """Immutable snapshot of the Roles and Actions tables, indexed by id and by name."""
+
+    def __init__(self, roles: list[Role], actions: list[Action]) -> None:
+        self.roles = {role.role_id: role for role in roles}
+        self.actions = {action.action_id: action for action in actions}
+        # Names use a case-insensitive collation in the database.
+        self._roles_by_name = {role.role_name.lower(): role for role in roles}
+        self._actions_by_name = {action.action_name.lower(): action for action in actions}
+
+    def role(self, role_id: int) -> Role | None:
+        return self.roles.get(role_id)
+
+    def role_by_name(self, role_name: str) -> Role | None:
+        return self._roles_by_name.get(role_name.lower())
+
+    def action(self, action_id: int) -> Action | None:
+        return self.actions.get(action_id)
+
+    def action_by_name(self, action_name: str) -> Action | None:
+        return self._actions_by_name.get(action_name.lower())
+
+
+class ReferenceDataCache:
+    """
+    Process-wide copy of the small, rarely changing Roles/Actions tables.
+
+    Loaded at startup and reloaded once `ttl` seconds have passed, or on the
+    next read after `invalidate()`. ORM writes to either table invalidate it
+    when their transaction commits. While one caller reloads an expired
+    snapshot, concurrent callers keep using the previous one instead of
+    waiting on the database.
+    """
+
+    def __init__(self, ttl: float = 300.0, timer: Callable[[], float] = time.monotonic) -> None:
+        self.ttl = ttl
+        self._timer = timer
+        self._lock = asyncio.Lock()
+        self._snapshot: ReferenceData | None = None
+        self._expires_at = 0.0
+
+    @property
+    def loaded(self) -> bool:
+        return self._snapshot is not None
+
+    async def get(self, db: AsyncSession) -> ReferenceData:
+        """The current snapshot, (re)loading it through `db` when missing or stale."""
+        snapshot = self._snapshot
+        if snapshot is not None and (self._timer() < self._expires_at or self._lock.locked()):
+            return snapshot
+
+        async with self._lock:
+            if self._snapshot is None or self._timer() >= self._expires_at:
+                await self.load(db)
+        return self._snapshot  # type: ignore[return-value]
+
+    async def load(self, db: AsyncSession) -> ReferenceData:
+        """Replace the snapshot with two flat SELECTs."""
+        roles = (await db.execute(select(Roles.role_id, Roles.role_name, Roles.description))).all()
+        actions = (await db.execute(select(Actions.action_id, Actions.action_name, Actions.entity_type))).all()
+
+        self._snapshot = ReferenceData([Role(*row) for row in roles], [Action(*row) for row in actions])
+        self._expires_at = self._timer() + self.ttl
+        return self._snapshot
+
+    def invalidate(self) -> None:
+        """Reload on next use, e.g. after Roles/Actions were changed outside the ORM."""
+        self._expires_at = 0.0
+
+
+reference_data = ReferenceDataCache(ttl=settings.REFERENCE_DATA_TTL_SECONDS)
+
+
+async def get_reference_data(db: AsyncSession) -> ReferenceData:
+    return await reference_data.get(db)
+
+
+# Invalidate once a transaction that wrote Roles or Actions commits.
+
+_CHANGED_KEY = "reference_data_changed"
+
+
+def _record(mapper: Any, connection: Any, target: Any) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info[_CHANGED_KEY] = True
+
+
+for _model in (Roles, Actions):
+    event.listen(_model, "after_insert", _record)
+    event.listen(_model, "after_update", _record)
+    event.listen(_model, "after_delete", _record)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    if session.info.pop(_CHANGED_KEY, False):
+        reference_data.invalidate()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changes(session: Session, previous_transaction: Any) -> None:
+    session.info.pop(_CHANGED_KEY, None)
@@ -0,0 +1,89 @@
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from jose import JWTError
+
+from app.core.config import settings
+from app.core.security import create_access_token, create_refresh_token, decode_token
+from app.services.auth_cache import user_cache
+from app.services.revocation import RevocationStore
+
+
+class RefreshTokenReused(Exception):
+    """Raised when an already rotated refresh token is presented again."""
+
+    def __init__(self, user_id: int) -> None:
+        self.user_id = user_id
+        super().__init__("Refresh token reuse detected")
+
+
+@dataclass(frozen=True)
+class RotatedTokens:
+    user_id: int
+    access_token: str
+    refresh_token: str
+
+
+def _jti_key(jti: str) -> str:
+    return f"jti:{jti}"
+
+
+def _family_key(family: str) -> str:
+    return f"fam:{family}"
+
+
+def _family_expiry() -> float:
+    # The newest token of a family can outlive the one being presented.
+    return time.time() + settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+
+
+async def _verified_claims(token: str, store: RevocationStore) -> dict[str, Any]:
+    claims = decode_token(token, expected_type="refresh")
+    if not claims.get("jti") or not claims.get("fam") or "rid" not in claims:
+        raise JWTError("Refresh token cannot be rotated")
+    if await store.is_revoked(_family_key(claims["fam"])):
+        raise JWTError("Refresh token revoked")
+    return claims
+
+
+async def rotate_refresh_token(token: str, store: RevocationStore) -> RotatedTokens:
+    """
+    Exchange a refresh token for a new access/refresh pair.
+
+    The presented token is marked used; presenting it again revokes its
+    whole family, logging out both the legitimate client and whoever
+    replayed it. Only JWT verification and in-memory lookups are involved:
+    the role comes from the cached user snapshot or the token itself.
+
+    Raises:
+        JWTError: If the token is invalid, expired or revoked
+        RefreshTokenReused: If the token was already rotated
+    """
+    claims = await _verified_claims(token, store)
+    user_id = int(claims["sub"])
+
+    if not await store.revoke(_jti_key(claims["jti"]), float(claims["exp"])):
+        await store.revoke(_family_key(claims["fam"]), _family_expiry())
+        raise RefreshTokenReused(user_id)
+
+    cached = user_cache.get(user_id)
+    role_id = cached.role_id if cached is not None else claims["rid"]
+
+    return RotatedTokens(
+        user_id=user_id,
+        access_token=create_access_token(subject=user_id, role_id=role_id),
+        refresh_token=create_refresh_token(subject=user_id, role_id=role_id, family=claims["fam"]),
+    )
+
+
+async def revoke_refresh_token(token: str, store: RevocationStore) -> int:
+    """
+    Revoke the family of a refresh token (logout). Returns the user id.
+
+    Raises:
+        JWTError: If the token is invalid, expired or already revoked
+    """
+    claims = await _verified_claims(token, store)
+    await store.revoke(_family_key(claims["fam"]), _family_expiry())
+    return int(claims["sub"])
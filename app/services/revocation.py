@@ -0,0 +1,108 @@
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+
+
+class RevocationStore(ABC):
+    """
+    Set of revoked token identifiers (refresh-token `jti`s and token
+    families), each kept until the tokens it covers have expired.
+
+    A shared implementation (e.g. Redis `SET NX EX`) must make `revoke`
+    atomic, since it doubles as the "use once" check for refresh rotation.
+    """
+
+    @abstractmethod
+    async def revoke(self, key: str, expires_at: float) -> bool:
+        """Revoke `key` until `expires_at`; False if it was already revoked."""
+
+    @abstractmethod
+    async def is_revoked(self, key: str) -> bool: ...
+
+
+class InMemoryRevocationStore(RevocationStore):
+    """
+    Process-local revocation store.
+
+    Lookups go through a Bloom filter first, so checking a token that was
+    never revoked (the common case) is a few bit tests; only filter hits
+    consult the exact dict. Expired entries are compacted out and the filter
+    rebuilt every `compact_interval` seconds, or earlier once it holds more
+    keys than it was sized for.
+
+    Args:
+        capacity: Expected number of live revocations; the filter doubles when exceeded
+        error_rate: Target Bloom filter false-positive rate
+        compact_interval: Seconds between sweeps of expired entries
+        timer: Clock returning epoch seconds, as in JWT `exp` claims
+    """
+
+    def __init__(
+        self,
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+        compact_interval: float = 300.0,
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.compact_interval = compact_interval
+        self._timer = timer
+        self._revoked: dict[str, float] = {}
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._next_compaction = timer() + compact_interval
+        self.bloom_rejections = 0
+
+    async def revoke(self, key: str, expires_at: float) -> bool:
+        now = self._timer()
+        if now >= self._next_compaction or self._bloom.saturated:
+            self.compact(now)
+
+        current = self._revoked.get(key)
+        if current is not None and current > now:
+            if expires_at > current:
+                self._revoked[key] = expires_at
+            return False
+
+        self._revoked[key] = expires_at
+        self._bloom.add(key)
+        return True
+
+    async def is_revoked(self, key: str) -> bool:
+        if key not in self._bloom:
+            self.bloom_rejections += 1
+            return False
+
+        expires_at = self._revoked.get(key)
+        return expires_at is not None and expires_at > self._timer()
+
+    def compact(self, now: float | None = None) -> int:
+        """Drop expired entries and rebuild the filter. Returns how many were dropped."""
+        now = self._timer() if now is None else now
+        before = len(self._revoked)
+        self._revoked = {key: expires_at for key, expires_at in self._revoked.items() if expires_at > now}
+
+        # Keep the rebuilt filter at most half full, so live revocations that
+        # hover near capacity don't trigger a full rebuild every few calls.
+        while len(self._revoked) * 2 > self.capacity:
+            self.capacity *= 2
+        self._bloom = BloomFilter.from_keys(self._revoked, self.capacity, self.error_rate)
+        self._next_compaction = now + self.compact_interval
+        return before - len(self._revoked)
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+def create_revocation_store() -> RevocationStore:
+    return InMemoryRevocationStore(
+        capacity=settings.REVOCATION_CAPACITY,
+        error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+        compact_interval=settings.REVOCATION_COMPACT_INTERVAL_SECONDS,
+    )
+
+
+revocation_store = create_revocation_store()
@@ -0,0 +1,270 @@
+import asyncio
+import json
+import re
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Collection, Sequence
+from dataclasses import dataclass
+
+from app.core.config import settings
+
+# Rows pulled from the index per round trip while permission filtering.
+SCAN_CHUNK_SIZE = 200
+
+# Chunks one page may read to replace hits dropped by permission filtering.
+MAX_SCAN_CHUNKS = 5
+
+_TOKEN = re.compile(r"\w+")
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedDocument:
+    doc_id: int
+    folder_id: int
+    uploaded_by_user_id: int
+    filename: str
+    text: str
+
+
+@dataclass(frozen=True, slots=True)
+class SearchHit:
+    doc_id: int
+    folder_id: int
+    uploaded_by_user_id: int
+    filename: str
+    score: float
+    snippet: str
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class SearchIndex(ABC):
+    """
+    Pluggable full-text index over the OCR text of documents.
+
+    `search` returns hits best first (BM25) and must be stable across calls
+    so callers can page through it with `offset`. `folder_ids` and
+    `uploaded_by` restrict hits to documents in those folders / from that
+    uploader.
+    """
+
+    @abstractmethod
+    async def index(self, documents: Sequence[IndexedDocument]) -> None: ...
+
+    @abstractmethod
+    async def remove(self, doc_ids: Collection[int]) -> None: ...
+
+    @abstractmethod
+    async def search(
+        self,
+        query: str,
+        folder_ids: Collection[int] | None = None,
+        uploaded_by: int | None = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> list[SearchHit]: ...
+
+    async def close(self) -> None:
+        return None
+
+
+class SQLiteSearchIndex(SearchIndex):
+    """
+    Search index on a local SQLite file using FTS5 and its `bm25()` ranking.
+
+    Filenames are weighted above body text. Writes go through one connection
+    behind a lock; reads use a connection per executor thread, so queries
+    run concurrently with each other and with indexing (WAL mode).
+
+    Args:
+        path: SQLite database file, created on first use
+        filename_weight: BM25 weight of filename matches relative to text
+    """
+
+    def __init__(self, path: str, filename_weight: float = 2.0) -> None:
+        self.path = path
+        self.filename_weight = filename_weight
+        self._write_lock = threading.Lock()
+        self._writer: sqlite3.Connection | None = None
+        self._readers = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self._connections.append(conn)
+        return conn
+
+    def _writer_connection(self) -> sqlite3.Connection:
+        if self._writer is None:
+            self._writer = self._connect()
+            with self._writer:
+                self._writer.executescript("""
+                    CREATE TABLE IF NOT EXISTS documents (
+                        doc_id INTEGER PRIMARY KEY,
+                        folder_id INTEGER NOT NULL,
+                        uploaded_by_user_id INTEGER NOT NULL,
+                        filename TEXT NOT NULL
+                    );
+                    CREATE INDEX IF NOT EXISTS ix_documents_folder ON documents (folder_id);
+                    CREATE INDEX IF NOT EXISTS ix_documents_uploader ON documents (uploaded_by_user_id);
+                    CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+                        filename, text, tokenize = 'unicode61 remove_diacritics 2'
+                    );
+                """)
+        return self._writer
+
+    def _reader_connection(self) -> sqlite3.Connection:
+        conn = getattr(self._readers, "conn", None)
+        if conn is None:
+            with self._write_lock:
+                self._writer_connection()
+            conn = self._readers.conn = self._connect()
+        return conn
+
+    async def index(self, documents: Sequence[IndexedDocument]) -> None:
+        if documents:
+            await asyncio.to_thread(self._index, documents)
+
+    def _index(self, documents: Sequence[IndexedDocument]) -> None:
+        with self._write_lock:
+            conn = self._writer_connection()
+            with conn:
+                conn.executemany(
+                    "DELETE FROM documents_fts WHERE rowid = ?",
+                    [(document.doc_id,) for document in documents],
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?)",
+                    [
+                        (document.doc_id, document.folder_id, document.uploaded_by_user_id, document.filename)
+                        for document in documents
+                    ],
+                )
+                conn.executemany(
+                    "INSERT INTO documents_fts (rowid, filename, text) VALUES (?, ?, ?)",
+                    [(document.doc_id, document.filename, document.text) for document in documents],
+                )
+
+    async def remove(self, doc_ids: Collection[int]) -> None:
+        if doc_ids:
+            await asyncio.to_thread(self._remove, doc_ids)
+
+    def _remove(self, doc_ids: Collection[int]) -> None:
+        with self._write_lock:
+            conn = self._writer_connection()
+            with conn:
+                conn.executemany("DELETE FROM documents_fts WHERE rowid = ?", [(doc_id,) for doc_id in doc_ids])
+                conn.executemany("DELETE FROM documents WHERE doc_id = ?", [(doc_id,) for doc_id in doc_ids])
+
+    async def search(
+        self,
+        query: str,
+        folder_ids: Collection[int] | None = None,
+        uploaded_by: int | None = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> list[SearchHit]:
+        tokens = tokenize(query)
+        if not tokens or (folder_ids is not None and not folder_ids):
+            return []
+        return await asyncio.to_thread(self._search, tokens, folder_ids, uploaded_by, limit, offset)
+
+    def _search(
+        self,
+        tokens: list[str],
+        folder_ids: Collection[int] | None,
+        uploaded_by: int | None,
+        limit: int,
+        offset: int,
+    ) -> list[SearchHit]:
+        # Quote every token so user input is never parsed as FTS5 syntax;
+        # space-separated terms must all match.
+        sql = [
+            "SELECT d.doc_id, d.folder_id, d.uploaded_by_user_id, d.filename,",
+            f"       bm25(documents_fts, {self.filename_weight}, 1.0) AS rank,",
+            "       snippet(documents_fts, 1, '[', ']', '…', 16)",
+            "FROM documents_fts JOIN documents d ON d.doc_id = documents_fts.rowid",
+            "WHERE documents_fts MATCH ?",
+        ]
+        params: list[object] = [" ".join(f'"{token}"' for token in tokens)]
+
+        if folder_ids is not None:
+            sql.append("AND d.folder_id IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(list(folder_ids)))
+        if uploaded_by is not None:
+            sql.append("AND d.uploaded_by_user_id = ?")
+            params.append(uploaded_by)
+
+        sql.append("ORDER BY rank, d.doc_id LIMIT ? OFFSET ?")
+        params += [limit, offset]
+
+        rows = self._reader_connection().execute("\n".join(sql), params).fetchall()
+        # bm25() is lower-is-better; expose a higher-is-better score.
+        return [
+            SearchHit(doc_id, folder_id, uploader, filename, -rank, snippet)
+            for doc_id, folder_id, uploader, filename, rank, snippet in rows
+        ]
+
+    async def close(self) -> None:
+        for conn in self._connections:
+            conn.close()
+        self._connections = []
+        self._writer = None
+        self._readers = threading.local()
+
+
+async def search_visible(
+    index: SearchIndex,
+    query: str,
+    keep: Callable[[list[SearchHit]], list[SearchHit]],
+    limit: int,
+    offset: int = 0,
+    folder_ids: Collection[int] | None = None,
+    uploaded_by: int | None = None,
+    max_chunks: int = MAX_SCAN_CHUNKS,
+) -> tuple[list[SearchHit], int | None]:
+    """
+    One page of hits the caller may see, and the offset to continue from
+    (None on the last page).
+
+    `offset` is a position in the index's ranking, not among visible hits.
+    Hits are read from there in chunks and passed through `keep`
+    (permission filtering), at most `max_chunks` chunks per page, so a
+    caller who may see few of the matches gets a short (possibly empty)
+    page and an offset to continue from instead of a scan of the whole
+    index.
+    """
+    chunk = max(limit + 1, SCAN_CHUNK_SIZE)
+    visible: list[SearchHit] = []
+    scanned = offset
+
+    for _ in range(max_chunks):
+        hits = await index.search(query, folder_ids, uploaded_by, limit=chunk, offset=scanned)
+        kept = {hit.doc_id for hit in keep(hits)}
+        for position, hit in enumerate(hits, start=scanned + 1):
+            if hit.doc_id in kept:
+                visible.append(hit)
+                if len(visible) == limit:
+                    more = position < scanned + len(hits) or len(hits) == chunk
+                    return visible, position if more else None
+        scanned += len(hits)
+        if len(hits) < chunk:
+            return visible, None
+
+    return visible, scanned
+
+
+def create_search_index() -> SearchIndex:
+    """Build the search index selected by `settings.SEARCH_BACKEND`."""
+    if settings.SEARCH_BACKEND == "sqlite":
+        return SQLiteSearchIndex(settings.SEARCH_INDEX_PATH)
+
+    raise ValueError(f"Unknown search backend: {settings.SEARCH_BACKEND}")
+
+
+search_index = create_search_index()
@@ -0,0 +1,101 @@
+import asyncio
+import os
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import BinaryIO
+
+from app.core.config import settings
+
+
+class BlobWriter(ABC):
+    """
+    An in-progress blob upload.
+
+    Data is staged with `write`; `commit` publishes it under its final path
+    and `abort` throws it away. Backends such as Azure map this onto staged
+    blocks plus a block-list commit.
+    """
+
+    @abstractmethod
+    async def write(self, data: bytes) -> None: ...
+
+    @abstractmethod
+    async def commit(self, path: str) -> None: ...
+
+    @abstractmethod
+    async def abort(self) -> None: ...
+
+
+class BlobStorage(ABC):
+    """Pluggable blob store used for uploaded document content."""
+
+    @abstractmethod
+    async def open_writer(self) -> BlobWriter: ...
+
+    @abstractmethod
+    async def exists(self, path: str) -> bool: ...
+
+    @abstractmethod
+    async def delete(self, path: str) -> None: ...
+
+
+class LocalBlobWriter(BlobWriter):
+    def __init__(self, root: Path, staging_path: Path, handle: BinaryIO) -> None:
+        self._root = root
+        self._staging_path = staging_path
+        self._handle = handle
+        self._closed = False
+
+    async def write(self, data: bytes) -> None:
+        await asyncio.to_thread(self._handle.write, data)
+
+    async def commit(self, path: str) -> None:
+        await asyncio.to_thread(self._commit, self._root / path)
+
+    def _commit(self, target: Path) -> None:
+        self._handle.close()
+        self._closed = True
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(self._staging_path, target)
+
+    async def abort(self) -> None:
+        if not self._closed:
+            self._closed = True
+            await asyncio.to_thread(self._discard)
+
+    def _discard(self) -> None:
+        self._handle.close()
+        self._staging_path.unlink(missing_ok=True)
+
+
+class LocalBlobStorage(BlobStorage):
+    """
+    Filesystem stand-in for blob storage, used for local development and
+    tests. Uploads are staged under `.incoming/` and renamed into place.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    async def open_writer(self) -> BlobWriter:
+        staging_path = self.root / ".incoming" / uuid.uuid4().hex
+        handle = await asyncio.to_thread(self._open, staging_path)
+        return LocalBlobWriter(self.root, staging_path, handle)
+
+    @staticmethod
+    def _open(staging_path: Path) -> BinaryIO:
+        staging_path.parent.mkdir(parents=True, exist_ok=True)
+        return open(staging_path, "wb")
+
+    async def exists(self, path: str) -> bool:
+        return await asyncio.to_thread((self.root / path).exists)
+
+    async def delete(self, path: str) -> None:
+        await asyncio.to_thread((self.root / path).unlink, True)
+
+
+blob_storage: BlobStorage = LocalBlobStorage(settings.BLOB_STORAGE_ROOT)
+
+def get_blob_storage() -> BlobStorage:
+    return blob_storage
@@ -0,0 +1,81 @@
+import hashlib
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import dataclass
+
+from app.services.storage import BlobStorage
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload stream exceeds the configured size limit."""
+
+
+@dataclass(frozen=True)
+class StoredBlob:
+    path: str
+    content_hash: str
+    size: int
+    deduplicated: bool
+
+
+def blob_path_for(content_hash: str) -> str:
+    """Content-addressed location of a blob, fanned out by hash prefix."""
+    return f"sha256/{content_hash[:2]}/{content_hash[2:4]}/{content_hash}"
+
+
+async def rechunk(stream: AsyncIterable[bytes], chunk_size: int) -> AsyncIterator[bytes]:
+    """
+    Regroup an arbitrary byte stream into `chunk_size` pieces (the last one
+    may be shorter), so at most about one chunk is buffered at a time.
+    """
+    buffer = bytearray()
+    async for data in stream:
+        if not data:
+            continue
+        buffer += data
+        while len(buffer) >= chunk_size:
+            yield bytes(buffer[:chunk_size])
+            del buffer[:chunk_size]
+
+    if buffer:
+        yield bytes(buffer)
+
+
+async def store_stream(
+    stream: AsyncIterable[bytes],
+    storage: BlobStorage,
+    chunk_size: int,
+    max_size: int | None = None,
+) -> StoredBlob:
+    """
+    Stream an upload into `storage`, hashing it on the fly.
+
+    The content is staged while the SHA-256 is computed; once the stream
+    ends, the blob is published under its content-addressed path, or
+    discarded if identical content is already stored.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    writer = await storage.open_writer()
+
+    try:
+        async for chunk in rechunk(stream, chunk_size):
+            size += len(chunk)
+            if max_size is not None and size > max_size:
+                raise UploadTooLarge()
+
+            digest.update(chunk)
+            await writer.write(chunk)
+
+        content_hash = digest.hexdigest()
+        path = blob_path_for(content_hash)
+
+        if await storage.exists(path):
+            await writer.abort()
+            return StoredBlob(path=path, content_hash=content_hash, size=size, deduplicated=True)
+
+        await writer.commit(path)
+    except BaseException:
+        await writer.abort()
+        raise
+
+    return StoredBlob(path=path, content_hash=content_hash, size=size, deduplicated=False)
@@ -0,0 +1,226 @@
+import asyncio
+import random
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+from sqlalchemy import insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import Users
+from app.schemas.user import UserCreate, UserResponse
+from app.services.password_hasher import PasswordHasher, PasswordHasherBusy
+from app.services.reference_data import get_reference_data
+
+# Map constraint/index names on Users to the field they protect, so a
+# violation can be reported precisely from the driver's error message.
+_CONSTRAINT_FIELDS: dict[str, str] = {
+    **{
+        index.name: next(iter(index.columns)).name
+        for index in Users.__table__.indexes
+        if index.unique and index.name and len(index.columns) == 1
+    },
+    **{
+        constraint.name: next(iter(constraint.columns)).name
+        for constraint in Users.__table__.foreign_key_constraints
+        if isinstance(constraint.name, str)
+    },
+}
+
+CONFLICT_MESSAGES = {
+    "email": "Email already registered",
+    "username": "Username already taken",
+    "role_id": "Invalid role",
+}
+
+
+class UserConflict(Exception):
+    """Raised when a user row violates a unique index or foreign key."""
+
+    def __init__(self, field: str | None) -> None:
+        self.field = field
+        super().__init__(CONFLICT_MESSAGES.get(field or "", "Registration failed. Please try again."))
+
+
+def conflicting_field(exc: IntegrityError) -> str | None:
+    """Name of the Users field whose constraint `exc` violated, if known."""
+    message = str(exc.orig)
+    for name, field_name in _CONSTRAINT_FIELDS.items():
+        if name in message:
+            return field_name
+
+    # Drivers that don't name the constraint (e.g. SQLite) report the column.
+    for field_name in set(_CONSTRAINT_FIELDS.values()):
+        if f"{Users.__tablename__}.{field_name}" in message:
+            return field_name
+    return None
+
+
+def gen_username(email: str) -> str:
+    local_part, domain = email.split("@")
+    domain_name = domain.split(".")[0]
+    return f"{local_part}_{domain_name}"
+
+
+async def create_user(db: AsyncSession, user_info: UserCreate, password_hash: str) -> UserResponse:
+    """
+    Insert a user in a single statement that returns the generated
+    `user_id`/`created_at` (OUTPUT on SQL Server). Duplicate email/username
+    and unknown roles are detected by the database constraints.
+
+    Raises:
+        UserConflict: If a unique index or foreign key was violated
+    """
+    username = user_info.username or gen_username(user_info.email)
+
+    query = insert(Users).values(
+        username=username,
+        email=user_info.email,
+        password_hash=password_hash,
+        role_id=user_info.role_id,
+    ).returning(Users.user_id, Users.created_at)
+
+    try:
+        user_id, created_at = (await db.execute(query)).one()
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        raise UserConflict(conflicting_field(exc)) from exc
+
+    # Every field is either validated input or generated by the database.
+    return UserResponse.model_construct(
+        user_id=user_id,
+        username=username,
+        email=user_info.email,
+        role_id=user_info.role_id,
+        created_at=created_at,
+    )
+
+
+@dataclass
+class ImportConflict:
+    email: str
+    username: str
+    reason: str
+
+
+# Backoff while the shared password hasher rejects work.
+_HASH_RETRY_DELAY = 0.05
+_HASH_RETRY_DELAY_MAX = 2.0
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    conflicts: list[ImportConflict] = field(default_factory=list)
+
+
+async def import_users(
+    db: AsyncSession,
+    users: Sequence[UserCreate],
+    hasher: PasswordHasher,
+    batch_size: int = 500,
+    hash_concurrency: int = 4,
+) -> ImportResult:
+    """
+    Bulk-create users in batches.
+
+    Users with an unknown role are reported without touching the database.
+    Per batch: one SELECT finds existing emails/usernames and ends its
+    transaction, the remaining passwords are hashed in parallel on `hasher`
+    without holding a connection, and the rows go in with a single
+    executemany INSERT and commit. If the batch still hits a
+    constraint (a concurrent registration), its rows are retried one by one
+    so only the offending users are reported.
+
+    `hasher` is shared with logins; while it is saturated, hashing backs
+    off and retries instead of aborting a partly committed import.
+    """
+    result = ImportResult()
+    reference = await get_reference_data(db)
+    slots = asyncio.Semaphore(hash_concurrency)
+
+    async def hash_one(password: str) -> str:
+        async with slots:
+            delay = _HASH_RETRY_DELAY
+            while True:
+                try:
+                    return await hasher.hash(password)
+                except PasswordHasherBusy:
+                    await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+                    delay = min(delay * 2, _HASH_RETRY_DELAY_MAX)
+
+    for start in range(0, len(users), batch_size):
+        candidates: list[tuple[UserCreate, str]] = []
+        seen_emails: set[str] = set()
+        seen_usernames: set[str] = set()
+
+        # Emails and usernames use a case-insensitive collation.
+        for user_info in users[start:start + batch_size]:
+            username = user_info.username or gen_username(user_info.email)
+            if reference.role(user_info.role_id) is None:
+                result.conflicts.append(ImportConflict(user_info.email, username, CONFLICT_MESSAGES["role_id"]))
+            elif user_info.email.lower() in seen_emails:
+                result.conflicts.append(ImportConflict(user_info.email, username, CONFLICT_MESSAGES["email"]))
+            elif username.lower() in seen_usernames:
+                result.conflicts.append(ImportConflict(user_info.email, username, CONFLICT_MESSAGES["username"]))
+            else:
+                seen_emails.add(user_info.email.lower())
+                seen_usernames.add(username.lower())
+                candidates.append((user_info, username))
+
+        if not candidates:
+            continue
+
+        existing = (await db.execute(
+            select(Users.email, Users.username).where(or_(
+                Users.email.in_(seen_emails),
+                Users.username.in_(seen_usernames),
+            ))
+        )).all()
+        taken_emails = {email.lower() for email, _ in existing}
+        taken_usernames = {username.lower() for _, username in existing}
+        # Return the connection to the pool while the batch is hashed; users
+        # registered meanwhile are caught by the INSERT's constraints.
+        await db.rollback()
+
+        fresh = []
+        for user_info, username in candidates:
+            if user_info.email.lower() in taken_emails:
+                result.conflicts.append(ImportConflict(user_info.email, username, CONFLICT_MESSAGES["email"]))
+            elif username.lower() in taken_usernames:
+                result.conflicts.append(ImportConflict(user_info.email, username, CONFLICT_MESSAGES["username"]))
+            else:
+                fresh.append((user_info, username))
+
+        if not fresh:
+            continue
+
+        hashes = await asyncio.gather(*(hash_one(user_info.password) for user_info, _ in fresh))
+        rows = [
+            {
+                "username": username,
+                "email": user_info.email,
+                "password_hash": password_hash,
+                "role_id": user_info.role_id,
+            }
+            for (user_info, username), password_hash in zip(fresh, hashes)
+        ]
+
+        try:
+            await db.execute(insert(Users), rows)
+            await db.commit()
+            result.created += len(rows)
+        except IntegrityError:
+            await db.rollback()
+            for row in rows:
+                try:
+                    await db.execute(insert(Users), [row])
+                    await db.commit()
+                    result.created += 1
+                except IntegrityError as exc:
+                    await db.rollback()
+                    reason = CONFLICT_MESSAGES.get(conflicting_field(exc) or "", "Could not be created")
+                    result.conflicts.append(ImportConflict(row["email"], row["username"], reason))
+
+    return result
@@ -0,0 +1,60 @@
+"""Shared helpers for the benchmark scripts.
+
+Benchmarks run without a `.env`, so placeholder settings are provided for the
+required fields before anything under `app` is imported.
+"""
+import asyncio
+import os
+import statistics
+import time
+
+_DEFAULT_ENV = {
+    "MONGO_USER": "bench",
+    "MONGO_PASS": "bench",
+    "MONGO_HOST": "localhost",
+    "SQL_SERVER": "localhost",
+    "SQL_DB_NAME": "bench",
+    "SQL_USER": "bench",
+    "SQL_PASS": "bench",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "REFRESH_TOKEN_EXPIRE_DAYS": "7",
+    "JWT_ALGORITHM": "HS256",
+    "JWT_SECRET_KEY": "benchmark-secret-key",
+}
+
+for _key, _value in _DEFAULT_ENV.items():
+    os.environ.setdefault(_key, _value)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of `samples` (0 when empty)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize_ms(samples: list[float]) -> str:
+    """Format latency samples (in seconds) as p50/p95/p99/max milliseconds."""
+    if not samples:
+        return "no samples"
+    return (
+        f"n={len(samples)} "
+        f"mean={statistics.fmean(samples) * 1000:.2f}ms "
+        f"p50={percentile(samples, 50) * 1000:.2f}ms "
+        f"p95={percentile(samples, 95) * 1000:.2f}ms "
+        f"p99={percentile(samples, 99) * 1000:.2f}ms "
+        f"max={max(samples) * 1000:.2f}ms"
+    )
+
+
+PROBE_INTERVAL = 0.005
+
+
+async def probe(stop: asyncio.Event, samples: list[float]) -> None:
+    """Record how late the event loop wakes a `PROBE_INTERVAL` sleep, until `stop` is set."""
+    while not stop.is_set():
+        expected = time.perf_counter() + PROBE_INTERVAL
+        await asyncio.sleep(PROBE_INTERVAL)
+        samples.append(max(0.0, time.perf_counter() - expected))
@@ -0,0 +1,61 @@
+"""
+SQLite stand-in for the SQL Server database.
+
+The generated models carry SQL Server specifics (collations, `getdate()`
+defaults, BIGINT identity keys) that SQLite rejects. `adapt_metadata_for_sqlite`
+rewrites them in place so `Base.metadata.create_all` works against a local
+file; it must only be used in benchmark processes.
+"""
+import asyncio
+from typing import Any
+
+import aiosqlite
+from sqlalchemy import BigInteger, DefaultClause, Integer, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.models.models import Base
+
+_adapted = False
+
+
+def adapt_metadata_for_sqlite() -> None:
+    global _adapted
+    if _adapted:
+        return
+
+    for table in Base.metadata.tables.values():
+        for column in table.columns:
+            if getattr(column.type, "collation", None):
+                column.type.collation = None  # type: ignore[attr-defined]
+
+            default = column.server_default
+            if isinstance(default, DefaultClause) and "getdate" in str(default.arg):
+                column.server_default = DefaultClause(text("CURRENT_TIMESTAMP"))
+
+            # SQLite only auto-increments INTEGER PRIMARY KEY columns.
+            if column.primary_key and isinstance(column.type, BigInteger):
+                column.type = Integer()
+
+    _adapted = True
+
+
+def create_standin_engine(path: str, connect_latency: float = 0.0, **kwargs: Any) -> AsyncEngine:
+    """
+    Async engine on a SQLite file. `connect_latency` delays every new
+    connection to mimic ODBC connection setup to a remote server.
+    """
+    adapt_metadata_for_sqlite()
+
+    async def connect() -> aiosqlite.Connection:
+        if connect_latency:
+            await asyncio.sleep(connect_latency)
+        return await aiosqlite.connect(path)
+
+    return create_async_engine("sqlite+aiosqlite://", async_creator=connect, **kwargs)
+
+
+async def create_schema(engine: AsyncEngine) -> None:
+    tables = [table for name, table in Base.metadata.tables.items() if name != "sysdiagrams"]
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all, tables=tables)
+        await conn.run_sync(Base.metadata.create_all, tables=tables)
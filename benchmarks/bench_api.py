@@ -0,0 +1,376 @@
+"""
+End-to-end load test of the API against a SQLite stand-in.
+
+Builds the app with `create_app()`, points it at a fresh SQLite file through
+`set_engine` and runs its lifespan, then drives it in-process through an
+httpx ASGI client (`pip install -e ".[dev]"`). Each scenario sends its requests
+from `--concurrency` workers, `--rounds` times, and reports throughput,
+latency percentiles, response status counts and how late the event loop
+ran a probe meanwhile (medians over the rounds).
+
+Scenarios, in order:
+
+    register   POST /api/v1/auth/register, `--users` new accounts
+    login      POST /api/v1/auth/login, `--users` logins of the registered accounts
+    folders    GET  /api/v1/folders, `--requests` times with the tokens from login
+    documents  GET  /api/v1/documents?folder_id=, a page of a `--documents` folder
+    search     GET  /api/v1/search?q=
+
+register and login are dominated by bcrypt, so they show regressions in
+`hash_password` and the password hasher pool; the authenticated listings
+go through `get_current_user`, `get_db` and the permission caches.
+
+Results can be stored as a baseline and later runs compared against it;
+a throughput drop, or a p50/p95/loop-lag increase, beyond `--tolerance` is
+reported as a regression and makes the run exit with status 1:
+
+    python -m benchmarks.bench_api --save-baseline
+    python -m benchmarks.bench_api --compare
+
+Baselines are only comparable on the same machine with the same options;
+on a busy or shared machine, raise `--rounds` or `--tolerance`.
+The login rate limiter is disabled and background processing is off,
+unless set otherwise in the environment.
+"""
+import argparse
+import asyncio
+import gc
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from benchmarks._common import percentile, probe, summarize_ms
+from benchmarks._sqlite import create_schema, create_standin_engine
+
+from sqlalchemy import insert
+
+from app.models.models import Actions, Documents, Folders, RoleActions, Roles, Users
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "api.json"
+PASSWORD = "20-Na$$aQ-26"
+FOLDER_ID = 1
+
+# Applied with `setdefault` before the app is imported.
+LOAD_TEST_ENV = {
+    "LOGIN_RATE_LIMIT_ENABLED": "false",
+    "PROCESSING_ENABLED": "false",
+    "LOG_LEVEL": "WARNING",
+}
+
+# Metrics compared against the baseline, and whether higher is better.
+COMPARED_METRICS = {
+    "throughput": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "lag_p99_ms": False,
+}
+
+
+@dataclass
+class LoadState:
+    registered: list[str] = field(default_factory=list)
+    tokens: list[str] = field(default_factory=list)
+    user_numbers: itertools.count = field(default_factory=itertools.count)
+
+    def auth(self, n: int) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.tokens[n % len(self.tokens)]}"}
+
+
+Send = Callable[[Any, int, LoadState], Awaitable[Any]]
+
+
+async def register(client: Any, n: int, state: LoadState) -> Any:
+    # Numbered across rounds, so every request creates a new account.
+    user = next(state.user_numbers)
+    email = f"load-{user}@example.com"
+    response = await client.post("/api/v1/auth/register", json={
+        "email": email, "username": f"load{user}", "password": PASSWORD, "role_id": 1,
+    })
+    if response.status_code == 201:
+        state.registered.append(email)
+    return response
+
+
+async def login(client: Any, n: int, state: LoadState) -> Any:
+    response = await client.post("/api/v1/auth/login", data={
+        "username": state.registered[n % len(state.registered)], "password": PASSWORD,
+    })
+    if response.status_code == 200:
+        state.tokens.append(response.json()["access_token"])
+    return response
+
+
+async def list_folders(client: Any, n: int, state: LoadState) -> Any:
+    return await client.get("/api/v1/folders", params={"limit": 50}, headers=state.auth(n))
+
+
+async def list_documents(client: Any, n: int, state: LoadState) -> Any:
+    return await client.get("/api/v1/documents", params={"folder_id": FOLDER_ID, "limit": 50},
+                            headers=state.auth(n))
+
+
+async def search(client: Any, n: int, state: LoadState) -> Any:
+    return await client.get("/api/v1/search", params={"q": "invoice"}, headers=state.auth(n))
+
+
+@dataclass(frozen=True)
+class Scenario:
+    send: Send
+    # The option holding the number of requests per round, and whether
+    # warm-up requests may be sent first (not for scenarios that create state).
+    count_option: str
+    warmup: bool
+
+
+SCENARIOS = {
+    "register": Scenario(register, "users", warmup=False),
+    "login": Scenario(login, "users", warmup=False),
+    "folders": Scenario(list_folders, "requests", warmup=True),
+    "documents": Scenario(list_documents, "requests", warmup=True),
+    "search": Scenario(search, "requests", warmup=True),
+}
+
+
+async def seed(session_factory: Any, documents: int) -> None:
+    async with session_factory() as db:
+        await db.execute(insert(Roles).values(role_id=1, role_name="member"))
+        await db.execute(insert(Actions).values(action_id=1, action_name="view_documents", entity_type="document"))
+        await db.execute(insert(RoleActions).values(role_id=1, action_id=1))
+        await db.execute(insert(Users).values(
+            user_id=1, username="owner", email="owner@example.com", password_hash="x", role_id=1,
+        ))
+        await db.execute(insert(Folders).values(folder_id=FOLDER_ID, folder_name="shared", created_by_user_id=1))
+        await db.execute(insert(Folders), [
+            {"folder_name": f"folder-{n}", "created_by_user_id": 1} for n in range(100)
+        ])
+        if documents:
+            await db.execute(insert(Documents), [
+                {
+                    "filename": f"document-{n}.pdf",
+                    "folder_id": FOLDER_ID,
+                    "uploaded_by_user_id": 1,
+                    "azure_blob_path": f"blobs/{n:064x}",
+                    "mongo_doc_id": f"{n:036d}",
+                }
+                for n in range(documents)
+            ])
+        await db.commit()
+
+
+async def drive(
+    client: Any, scenario: Scenario, count: int, concurrency: int, state: LoadState,
+) -> tuple[dict[str, Any], list[float], list[float]]:
+    """
+    Send `count` requests from `concurrency` workers. Returns their summary,
+    the request latencies and the event-loop lag samples.
+    """
+    latencies: list[float] = []
+    statuses: Counter[int] = Counter()
+    numbers = itertools.count()
+
+    async def worker() -> None:
+        for n in numbers:
+            if n >= count:
+                return
+            started = time.perf_counter()
+            response = await scenario.send(client, n, state)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+
+    gc.collect()
+    stop = asyncio.Event()
+    lag: list[float] = []
+    probe_task = asyncio.create_task(probe(stop, lag))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, count))))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await probe_task
+
+    return {
+        "requests": count,
+        "errors": sum(n for code, n in statuses.items() if code >= 400),
+        "statuses": {str(code): n for code, n in sorted(statuses.items())},
+        "throughput": count / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": max(latencies, default=0.0) * 1000,
+        "lag_p99_ms": percentile(lag, 99) * 1000,
+        "lag_max_ms": max(lag, default=0.0) * 1000,
+    }, latencies, lag
+
+
+async def run(args: argparse.Namespace, directory: str) -> dict[str, dict[str, Any]]:
+    # Settings are read when these are first imported, after `main` has
+    # filled in the load-test environment.
+    import httpx
+
+    from app.core.config import settings
+    from app.core.security import create_access_token
+    from app.db.pool import InstrumentedAsyncPool
+    from app.db.session import AsyncSessionLocal, set_engine
+    from app.main import create_app
+
+    engine = create_standin_engine(
+        os.path.join(directory, "api.db"),
+        connect_latency=args.connect_latency,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.SQL_POOL_SIZE,
+        max_overflow=settings.SQL_POOL_MAX_OVERFLOW,
+        pool_timeout=settings.SQL_POOL_TIMEOUT,
+    )
+    set_engine(engine)
+    await create_schema(engine)
+    await seed(AsyncSessionLocal, args.documents)
+
+    state = LoadState()
+    if "login" not in args.scenarios:
+        state.tokens.append(create_access_token(subject=1, role_id=1))
+
+    app = create_app()
+    results: dict[str, dict[str, Any]] = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name in args.scenarios:
+                scenario = SCENARIOS[name]
+                if scenario.warmup and args.warmup:
+                    await drive(client, scenario, args.warmup, args.concurrency, state)
+
+                count = getattr(args, scenario.count_option)
+                rounds, latencies, lag = [], [], []
+                for _ in range(args.rounds):
+                    result, round_latencies, round_lag = await drive(client, scenario, count, args.concurrency, state)
+                    rounds.append(result)
+                    latencies += round_latencies
+                    lag += round_lag
+                results[name] = result = combine(rounds)
+
+                print(f"{name:<10} {result['throughput']:8.1f} req/s  {summarize_ms(latencies)}")
+                print(f"{'':<10} loop lag {summarize_ms(lag)}")
+                if result["errors"]:
+                    print(f"{'':<10} status counts {result['statuses']}")
+
+    await engine.dispose()
+    return results
+
+
+def combine(rounds: list[dict[str, Any]]) -> dict[str, Any]:
+    """Totals of the counts and the median of every other metric over `rounds`."""
+    statuses: Counter[str] = Counter()
+    for result in rounds:
+        statuses.update(result["statuses"])
+
+    combined = {
+        metric: round(statistics.median(result[metric] for result in rounds), 3)
+        for metric in rounds[0] if metric not in ("requests", "errors", "statuses")
+    }
+    combined["requests"] = sum(result["requests"] for result in rounds)
+    combined["errors"] = sum(result["errors"] for result in rounds)
+    combined["statuses"] = dict(sorted(statuses.items()))
+    return combined
+
+
+def environment() -> dict[str, Any]:
+    return {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()}
+
+
+def options(args: argparse.Namespace) -> dict[str, Any]:
+    return {
+        key: getattr(args, key)
+        for key in ("users", "requests", "rounds", "warmup", "concurrency", "documents", "connect_latency")
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], tolerance: float, min_delta_ms: float) -> int:
+    """Print the change of every compared metric; returns the number of regressions."""
+    if baseline["options"] != current["options"]:
+        print(f"warning: baseline options {baseline['options']} differ from {current['options']}")
+    if baseline["environment"] != current["environment"]:
+        print(f"warning: baseline was recorded on {baseline['environment']}")
+
+    regressions = 0
+    print(f"{'scenario':<10} {'metric':<11} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in current["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            print(f"{name:<10} (not in baseline)")
+            continue
+
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = before[metric], result[metric]
+            change = (new - old) / old if old else 0.0
+            if higher_is_better:
+                regressed = change < -tolerance
+            else:
+                regressed = change > tolerance and new - old > min_delta_ms
+            regressions += regressed
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{name:<10} {metric:<11} {old:>10.2f} {new:>10.2f} {change:>+7.1%}{flag}")
+
+        if result["errors"] > before["errors"]:
+            regressions += 1
+            print(f"{name:<10} {'errors':<11} {before['errors']:>10} {result['errors']:>10}  REGRESSION")
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=5,
+                        help="runs per scenario; the median of each metric is reported (default: 5)")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--documents", type=int, default=1000)
+    parser.add_argument("--connect-latency", type=float, default=0.0)
+    parser.add_argument("--save-baseline", nargs="?", type=Path, const=DEFAULT_BASELINE, metavar="PATH")
+    parser.add_argument("--compare", nargs="?", type=Path, const=DEFAULT_BASELINE, metavar="PATH")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="relative change reported as a regression (default: 0.25)")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0,
+                        help="ignore latency increases smaller than this (default: 5.0)")
+    args = parser.parse_args()
+
+    if "login" in args.scenarios and "register" not in args.scenarios:
+        parser.error("the login scenario needs the register scenario")
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ.setdefault("SEARCH_INDEX_PATH", os.path.join(directory, "search_index.db"))
+        os.environ.setdefault("BLOB_STORAGE_ROOT", os.path.join(directory, "blobs"))
+        for key, value in LOAD_TEST_ENV.items():
+            os.environ.setdefault(key, value)
+
+        scenarios = asyncio.run(run(args, directory))
+
+    current = {"environment": environment(), "options": options(args), "scenarios": scenarios}
+
+    if args.save_baseline:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.save_baseline.write_text(json.dumps(current, indent=2) + "\n")
+        print(f"baseline saved to {args.save_baseline}")
+
+    if args.compare:
+        regressions = compare(json.loads(args.compare.read_text()), current, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f"{regressions} regression(s) against {args.compare}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Bulk folder operations on a large subtree: move, copy, permission reset, delete.
+
+Seeds a SQLite stand-in with a folder tree of `--nodes` folders (each with
+up to `--fanout` children), `--documents` documents spread over it with one
+`Processing_Status` row each, and an individual override on every
+`--override-every`-th folder and document. Then runs the operations of
+`BulkFolderOperations` on the subtree root, `--chunk-size` rows per
+statement, printing for each the wall time, rows per second, how many
+transactions it used and how long the longest one held its locks.
+
+For comparison, a `--baseline-nodes` subtree is deleted the way a naive
+implementation would: one SELECT per folder to find children and
+documents, and one DELETE per row, in a single transaction.
+
+    python -m benchmarks.bench_bulk_folders --nodes 100000 --documents 100000 --chunk-size 1000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from benchmarks._common import summarize_ms
+from benchmarks._sqlite import create_schema, create_standin_engine
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.models import BulkOperations, Documents, Folders, IndividualPermissions, ProcessingStatus, Roles, Users
+from app.schemas.folder import BulkOperationKind
+from app.services.bulk_operations import BulkFolderOperations
+
+TARGET_ID = 1
+SUBTREE_ID = 2
+BATCH = 10_000
+
+
+class TimedSessions:
+    """Session factory recording how long each session (one transaction per chunk) stays open."""
+
+    def __init__(self, factory: async_sessionmaker[AsyncSession]) -> None:
+        self._factory = factory
+        self.durations: list[float] = []
+
+    @asynccontextmanager
+    async def __call__(self) -> AsyncIterator[AsyncSession]:
+        started = time.perf_counter()
+        async with self._factory() as db:
+            yield db
+        self.durations.append(time.perf_counter() - started)
+
+
+async def seed_tree(db: AsyncSession, root_id: int, first_id: int, nodes: int, fanout: int) -> None:
+    """`nodes` folders under `root_id`, numbered breadth first from `first_id`."""
+    rows = [
+        {
+            "folder_id": first_id + n,
+            "folder_name": f"folder-{first_id + n}",
+            "created_by_user_id": 1,
+            "parent_folder_id": root_id if n == 0 else first_id + (n - 1) // fanout,
+        }
+        for n in range(nodes)
+    ]
+    for start in range(0, nodes, BATCH):
+        await db.execute(insert(Folders), rows[start:start + BATCH])
+
+
+async def seed_contents(
+    db: AsyncSession, first_folder: int, folders: int, first_doc: int, documents: int, override_every: int,
+) -> None:
+    for start in range(0, documents, BATCH):
+        doc_ids = range(first_doc + start, first_doc + min(start + BATCH, documents))
+        await db.execute(insert(Documents), [
+            {
+                "doc_id": doc_id,
+                "filename": f"document-{doc_id}.pdf",
+                "folder_id": first_folder + doc_id % folders,
+                "uploaded_by_user_id": 1,
+                "azure_blob_path": f"blobs/{doc_id:064x}",
+                "mongo_doc_id": f"{doc_id:036d}",
+            }
+            for doc_id in doc_ids
+        ])
+        await db.execute(insert(ProcessingStatus), [
+            {"doc_id": doc_id, "stage_name": "ocr", "status": "completed"} for doc_id in doc_ids
+        ])
+
+    overrides = [
+        {"user_id": 1, "action_id": 1, "entity_type": "folder", "entity_id": folder_id, "is_allowed": False}
+        for folder_id in range(first_folder, first_folder + folders, override_every)
+    ] + [
+        {"user_id": 1, "action_id": 1, "entity_type": "document", "entity_id": doc_id, "is_allowed": False}
+        for doc_id in range(first_doc, first_doc + documents, override_every)
+    ]
+    for start in range(0, len(overrides), BATCH):
+        await db.execute(insert(IndividualPermissions), overrides[start:start + BATCH])
+
+
+async def seed(session_factory: async_sessionmaker[AsyncSession], args: argparse.Namespace) -> int:
+    """Seed both subtrees; returns the id of the baseline subtree root."""
+    baseline_root = SUBTREE_ID + args.nodes
+    async with session_factory() as db:
+        await db.execute(insert(Roles).values(role_id=1, role_name="bench"))
+        await db.execute(insert(Users).values(
+            user_id=1, username="bench", email="bench@example.com", password_hash="x", role_id=1,
+        ))
+        await db.execute(insert(Folders), [
+            {"folder_id": TARGET_ID, "folder_name": "archive", "created_by_user_id": 1},
+        ])
+
+        await seed_tree(db, TARGET_ID, SUBTREE_ID, args.nodes, args.fanout)
+        await seed_contents(db, SUBTREE_ID, args.nodes, 1, args.documents, args.override_every)
+
+        baseline_documents = args.documents * args.baseline_nodes // args.nodes
+        await seed_tree(db, TARGET_ID, baseline_root, args.baseline_nodes, args.fanout)
+        await seed_contents(db, baseline_root, args.baseline_nodes, args.documents + 1, baseline_documents,
+                            args.override_every)
+        await db.commit()
+    return baseline_root
+
+
+async def run_operation(
+    operations: BulkFolderOperations,
+    sessions: TimedSessions,
+    session_factory: async_sessionmaker[AsyncSession],
+    operation: BulkOperationKind,
+    folder_id: int,
+    target_folder_id: int | None = None,
+) -> None:
+    async with session_factory() as db:
+        operation_id = (await db.execute(
+            insert(BulkOperations)
+            .values(operation=operation, folder_id=folder_id, target_folder_id=target_folder_id,
+                    requested_by_user_id=1, status="pending")
+            .returning(BulkOperations.operation_id)
+        )).scalar_one()
+        await db.commit()
+
+    sessions.durations.clear()
+    started = time.perf_counter()
+    await operations.run(operation_id, operation, folder_id, target_folder_id)
+    elapsed = time.perf_counter() - started
+
+    async with session_factory() as db:
+        record = await db.get(BulkOperations, operation_id)
+    if record.status != "completed":
+        raise SystemExit(f"{operation} failed: {record.error_message}")
+
+    print(
+        f"{operation:<18} {elapsed:7.2f}s  {record.processed:>7,} rows ({record.processed / elapsed:,.0f}/s)  "
+        f"{len(sessions.durations)} transactions, longest {max(sessions.durations) * 1000:.1f}ms"
+    )
+    print(f"{'':<18} per transaction {summarize_ms(sessions.durations)}")
+
+
+async def naive_delete(session_factory: async_sessionmaker[AsyncSession], folder_id: int) -> None:
+    """Delete a subtree row by row in one transaction, walking it one folder at a time."""
+    rows = 0
+    started = time.perf_counter()
+    async with session_factory() as db:
+        pending, order = [folder_id], []
+        while pending:
+            current = pending.pop()
+            order.append(current)
+            pending.extend((await db.execute(
+                select(Folders.folder_id).where(Folders.parent_folder_id == current)
+            )).scalars())
+
+        for current in reversed(order):
+            doc_ids = (await db.execute(select(Documents.doc_id).where(Documents.folder_id == current))).scalars()
+            for doc_id in doc_ids.all():
+                for statement in (
+                    delete(ProcessingStatus).where(ProcessingStatus.doc_id == doc_id),
+                    delete(IndividualPermissions).where(IndividualPermissions.entity_type == "document",
+                                                        IndividualPermissions.entity_id == doc_id),
+                    delete(Documents).where(Documents.doc_id == doc_id),
+                ):
+                    rows += (await db.execute(statement)).rowcount
+            for statement in (
+                delete(IndividualPermissions).where(IndividualPermissions.entity_type == "folder",
+                                                    IndividualPermissions.entity_id == current),
+                delete(Folders).where(Folders.folder_id == current),
+            ):
+                rows += (await db.execute(statement)).rowcount
+        await db.commit()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"{'naive delete':<18} {elapsed:7.2f}s  {len(order):>7,} folders, {rows:,} rows "
+        f"({len(order) / elapsed:,.0f} folders/s)  1 transaction, longest {elapsed * 1000:.1f}ms"
+    )
+
+
+async def run(args: argparse.Namespace, path: str) -> None:
+    engine = create_standin_engine(path)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    await create_schema(engine)
+
+    started = time.perf_counter()
+    baseline_root = await seed(session_factory, args)
+    print(
+        f"seeded {args.nodes + args.baseline_nodes:,} folders and "
+        f"{args.documents + args.documents * args.baseline_nodes // args.nodes:,} documents "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+
+    sessions = TimedSessions(session_factory)
+    operations = BulkFolderOperations(sessions, chunk_size=args.chunk_size)  # type: ignore[arg-type]
+
+    # Moving under a folder outside the subtree makes the cycle check walk all of it.
+    await run_operation(operations, sessions, session_factory, BulkOperationKind.MOVE, SUBTREE_ID, baseline_root)
+    await run_operation(operations, sessions, session_factory, BulkOperationKind.COPY, SUBTREE_ID, TARGET_ID)
+    await run_operation(operations, sessions, session_factory, BulkOperationKind.RESET_PERMISSIONS, SUBTREE_ID)
+    await run_operation(operations, sessions, session_factory, BulkOperationKind.DELETE, SUBTREE_ID)
+
+    if args.baseline_nodes:
+        await naive_delete(session_factory, baseline_root)
+
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--fanout", type=int, default=10)
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument("--override-every", type=int, default=10)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--baseline-nodes", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(run(args, os.path.join(directory, "bulk.db")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Authorization throughput of `get_current_user`, cached vs uncached.
+
+The uncached run clears both caches before every call, so each request pays
+for a JWT decode plus a user lookup; the lookup goes to a stand-in session
+that sleeps for `--db-latency` seconds to mimic a SQL Server round trip.
+
+    python -m benchmarks.bench_current_user --requests 5000 --users 500
+"""
+import argparse
+import asyncio
+import datetime
+import time
+
+from benchmarks._common import summarize_ms
+
+from app.api.deps import get_current_user
+from app.core.security import create_access_token
+from app.models.models import Users
+from app.services.auth_cache import token_cache, user_cache
+
+
+class StandInSession:
+    """Answers `get(Users, id)` after a simulated round trip."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    async def get(self, model: type[Users], user_id: int) -> Users:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return Users(
+            user_id=user_id,
+            username=f"user_{user_id}",
+            email=f"user{user_id}@example.com",
+            password_hash="x",
+            role_id=1,
+            created_at=datetime.datetime(2026, 1, 1),
+        )
+
+
+async def run(label: str, tokens: list[str], requests: int, db: StandInSession, cached: bool) -> None:
+    token_cache.clear()
+    user_cache.clear()
+    samples: list[float] = []
+
+    started = time.perf_counter()
+    for i in range(requests):
+        if not cached:
+            token_cache.clear()
+            user_cache.clear()
+        t0 = time.perf_counter()
+        await get_current_user(tokens[i % len(tokens)], db)  # type: ignore[arg-type]
+        samples.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+
+    print(f"[{label:>8}] {requests / elapsed:,.0f} req/s  {summarize_ms(samples)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--db-latency", type=float, default=0.001)
+    args = parser.parse_args()
+
+    tokens = [create_access_token(subject=i, role_id=1) for i in range(1, args.users + 1)]
+    db = StandInSession(args.db_latency)
+
+    asyncio.run(run("uncached", tokens, args.requests, db, cached=False))
+    asyncio.run(run("cached", tokens, args.requests, db, cached=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Load-test harness for the SQL connection pool against a SQLite stand-in.
+
+Every new connection is delayed by `--connect-latency` to mimic ODBC setup
+against SQL Server, and each simulated request holds its connection for
+`--query-latency`. Runs once cold and once after warming the pool, printing
+request latency, checkout timeouts and the checkout-wait histogram.
+
+    python -m benchmarks.bench_db_pool --requests 2000 --concurrency 64 --pool-size 10
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks._common import summarize_ms
+from benchmarks._sqlite import create_standin_engine
+
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.db.pool import InstrumentedAsyncPool, pool_stats
+
+
+async def warm(engine: AsyncEngine, connections: int) -> None:
+    opened = await asyncio.gather(*(engine.connect().start() for _ in range(connections)))
+    for conn in opened:
+        await conn.close()
+
+
+async def run(label: str, args: argparse.Namespace, path: str, warmup: int) -> None:
+    engine = create_standin_engine(
+        path,
+        connect_latency=args.connect_latency,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=args.pool_size,
+        max_overflow=args.max_overflow,
+        pool_timeout=args.timeout,
+        pool_pre_ping=args.pre_ping,
+    )
+
+    warm_started = time.perf_counter()
+    if warmup:
+        await warm(engine, warmup)
+    warm_elapsed = time.perf_counter() - warm_started
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: list[float] = []
+    timeouts = 0
+
+    async def one_request() -> None:
+        nonlocal timeouts
+        async with semaphore:
+            t0 = time.perf_counter()
+            try:
+                async with engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+                    await asyncio.sleep(args.query_latency)
+            except exc.TimeoutError:
+                timeouts += 1
+                return
+            latencies.append(time.perf_counter() - t0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_request() for _ in range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    stats = pool_stats(engine)
+    await engine.dispose()
+
+    print(f"[{label}] warmup={warmup} ({warm_elapsed * 1000:.0f}ms)  "
+          f"throughput={len(latencies) / elapsed:,.0f} req/s  timeouts={timeouts}")
+    print(f"    request latency: {summarize_ms(latencies)}")
+    print(f"    pool: size={stats['size']} checked_out={stats['checked_out']} "
+          f"overflow={stats['overflow']} checkouts={stats['checkout_count']}")
+    previous = 0
+    for bound, count in stats["checkout_wait_buckets"]:
+        if count != previous:
+            print(f"      wait <= {bound * 1000:>7.1f}ms: {count}")
+        previous = count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--max-overflow", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=5.0)
+    parser.add_argument("--pre-ping", action="store_true")
+    parser.add_argument("--connect-latency", type=float, default=0.05)
+    parser.add_argument("--query-latency", type=float, default=0.005)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "pool.db")
+        asyncio.run(run("cold", args, path, warmup=0))
+        asyncio.run(run("warm", args, path, warmup=args.pool_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Document listing benchmark: OFFSET vs keyset pagination, and NDJSON streaming.
+
+Seeds one folder with `--documents` rows in a SQLite stand-in, then times
+fetching page 1 and page `--page` with both OFFSET and the keyset query used
+by `GET /api/v1/documents`. Finally streams the whole folder through
+`stream_ndjson` and compares its peak Python memory with loading every row.
+
+    python -m benchmarks.bench_listing --documents 100000 --page 1000 --limit 50
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from benchmarks._common import summarize_ms
+from benchmarks._sqlite import create_schema, create_standin_engine
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.responses import dumps
+from app.models.models import Documents, Folders, Roles, Users
+from app.services.listing import SortKey, document_list_query, row_dicts, stream_ndjson
+
+FOLDER_ID = 1
+
+
+async def seed(session_factory: async_sessionmaker[AsyncSession], documents: int) -> None:
+    async with session_factory() as db:
+        await db.execute(insert(Roles).values(role_id=1, role_name="bench"))
+        await db.execute(insert(Users).values(
+            user_id=1, username="bench", email="bench@example.com", password_hash="x", role_id=1,
+        ))
+        await db.execute(insert(Folders).values(folder_id=FOLDER_ID, folder_name="bench", created_by_user_id=1))
+
+        # Several documents share each timestamp, as batch uploads do.
+        start = datetime(2025, 1, 1)
+        for offset in range(0, documents, 10_000):
+            await db.execute(insert(Documents), [
+                {
+                    "filename": f"document-{n}.pdf",
+                    "folder_id": FOLDER_ID,
+                    "uploaded_by_user_id": 1,
+                    "azure_blob_path": f"blobs/{n:064x}",
+                    "mongo_doc_id": f"{n:036d}",
+                    "uploaded_at": start + timedelta(seconds=n // 4),
+                }
+                for n in range(offset, min(offset + 10_000, documents))
+            ])
+        await db.commit()
+
+
+async def time_query(session_factory: async_sessionmaker[AsyncSession], query, repeats: int) -> list[float]:
+    samples = []
+    async with session_factory() as db:
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            rows = (await db.execute(query)).all()
+            samples.append(time.perf_counter() - t0)
+    assert rows
+    return samples
+
+
+async def measure_memory(session_factory: async_sessionmaker[AsyncSession]) -> tuple[int, int, int]:
+    async with session_factory() as db:
+        tracemalloc.start()
+        streamed = 0
+        async for chunk in stream_ndjson(db, document_list_query(FOLDER_ID)):
+            streamed += len(chunk)
+        _, stream_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        rows = (await db.execute(document_list_query(FOLDER_ID))).all()
+        body = b"\n".join(dumps(row) for row in row_dicts(rows))
+        _, load_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del rows, body
+
+    return streamed, stream_peak, load_peak
+
+
+async def run(args: argparse.Namespace, path: str) -> None:
+    engine = create_standin_engine(path)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    await create_schema(engine)
+
+    t0 = time.perf_counter()
+    await seed(session_factory, args.documents)
+    print(f"seeded {args.documents:,} documents in {time.perf_counter() - t0:.1f}s")
+
+    skip = (args.page - 1) * args.limit
+    if args.page < 2 or skip >= args.documents:
+        raise SystemExit("--page must be between 2 and the last page of the folder")
+
+    # The cursor a client would hold after reading `page - 1` pages.
+    async with session_factory() as db:
+        last = (await db.execute(document_list_query(FOLDER_ID).offset(skip - 1).limit(1))).one()
+    cursor: SortKey = (last.uploaded_at, last.doc_id)
+
+    cases = {
+        "offset  page 1": document_list_query(FOLDER_ID).limit(args.limit),
+        f"offset  page {args.page}": document_list_query(FOLDER_ID).offset(skip).limit(args.limit),
+        "keyset  page 1": document_list_query(FOLDER_ID, limit=args.limit),
+        f"keyset  page {args.page}": document_list_query(FOLDER_ID, cursor, args.limit),
+    }
+    for label, query in cases.items():
+        print(f"{label:<18} {summarize_ms(await time_query(session_factory, query, args.repeats))}")
+
+    streamed, stream_peak, load_peak = await measure_memory(session_factory)
+    print(f"stream all   {streamed / 2**20:.1f} MiB NDJSON, peak Python memory {stream_peak / 2**20:.1f} MiB")
+    print(f"load all     peak Python memory {load_peak / 2**20:.1f} MiB")
+
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(run(args, os.path.join(directory, "listing.db")))
+
+
+if __name__ == "__main__":
+    main()
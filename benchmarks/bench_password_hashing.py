@@ -0,0 +1,84 @@
+"""
+Event-loop latency while logins are flooding.
+
+A probe coroutine plays the part of an unrelated endpoint: every few
+milliseconds it measures how late the loop wakes it up. Meanwhile a burst of
+simulated logins verifies bcrypt hashes, either inline on the event loop (the
+old behaviour) or through `PasswordHasher`.
+
+    python -m benchmarks.bench_password_hashing --logins 200 --concurrency 50
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks._common import probe, summarize_ms
+
+from app.core.security import hash_password, verify_password
+from app.services.password_hasher import PasswordHasher, PasswordHasherBusy
+
+
+async def flood(verify, logins: int, concurrency: int, hashed: str) -> tuple[int, int]:
+    semaphore = asyncio.Semaphore(concurrency)
+    rejected = 0
+
+    async def one_login() -> None:
+        nonlocal rejected
+        async with semaphore:
+            try:
+                await verify("20-Na$$aQ-26", hashed)
+            except PasswordHasherBusy:
+                rejected += 1
+
+    await asyncio.gather(*(one_login() for _ in range(logins)))
+    return logins - rejected, rejected
+
+
+async def run(mode: str, args: argparse.Namespace, hashed: str) -> None:
+    if mode == "inline":
+        async def verify(plain: str, hashed_password: str) -> bool:
+            return verify_password(plain, hashed_password)
+        hasher = None
+    else:
+        hasher = PasswordHasher(
+            executor_kind=mode, max_workers=args.workers, max_pending=args.max_pending
+        )
+        verify = hasher.verify
+
+    stop = asyncio.Event()
+    samples: list[float] = []
+    probe_task = asyncio.create_task(probe(stop, samples))
+
+    started = time.perf_counter()
+    accepted, rejected = await flood(verify, args.logins, args.concurrency, hashed)
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await probe_task
+    if hasher is not None:
+        hasher.shutdown()
+
+    print(
+        f"[{mode:>7}] logins={accepted} rejected={rejected} "
+        f"login_rate={accepted / elapsed:.1f}/s"
+    )
+    print(f"          probe lag: {summarize_ms(samples)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-pending", type=int, default=64)
+    parser.add_argument("--modes", nargs="+", default=["inline", "thread", "process"],
+                        choices=["inline", "thread", "process"])
+    args = parser.parse_args()
+
+    hashed = hash_password("20-Na$$aQ-26")
+    for mode in args.modes:
+        asyncio.run(run(mode, args, hashed))
+
+
+if __name__ == "__main__":
+    main()
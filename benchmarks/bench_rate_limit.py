@@ -0,0 +1,99 @@
+"""
+Cost of the login rate limiter, and CPU use during a password-guessing attack.
+
+First times `LoginRateLimiter.check` on its own, for attempts that are
+rejected (one attacker hammering one account) and for attempts that are
+counted (a stream of distinct IPs, which also exercises eviction).
+
+Then it replays an attack: `--attempts` logins for a single account spread
+over `--attackers` IPs, `--concurrency` at a time. Every attempt that gets
+past the limiter runs a real bcrypt verification on `PasswordHasher`, as
+`login` would. The run is repeated without and with the limiter, printing
+wall time, process CPU time and how many bcrypt checks ran.
+
+    python -m benchmarks.bench_rate_limit --attempts 200 --attackers 50
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks._common import summarize_ms
+
+from app.core.security import hash_password
+from app.services.password_hasher import PasswordHasher
+from app.services.rate_limit import InMemoryRateLimitBackend, LoginRateLimiter, RateLimited
+
+
+async def time_checks(label: str, limiter: LoginRateLimiter, attempts: list[tuple[str, str]]) -> None:
+    samples: list[float] = []
+    for ip, account in attempts:
+        started = time.perf_counter()
+        try:
+            await limiter.check(ip, account)
+        except RateLimited:
+            pass
+        samples.append(time.perf_counter() - started)
+
+    mean_us = sum(samples) / len(samples) * 1e6
+    print(f"[check {label:>8}] mean={mean_us:.2f}us {summarize_ms(samples)} rejected={limiter.rejected}")
+
+
+async def attack(limiter: LoginRateLimiter | None, args: argparse.Namespace, hashed: str) -> None:
+    hasher = PasswordHasher("thread", max_workers=args.workers, max_pending=args.attempts)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    verified = 0
+    rejected = 0
+
+    async def one_attempt(n: int) -> None:
+        nonlocal verified, rejected
+        async with semaphore:
+            if limiter is not None:
+                try:
+                    await limiter.check(f"10.0.{n % args.attackers // 256}.{n % args.attackers % 256}", "victim@example.com")
+                except RateLimited:
+                    rejected += 1
+                    return
+            await hasher.verify("guess-0000!", hashed)
+            verified += 1
+
+    wall_started = time.perf_counter()
+    cpu_started = time.process_time()
+    await asyncio.gather(*(one_attempt(n) for n in range(args.attempts)))
+    cpu = time.process_time() - cpu_started
+    wall = time.perf_counter() - wall_started
+    hasher.shutdown()
+
+    label = "limited" if limiter is not None else "open"
+    print(
+        f"[attack {label:>7}] {args.attempts} attempts in {wall:.2f}s, cpu={cpu:.2f}s "
+        f"({cpu / args.attempts * 1000:.1f}ms per attempt), bcrypt runs={verified}, rejected={rejected}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--checks", type=int, default=100_000)
+    parser.add_argument("--attempts", type=int, default=200)
+    parser.add_argument("--attackers", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--per-ip", type=int, default=20)
+    parser.add_argument("--per-account", type=int, default=5)
+    args = parser.parse_args()
+
+    def limiter() -> LoginRateLimiter:
+        return LoginRateLimiter(InMemoryRateLimitBackend(maxsize=10_000), per_ip=args.per_ip,
+                                per_account=args.per_account)
+
+    asyncio.run(time_checks("rejected", limiter(), [("10.0.0.1", "victim@example.com")] * args.checks))
+    asyncio.run(time_checks("counted", limiter(), [
+        (f"10.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}", f"user{n}@example.com") for n in range(args.checks)
+    ]))
+
+    hashed = hash_password("20-Na$$aQ-26")
+    asyncio.run(attack(None, args, hashed))
+    asyncio.run(attack(limiter(), args, hashed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Full-text search benchmark on a synthetic corpus.
+
+Indexes `--documents` generated documents (Zipf-distributed vocabulary,
+spread over folders and uploaders) into a fresh `SQLiteSearchIndex` in
+batches the size of the processing pipeline's index stage, then runs random
+one- and two-term queries unfiltered, restricted to a folder subtree and
+restricted to an uploader.
+
+    python -m benchmarks.bench_search --documents 100000 --queries 500
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import tempfile
+import time
+
+from benchmarks._common import summarize_ms
+
+from app.services.search import IndexedDocument, SQLiteSearchIndex, search_visible
+
+SYLLABLES = ["ka", "ri", "mo", "sa", "tu", "na", "le", "do", "qa", "zi", "fa", "hu", "be", "lo", "ya"]
+
+
+def build_vocabulary(size: int, rng: random.Random) -> list[str]:
+    words: set[str] = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    return sorted(words)
+
+
+def corpus(args: argparse.Namespace, vocabulary: list[str], rng: random.Random):
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+    for doc_id in range(1, args.documents + 1):
+        words = rng.choices(vocabulary, cum_weights=weights, k=args.words)
+        yield IndexedDocument(
+            doc_id=doc_id,
+            folder_id=rng.randrange(args.folders),
+            uploaded_by_user_id=rng.randrange(args.uploaders),
+            filename=f"{words[0]}-{doc_id}.pdf",
+            text=" ".join(words),
+        )
+
+
+async def run_queries(index: SQLiteSearchIndex, queries: list[str], **filters) -> list[float]:
+    samples = []
+    for query in queries:
+        t0 = time.perf_counter()
+        await search_visible(index, query, lambda hits: hits, limit=20, **filters)
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+async def run(args: argparse.Namespace, path: str) -> None:
+    rng = random.Random(args.seed)
+    vocabulary = build_vocabulary(args.vocabulary, rng)
+    index = SQLiteSearchIndex(path)
+
+    # Only the index calls are timed, not generating the corpus.
+    elapsed = 0.0
+    documents = corpus(args, vocabulary, rng)
+    while batch := list(itertools.islice(documents, args.batch_size)):
+        t0 = time.perf_counter()
+        await index.index(batch)
+        elapsed += time.perf_counter() - t0
+    print(f"indexed {args.documents:,} documents in {elapsed:.1f}s "
+          f"({args.documents / elapsed:,.0f} docs/s, {os.path.getsize(path) / 2**20:.0f} MiB)")
+
+    # Skip the handful of stop-word-like head terms nobody searches for.
+    searchable = vocabulary[20:2000]
+    queries = [" ".join(rng.sample(searchable, rng.randint(1, 2))) for _ in range(args.queries)]
+    subtree = rng.sample(range(args.folders), max(1, args.folders // 20))
+
+    print(f"unfiltered   {summarize_ms(await run_queries(index, queries))}")
+    print(f"folder tree  {summarize_ms(await run_queries(index, queries, folder_ids=subtree))}")
+    print(f"uploader     {summarize_ms(await run_queries(index, queries, uploaded_by=0))}")
+
+    await index.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument("--words", type=int, default=200, help="words per document")
+    parser.add_argument("--vocabulary", type=int, default=30_000)
+    parser.add_argument("--folders", type=int, default=1_000)
+    parser.add_argument("--uploaders", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(run(args, os.path.join(directory, "search.db")))
+
+
+if __name__ == "__main__":
+    main()
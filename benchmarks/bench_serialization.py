@@ -0,0 +1,123 @@
+"""
+Response serialization cost: validated models vs trusted rows.
+
+Both endpoints serve the same pre-fetched `DocumentPage` rows, so only the
+response path is measured:
+
+* `validated` builds `DocumentItem`s from the rows and lets FastAPI validate
+  the page again against `response_model` before dumping it (the old path).
+* `trusted` turns the row tuples into dicts and returns a
+  `TimedJSONResponse`, encoded by orjson without any validation.
+
+The ASGI app is called directly, without an HTTP client, for each payload
+size in `--items`.
+
+    python -m benchmarks.bench_serialization --items 1 10000
+"""
+import argparse
+import asyncio
+import datetime
+import time
+
+from benchmarks._common import summarize_ms
+from benchmarks._sqlite import adapt_metadata_for_sqlite
+
+from fastapi import FastAPI
+from sqlalchemy import create_engine, insert
+
+from app.core.responses import TimedJSONResponse
+from app.models.models import Documents
+from app.schemas.document import DocumentItem, DocumentPage
+from app.services.listing import document_list_query, row_dicts
+
+
+def fetch_rows(items: int) -> list:
+    """`items` rows of the document listing query, read from an in-memory SQLite table."""
+    adapt_metadata_for_sqlite()
+    engine = create_engine("sqlite://")
+    Documents.__table__.create(engine)
+    started = datetime.datetime(2026, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(Documents), [
+            {
+                "filename": f"scan-{n:06d}.pdf",
+                "folder_id": 1,
+                "uploaded_by_user_id": 1 + n % 50,
+                "azure_blob_path": f"blobs/{n}",
+                "mongo_doc_id": f"{n:024x}",
+                "uploaded_at": started + datetime.timedelta(seconds=n),
+            }
+            for n in range(items)
+        ])
+        rows = conn.execute(document_list_query(1, limit=items)).all()
+    engine.dispose()
+    return rows
+
+
+def build_app(rows: list) -> FastAPI:
+    app = FastAPI(default_response_class=TimedJSONResponse)
+
+    @app.get("/validated", response_model=DocumentPage)
+    async def validated():
+        return DocumentPage(items=[DocumentItem.model_validate(row._mapping) for row in rows], next_cursor=None)
+
+    @app.get("/trusted", response_model=DocumentPage)
+    async def trusted():
+        return TimedJSONResponse({"items": row_dicts(rows), "next_cursor": None})
+
+    return app
+
+
+async def call(app: FastAPI, path: str) -> bytes:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": [], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    body = bytearray()
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return bytes(body)
+
+
+async def run(items: int, requests: int) -> None:
+    app = build_app(fetch_rows(items))
+
+    # Warm up route matching and pydantic's validators, and check both
+    # paths produce the same document.
+    assert await call(app, "/validated") == await call(app, "/trusted")
+
+    results = {}
+    for path in ("/validated", "/trusted"):
+        samples: list[float] = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            await call(app, path)
+            samples.append(time.perf_counter() - started)
+        results[path] = samples
+        print(f"[{items:>6} items {path[1:]:>9}] {summarize_ms(samples)}")
+
+    speedup = sum(results["/validated"]) / sum(results["/trusted"])
+    print(f"[{items:>6} items   speedup] {speedup:.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, nargs="+", default=[1, 10_000])
+    parser.add_argument("--requests", type=int, default=0,
+                        help="Requests per path; by default 2000 for small payloads and 50 for large ones")
+    args = parser.parse_args()
+
+    for items in args.items:
+        asyncio.run(run(items, args.requests or (2000 if items <= 100 else 50)))
+
+
+if __name__ == "__main__":
+    main()
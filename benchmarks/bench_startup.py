@@ -0,0 +1,92 @@
+"""
+Import-time budget for the application entry point.
+
+Imports `--module` (default `app.main`) in a fresh interpreter under
+`python -X importtime`, prints the total and the slowest modules, and exits
+non-zero if the import takes longer than `--budget-ms` (best of `--runs`) or
+pulls in any module that is meant to load only in the lifespan hook or on
+first use.
+
+    python -m benchmarks.bench_startup --budget-ms 600
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+import benchmarks._common  # noqa: F401  (placeholder settings for the child process)
+
+# Modules that importing `app.main` must not load.
+DEFERRED_MODULES = (
+    "sqlalchemy",
+    "jose",
+    "bcrypt",
+    "pymongo",
+    "motor",
+    "app.models.models",
+    "app.db.session",
+    "app.api.v1.api",
+)
+
+_IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_times(module: str) -> dict[str, tuple[int, int]]:
+    """Self and cumulative import time in microseconds for every module loaded by `import module`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=os.environ.copy(),
+        check=False,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"importing {module} failed")
+
+    times: dict[str, tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            times[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--budget-ms", type=float, default=600.0)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(args.runs)]
+    best = min(runs, key=lambda times: times[args.module][1])
+    total_ms = best[args.module][1] / 1000
+
+    print(f"import {args.module}: {total_ms:.1f}ms (best of {args.runs}), {len(best)} modules")
+    print(f"{'self ms':>9} {'cumul ms':>9}  module")
+    for name, (own, cumulative) in sorted(best.items(), key=lambda item: item[1][0], reverse=True)[:args.top]:
+        print(f"{own / 1000:>9.1f} {cumulative / 1000:>9.1f}  {name}")
+
+    failures = []
+    if total_ms > args.budget_ms:
+        failures.append(f"import took {total_ms:.1f}ms, budget is {args.budget_ms:.0f}ms")
+    if args.module == "app.main":
+        loaded = [
+            name for name in best
+            if any(name == deferred or name.startswith(deferred + ".") for deferred in DEFERRED_MODULES)
+        ]
+        if loaded:
+            failures.append("loaded at import time: " + ", ".join(sorted(loaded)))
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Memory and throughput of the streaming upload pipeline.
+
+Runs `--concurrency` simultaneous uploads of `--size-mb` each through
+`store_stream` into a `LocalBlobStorage` in a temporary directory. The
+incoming body arrives in small, irregular pieces, as it would from an ASGI
+server. Peak RSS growth should stay around `concurrency * chunk size`
+regardless of the upload size.
+
+    python -m benchmarks.bench_upload --size-mb 2048 --concurrency 4
+"""
+import argparse
+import asyncio
+import os
+import resource
+import tempfile
+import time
+
+from benchmarks._common import summarize_ms
+
+from app.services.storage import LocalBlobStorage
+from app.services.uploads import store_stream
+
+BODY_PIECE = 64 * 1024 + 17
+
+
+def max_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def body(upload_index: int, size: int, pattern: bytes):
+    """Yield `size` bytes in ASGI-sized pieces; content differs per upload."""
+    yield upload_index.to_bytes(8, "big")
+    sent = 8
+    while sent < size:
+        piece = pattern[: min(BODY_PIECE, size - sent)]
+        sent += len(piece)
+        yield piece
+        await asyncio.sleep(0)
+
+
+async def run(args: argparse.Namespace, root: str) -> None:
+    storage = LocalBlobStorage(root)
+    size = args.size_mb * 1024 * 1024
+    pattern = os.urandom(BODY_PIECE)
+    durations: list[float] = []
+
+    async def one_upload(index: int) -> None:
+        t0 = time.perf_counter()
+        await store_stream(body(index, size, pattern), storage, chunk_size=args.chunk_kb * 1024)
+        durations.append(time.perf_counter() - t0)
+
+    rss_before = max_rss_mb()
+    started = time.perf_counter()
+    await asyncio.gather(*(one_upload(i) for i in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    rss_after = max_rss_mb()
+
+    total_mb = args.size_mb * args.concurrency
+    print(f"uploads={args.concurrency} x {args.size_mb} MiB  chunk={args.chunk_kb} KiB")
+    print(f"throughput={total_mb / elapsed:,.1f} MiB/s  elapsed={elapsed:.2f}s")
+    print(f"peak RSS growth={rss_after - rss_before:.1f} MiB (peak {rss_after:.1f} MiB)")
+    print(f"per-upload: {summarize_ms(durations)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=512)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--chunk-kb", type=int, default=1024)
+    parser.add_argument("--dir", default=None, help="Directory for blobs (defaults to a temp dir)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as root:
+        asyncio.run(run(args, root))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+-- 0001: bulk folder operations and the cleanup outbox of deleted documents.
+--
+-- `Bulk_Operations` records the progress of folder moves, copies, deletes
+-- and permission resets (app/services/bulk_operations.py). `Document_Cleanup`
+-- holds deleted documents whose search index / Mongo cleanup has not
+-- succeeded yet. Both are read at startup; until they exist the server logs
+-- a warning and skips that work.
+--
+-- Idempotent; apply with `sqlcmd -S <server> -d <database> -i migrations/0001_bulk_operations.sql`.
+
+IF OBJECT_ID(N'dbo.Bulk_Operations', N'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.Bulk_Operations (
+        operation_id BIGINT IDENTITY(1, 1) NOT NULL,
+        operation VARCHAR(30) COLLATE SQL_Latin1_General_CP1_CI_AS NOT NULL,
+        folder_id INT NOT NULL,
+        requested_by_user_id INT NOT NULL,
+        status VARCHAR(20) COLLATE SQL_Latin1_General_CP1_CI_AS NOT NULL,
+        total INT NOT NULL CONSTRAINT DF_Bulk_Operations_Total DEFAULT ((0)),
+        processed INT NOT NULL CONSTRAINT DF_Bulk_Operations_Processed DEFAULT ((0)),
+        start_time DATETIME NOT NULL CONSTRAINT DF_Bulk_Operations_Start DEFAULT (getdate()),
+        target_folder_id INT NULL,
+        end_time DATETIME NULL,
+        error_message NVARCHAR(MAX) COLLATE SQL_Latin1_General_CP1_CI_AS NULL,
+        CONSTRAINT PK_Bulk_Operations PRIMARY KEY (operation_id),
+        CONSTRAINT FK_BulkOp_User FOREIGN KEY (requested_by_user_id) REFERENCES dbo.Users (user_id)
+    );
+END;
+GO
+
+IF OBJECT_ID(N'dbo.Document_Cleanup', N'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.Document_Cleanup (
+        doc_id BIGINT NOT NULL,
+        mongo_doc_id VARCHAR(36) COLLATE SQL_Latin1_General_CP1_CI_AS NOT NULL,
+        deleted_at DATETIME NOT NULL CONSTRAINT DF_Document_Cleanup_Deleted DEFAULT (getdate()),
+        CONSTRAINT PK_Document_Cleanup PRIMARY KEY (doc_id)
+    );
+END;
+GO
@@ -0,0 +1,25 @@
+-- 0002: indexes behind keyset listings, subtree operations and permission overrides.
+--
+-- IX_Documents_Folder_Uploaded / IX_Folders_Parent_Created let the keyset
+-- pagination in app/services/listing.py seek straight to a page of a folder
+-- (newest first, read backwards) instead of scanning and sorting it.
+-- IX_ProcStatus_Doc and IX_IndPerm_Entity serve the per-document status
+-- lookups and the per-entity override deletes of bulk folder operations.
+--
+-- Idempotent; apply with `sqlcmd -S <server> -d <database> -i migrations/0002_indexes.sql`.
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = N'IX_Documents_Folder_Uploaded' AND object_id = OBJECT_ID(N'dbo.Documents'))
+    CREATE INDEX IX_Documents_Folder_Uploaded ON dbo.Documents (folder_id, uploaded_at, doc_id);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = N'IX_Folders_Parent_Created' AND object_id = OBJECT_ID(N'dbo.Folders'))
+    CREATE INDEX IX_Folders_Parent_Created ON dbo.Folders (parent_folder_id, created_at, folder_id);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = N'IX_ProcStatus_Doc' AND object_id = OBJECT_ID(N'dbo.Processing_Status'))
+    CREATE INDEX IX_ProcStatus_Doc ON dbo.Processing_Status (doc_id);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = N'IX_IndPerm_Entity' AND object_id = OBJECT_ID(N'dbo.Individual_Permissions'))
+    CREATE INDEX IX_IndPerm_Entity ON dbo.Individual_Permissions (entity_type, entity_id);
+GO
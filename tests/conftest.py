@@ -0,0 +1,5 @@
+"""
+Tests run without a `.env`; the benchmark helpers provide placeholder
+settings for the required fields before anything under `app` is imported.
+"""
+import benchmarks._common  # noqa: F401
@@ -0,0 +1,19 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_app_main_import_stays_within_budget():
+    """`benchmarks.bench_startup` fails on an import over budget or on eagerly loaded deferred modules."""
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--budget-ms", "600", "--runs", "3"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+        check=False,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert result.stdout.rstrip().endswith("OK")
@@ -0,0 +1,115 @@
+import asyncio
+import hashlib
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+from sqlalchemy import insert
+
+from benchmarks._sqlite import create_schema, create_standin_engine
+
+from app.api.deps import get_current_user
+from app.db.session import AsyncSessionLocal, set_engine
+from app.main import app
+from app.models.models import Actions, Folders, RoleActions, Roles, Users
+from app.schemas.user import UserResponse
+from app.services.folder_tree import folder_tree
+from app.services.permissions import permission_engine
+from app.services.search import search_index
+from app.services.storage import LocalBlobStorage, get_blob_storage
+from app.services.uploads import blob_path_for, store_stream
+
+FOLDER_ID = 1
+
+
+async def pieces(data: bytes, sizes: list[int]) -> AsyncIterator[bytes]:
+    """`data` split into pieces of the given sizes, cycling through them."""
+    start = 0
+    while start < len(data):
+        size = sizes[start % len(sizes)]
+        yield data[start:start + size]
+        start += size
+
+
+def stored_files(root: Path) -> list[Path]:
+    return [path for path in root.rglob("*") if path.is_file()]
+
+
+def test_store_stream_hashes_chunked_writes(tmp_path):
+    data = bytes(range(256)) * 1000 + b"tail"
+    storage = LocalBlobStorage(tmp_path)
+
+    blob = asyncio.run(store_stream(pieces(data, [1, 4095, 7, 65536, 0, 13]), storage, chunk_size=1000))
+
+    assert blob.content_hash == hashlib.sha256(data).hexdigest()
+    assert blob.size == len(data)
+    assert not blob.deduplicated
+    assert blob.path == blob_path_for(blob.content_hash)
+    assert (tmp_path / blob.path).read_bytes() == data
+    assert stored_files(tmp_path) == [tmp_path / blob.path]
+
+
+@asynccontextmanager
+async def api_client(tmp_path: Path) -> AsyncIterator[httpx.AsyncClient]:
+    """The app on a SQLite stand-in, as a user allowed to upload into `FOLDER_ID`, storing blobs under `tmp_path/blobs`."""
+    engine = create_standin_engine(str(tmp_path / "db.sqlite"))
+    set_engine(engine)
+    await create_schema(engine)
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(Roles).values(role_id=1, role_name="uploader"))
+        await db.execute(insert(Users).values(
+            user_id=1, username="uploader", email="uploader@example.com", password_hash="x", role_id=1,
+        ))
+        await db.execute(insert(Actions).values(action_id=1, action_name="upload_documents", entity_type="folder"))
+        await db.execute(insert(RoleActions).values(role_id=1, action_id=1))
+        await db.execute(insert(Folders).values(folder_id=FOLDER_ID, folder_name="inbox", created_by_user_id=1))
+        await db.commit()
+
+    folder_tree.loaded = False
+    permission_engine.loaded = False
+    search_index.path = str(tmp_path / "search.db")
+    storage = LocalBlobStorage(tmp_path / "blobs")
+    app.dependency_overrides[get_blob_storage] = lambda: storage
+    app.dependency_overrides[get_current_user] = lambda: UserResponse(
+        user_id=1, username="uploader", email="uploader@example.com", role_id=1, created_at=datetime.now(),
+    )
+    try:
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                yield client
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_reupload_is_deduplicated(tmp_path):
+    async def scenario() -> tuple[httpx.Response, httpx.Response]:
+        async with api_client(tmp_path) as client:
+            params = {"folder_id": FOLDER_ID, "filename": "report.pdf"}
+            first = await client.post("/api/v1/documents/upload", params=params, content=b"%PDF report" * 1000)
+            second = await client.post("/api/v1/documents/upload", params=params, content=b"%PDF report" * 1000)
+            return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first.status_code == 201, first.text
+    assert second.status_code == 201, second.text
+    assert first.json()["deduplicated"] is False
+    assert second.json()["deduplicated"] is True
+    assert second.json()["doc_id"] == first.json()["doc_id"]
+    assert second.json()["content_hash"] == first.json()["content_hash"]
+    assert stored_files(tmp_path / "blobs") == [tmp_path / "blobs" / blob_path_for(first.json()["content_hash"])]
+
+
+def test_upload_to_unknown_folder_leaves_no_blob(tmp_path):
+    async def scenario() -> httpx.Response:
+        async with api_client(tmp_path) as client:
+            return await client.post(
+                "/api/v1/documents/upload", params={"folder_id": 999, "filename": "lost.pdf"}, content=b"%PDF lost",
+            )
+
+    response = asyncio.run(scenario())
+
+    assert response.status_code == 404
+    assert not (tmp_path / "blobs").exists() or stored_files(tmp_path / "blobs") == []